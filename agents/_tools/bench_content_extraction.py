@@ -0,0 +1,53 @@
+"""
+Benchmark of main-content extraction on recorded pages.
+
+Usage:
+    python -m agents._tools.bench_content_extraction <dir_or_file> [...] [--repeat N]
+
+Pages are loaded like in bench_html_parsing (*.html files or the scrapers' HTTP cache *.body files).
+For every page the full page text (soup.get_text) is compared with the extracted article body;
+tokens are estimated as characters / 4.
+"""
+import sys
+import time
+from typing import List
+
+from agents._tools.bench_html_parsing import load_pages
+from agents._tools.content_extraction import extract_main_text
+from agents._tools.html_parsing import make_soup
+
+CHARS_PER_TOKEN = 4
+
+
+def run(pages: List[str], repeat: int = 3):
+    soups = [make_soup(html) for html in pages]
+    full_chars = sum(len(soup.get_text(separator="\n", strip=True)) for soup in soups)
+    main_chars = sum(len(extract_main_text(soup)) for soup in soups)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for soup in soups:
+            extract_main_text(soup)
+    ms_per_page = (time.perf_counter() - start) / (repeat * len(soups)) * 1000
+    reduction = (1 - main_chars / full_chars) * 100 if full_chars else 0.0
+    print(f"[INFO] {len(pages)} pages, {repeat} repeats; extraction {ms_per_page:.2f} ms per page")
+    print(f"{'':<14} {'chars':>12} {'~tokens':>12}")
+    print(f"{'full text':<14} {full_chars:>12} {full_chars // CHARS_PER_TOKEN:>12}")
+    print(f"{'main content':<14} {main_chars:>12} {main_chars // CHARS_PER_TOKEN:>12}")
+    print(f"[INFO] Reduction: {reduction:.1f}%")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repeat = 3
+    if "--repeat" in args:
+        idx = args.index("--repeat")
+        repeat = int(args[idx + 1])
+        args = args[:idx] + args[idx + 2:]
+    if not args:
+        print("Usage: python -m agents._tools.bench_content_extraction <dir_or_file> [...] [--repeat N]")
+        sys.exit(1)
+    recorded = load_pages(args)
+    if not recorded:
+        print("[WARN] No recorded pages found.")
+        sys.exit(1)
+    run(recorded, repeat)
@@ -0,0 +1,70 @@
+"""
+Benchmark of the HTML parsing backends on recorded pages.
+
+Usage:
+    python -m agents._tools.bench_html_parsing <dir_or_file> [...] [--repeat N]
+
+Directories are scanned recursively for *.html files and for the *.body files written by the
+website scrapers' HTTP cache (azure_functions/agents/Website/.http_cache), so a cache filled by a
+normal run can be used as the recorded corpus.
+"""
+import os
+import sys
+import time
+from typing import List
+
+from agents._tools.html_parsing import available_backends, extract_links, extract_text, make_soup
+
+RECORDED_SUFFIXES = (".html", ".htm", ".body")
+
+
+def load_pages(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if n.endswith(RECORDED_SUFFIXES))
+        elif os.path.isfile(path):
+            files.append(path)
+    pages = []
+    for file_path in sorted(files):
+        with open(file_path, "rb") as f:
+            pages.append(f.read().decode("utf-8", errors="replace"))
+    return pages
+
+
+def _time(fn, pages: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            fn(html)
+    return (time.perf_counter() - start) / (repeat * len(pages)) * 1000
+
+
+def run(pages: List[str], repeat: int = 3):
+    total_kb = sum(len(p) for p in pages) / 1024
+    print(f"[INFO] {len(pages)} pages, {total_kb:.0f} KB, {repeat} repeats; times are ms per page")
+    print(f"{'backend':<12} {'soup':>8} {'links':>8} {'text':>8} {'#links':>8}")
+    for backend in available_backends():
+        soup_ms = _time(lambda h: make_soup(h, backend), pages, repeat)
+        links_ms = _time(lambda h: extract_links(h, backend), pages, repeat)
+        text_ms = _time(lambda h: extract_text(h, backend=backend), pages, repeat)
+        n_links = sum(len(extract_links(h, backend)) for h in pages)
+        print(f"{backend:<12} {soup_ms:>8.2f} {links_ms:>8.2f} {text_ms:>8.2f} {n_links:>8}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repeat = 3
+    if "--repeat" in args:
+        idx = args.index("--repeat")
+        repeat = int(args[idx + 1])
+        args = args[:idx] + args[idx + 2:]
+    if not args:
+        print("Usage: python -m agents._tools.bench_html_parsing <dir_or_file> [...] [--repeat N]")
+        sys.exit(1)
+    recorded = load_pages(args)
+    if not recorded:
+        print("[WARN] No recorded pages found.")
+        sys.exit(1)
+    run(recorded, repeat)
@@ -0,0 +1,128 @@
+"""
+Main-content extraction for article pages (readability-style).
+
+`extract_main_text` returns only the article body: navigation, cookie banners, footers, share
+widgets and link lists are left out. It prefers a substantial <article> or <main> element and
+otherwise scores blocks by the paragraphs they contain, penalised by link density. The tree is
+read, never modified, so the same BeautifulSoup object can be reused by other extractors.
+"""
+import re
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+from bs4.element import Comment, NavigableString, Tag
+
+from agents._tools.html_parsing import make_soup
+
+NOISE_TAGS = {
+    "script", "style", "noscript", "template", "nav", "footer", "header", "aside", "form",
+    "iframe", "svg", "button", "select", "dialog",
+}
+# O clasă (sau id) întreagă care marchează elemente fără conținut editorial: "sidebar", "cookie-banner",
+# "site-footer"; clasele de layout care doar conțin cuvântul ("has-sidebar", "content-nav-offset") nu contează
+NOISE_TOKEN_REGEX = re.compile(
+    r"^(?:site[-_]|global[-_])?(cookies?|consent|gdpr|banner|nav|navbar|menu|footer|header|sidebar|share|sharing|social|"
+    r"related|newsletter|subscribe|comments?|breadcrumbs?|popup|modal|promo|advert|ads|cta|signup)(?:[-_]|$)",
+    re.IGNORECASE,
+)
+CONTAINER_TAGS = {"article", "main", "body"}
+PARAGRAPH_TAGS = ("p", "pre", "blockquote", "li", "h2", "h3")
+
+# Un <article>/<main> este folosit direct dacă are cel puțin atâta text și puține linkuri
+MIN_CONTAINER_CHARS = 250
+MAX_LINK_DENSITY = 0.5
+MIN_PARAGRAPH_CHARS = 25
+TOP_CANDIDATES = 5
+# Sub acest prag, extragerea a eșuat: se întoarce textul paginii fără zgomot
+MIN_CONTENT_CHARS = 200
+
+
+def _is_noise(tag: Tag) -> bool:
+    if tag.name in NOISE_TAGS:
+        return True
+    if tag.name in CONTAINER_TAGS:
+        return False
+    if tag.get("aria-hidden") == "true" or tag.get("role") in ("navigation", "banner", "contentinfo", "dialog"):
+        return True
+    tokens = list(tag.get("class") or []) + (tag.get("id") or "").split()
+    return any(NOISE_TOKEN_REGEX.match(token) for token in tokens)
+
+
+def _strings(node: Tag) -> Iterator[str]:
+    # Textul vizibil al nodului, sărind peste subarborii de zgomot
+    for child in node.children:
+        if isinstance(child, Comment):
+            continue
+        if isinstance(child, NavigableString):
+            text = child.strip()
+            if text:
+                yield text
+        elif isinstance(child, Tag) and not _is_noise(child):
+            yield from _strings(child)
+
+
+def _text_stats(node: Tag) -> Tuple[int, float]:
+    text_len = sum(len(s) for s in _strings(node))
+    if not text_len:
+        return 0, 1.0
+    link_len = sum(len(s) for a in node.find_all("a") for s in _strings(a))
+    return text_len, min(1.0, link_len / text_len)
+
+
+def _has_noise_ancestor(tag: Tag) -> bool:
+    return any(isinstance(p, Tag) and _is_noise(p) for p in tag.parents)
+
+
+def _best_container(soup: BeautifulSoup) -> Optional[Tag]:
+    for name in ("article", "main"):
+        best, best_len = None, 0
+        for el in soup.find_all(name):
+            if _has_noise_ancestor(el):
+                continue
+            text_len, link_density = _text_stats(el)
+            if text_len >= MIN_CONTAINER_CHARS and link_density <= MAX_LINK_DENSITY and text_len > best_len:
+                best, best_len = el, text_len
+        if best is not None:
+            return best
+    return None
+
+
+def _best_scored_block(soup: BeautifulSoup) -> Optional[Tag]:
+    scores: Dict[int, float] = {}
+    nodes: Dict[int, Tag] = {}
+    for p in soup.find_all(PARAGRAPH_TAGS):
+        if _has_noise_ancestor(p):
+            continue
+        text = " ".join(_strings(p))
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        parent = p.parent
+        grandparent = parent.parent if isinstance(parent, Tag) else None
+        for node, share in ((parent, 1.0), (grandparent, 0.5)):
+            if isinstance(node, Tag):
+                scores[id(node)] = scores.get(id(node), 0) + score * share
+                nodes[id(node)] = node
+    if not scores:
+        return None
+    # Densitatea linkurilor se calculează doar pentru primii candidați, nu pentru toate blocurile
+    top = sorted(scores, key=scores.get, reverse=True)[:TOP_CANDIDATES]
+    best_id = max(top, key=lambda key: scores[key] * (1 - _text_stats(nodes[key])[1]))
+    return nodes[best_id]
+
+
+def element_text(node: Tag, separator: str = "\n") -> str:
+    """Visible text of one element, without the noise subtrees inside it."""
+    return separator.join(_strings(node))
+
+
+def extract_main_text(page: Union[str, BeautifulSoup], separator: str = "\n") -> str:
+    """Article body text of a page (HTML string or parsed tree) without boilerplate."""
+    soup = make_soup(page) if isinstance(page, str) else page
+    node = _best_container(soup) or _best_scored_block(soup)
+    if node is not None:
+        text = separator.join(_strings(node))
+        if len(text) >= MIN_CONTENT_CHARS:
+            return text
+    root = soup.body or soup
+    return separator.join(_strings(root))
@@ -0,0 +1,125 @@
+"""
+Shared HTML parsing backends for the scrapers.
+
+`make_soup` keeps the BeautifulSoup API for call sites that need CSS selectors or tree edits,
+but builds it with lxml when available. `extract_links` and `extract_text` have fast paths on
+selectolax (lexbor) or lxml and fall back to BeautifulSoup. The backend is chosen with the
+HTML_PARSER_BACKEND environment variable: auto (default), selectolax, lxml or html.parser.
+"""
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax este opțional
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml este opțional
+    lxml = None
+    etree = None
+
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto").lower()
+
+_TEXT_SEPARATOR = "\x00"
+
+# lxml refuză un str care începe cu o declarație XML cu encoding (paginile XHTML); textul e deja decodat
+_XML_DECLARATION = re.compile(r"^\ufeff?\s*<\?xml[^>]*\?>")
+
+
+def available_backends() -> List[str]:
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    if lxml is not None:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    name = (backend or HTML_PARSER_BACKEND).lower()
+    available = available_backends()
+    if name == "auto":
+        return available[0]
+    if name not in available:
+        print(f"[WARN] HTML parser backend '{name}' is not installed, using '{available[0]}'.")
+        return available[0]
+    return name
+
+
+def make_soup(html: str, backend: Optional[str] = None) -> BeautifulSoup:
+    """BeautifulSoup tree built with lxml when possible (selectolax has no bs4 tree builder)."""
+    name = resolve_backend(backend)
+    if name != "html.parser" and lxml is not None:
+        return BeautifulSoup(html or "", "lxml")
+    return BeautifulSoup(html or "", "html.parser")
+
+
+def _lxml_root(html: str):
+    try:
+        return lxml.html.fromstring(_XML_DECLARATION.sub("", html, count=1))
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def extract_links(html: str, backend: Optional[str] = None) -> List[Tuple[str, str]]:
+    """All <a href> elements as (href, anchor text), in document order. Hrefs are stripped, not resolved."""
+    if not html:
+        return []
+    name = resolve_backend(backend)
+    if name == "selectolax":
+        tree = LexborHTMLParser(html)
+        return [((a.attributes.get("href") or "").strip(), a.text(strip=True)) for a in tree.css("a[href]")]
+    if name == "lxml":
+        root = _lxml_root(html)
+        if root is None:
+            return []
+        return [
+            ((a.get("href") or "").strip(), "".join(t.strip() for t in a.itertext()))
+            for a in root.iter("a") if a.get("href") is not None
+        ]
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for a in soup.find_all("a", href=True):
+        href = a.attrs.get("href", "")
+        href = href.strip() if isinstance(href, str) else str(href)
+        links.append((href, a.get_text(strip=True)))
+    return links
+
+
+def _join_text(parts: Iterable[str], separator: str) -> str:
+    return separator.join(p for p in (part.strip() for part in parts) if p)
+
+
+def extract_text(html: str, drop_tags: Iterable[str] = ("script", "style"), separator: str = "\n",
+                 backend: Optional[str] = None) -> str:
+    """Visible text with the given tags removed; stripped fragments joined by `separator`."""
+    if not html:
+        return ""
+    drop_tags = list(drop_tags)
+    name = resolve_backend(backend)
+    if name == "selectolax":
+        tree = LexborHTMLParser(html)
+        if drop_tags:
+            tree.strip_tags(drop_tags)
+        root = tree.body or tree.root
+        if root is None:
+            return ""
+        return _join_text(root.text(separator=_TEXT_SEPARATOR, strip=True).split(_TEXT_SEPARATOR), separator)
+    if name == "lxml":
+        root = _lxml_root(html)
+        if root is None:
+            return ""
+        etree.strip_elements(root, etree.Comment, *drop_tags, with_tail=False)
+        return _join_text(root.itertext(), separator)
+    soup = BeautifulSoup(html, "html.parser")
+    for tag_name in drop_tags:
+        for el in soup.find_all(tag_name):
+            el.decompose()
+    return soup.get_text(separator=separator, strip=True)
@@ -0,0 +1,51 @@
+from agents._tools.content_extraction import extract_main_text
+from agents._tools.html_parsing import make_soup
+
+BODY = " ".join(f"Paragraph {i} explains, in some detail, how the agents reconcile invoices." for i in range(6))
+
+ARTICLE_PAGE = f"""<html><head><title>Post</title><script>var t = 1;</script></head><body>
+<header class="site-header"><a href="/">Home</a><a href="/blog">Blog</a></header>
+<div id="cookie-banner">We use cookies to improve your experience. Accept all cookies?</div>
+<nav><ul><li><a href="/pricing">Pricing</a></li></ul></nav>
+<article><h1>Reconciling invoices</h1><p>{BODY}</p><p>Second paragraph with more, useful, content.</p>
+<div class="share-buttons"><a href="#">Share on LinkedIn</a></div></article>
+<aside><a href="/blog/other">Related post</a></aside>
+<footer>Copyright 2025. All rights reserved.</footer></body></html>"""
+
+DIV_PAGE = f"""<html><body>
+<div class="menu"><a href="/a">Products and services for every team</a><a href="/b">Solutions</a></div>
+<div class="layout"><div class="content"><p>{BODY}</p><p>{BODY}</p></div>
+<div class="links"><p><a href="/x">A very long list of links that is not the article, at all</a></p></div></div>
+</body></html>"""
+
+
+def test_article_element_is_preferred_and_boilerplate_dropped():
+    text = extract_main_text(make_soup(ARTICLE_PAGE))
+    assert "Reconciling invoices" in text and "Paragraph 5" in text and "Second paragraph" in text
+    for noise in ("cookies", "Pricing", "Share on LinkedIn", "Related post", "Copyright", "var t"):
+        assert noise not in text
+
+
+def test_paragraph_scoring_without_semantic_containers():
+    text = extract_main_text(DIV_PAGE)
+    assert text.count("Paragraph 0") == 2
+    assert "Solutions" not in text and "list of links" not in text
+
+
+def test_short_pages_fall_back_to_clean_body_text():
+    text = extract_main_text("<html><body><nav>Menu</nav><p>Short note.</p></body></html>")
+    assert text == "Short note."
+
+
+def test_tree_is_not_modified():
+    soup = make_soup(ARTICLE_PAGE)
+    before = str(soup)
+    extract_main_text(soup)
+    assert str(soup) == before
+
+
+def test_layout_classes_containing_noise_words_are_kept():
+    page = f"""<html><body><div class="page has-sidebar with-header"><div class="content-nav-offset">
+    <p>{BODY}</p></div><div class="sidebar"><a href="/x">Popular posts this week</a></div></div></body></html>"""
+    text = extract_main_text(page)
+    assert "Paragraph 5" in text and "Popular posts" not in text
@@ -0,0 +1,39 @@
+import pytest
+
+from agents._tools.html_parsing import available_backends, extract_links, extract_text, make_soup
+
+PAGE = """<html><head><title>Blog</title><style>.x{}</style></head>
+<body><nav><a href="/about">About</a></nav>
+<main><h1>Latest posts</h1>
+<article><a href=" /blog/first "><span>First</span> post</a><p>Intro text.</p></article>
+<article><a href="https://example.com/blog/second">Second</a></article>
+<script>var tracking = 1;</script><!-- comment --></main></body></html>"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_agree_on_links(backend):
+    assert extract_links(PAGE, backend) == [
+        ("/about", "About"),
+        ("/blog/first", "Firstpost"),
+        ("https://example.com/blog/second", "Second"),
+    ]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_drop_tags_from_text(backend):
+    text = extract_text(PAGE, drop_tags=("script", "style", "nav"), backend=backend)
+    assert "tracking" not in text and "About" not in text and "comment" not in text
+    assert "Latest posts" in text and "Intro text." in text
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_xhtml_with_xml_declaration_is_parsed(backend):
+    xhtml = ('<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>'
+             '<html xmlns="http://www.w3.org/1999/xhtml"><body><p>Hello</p><a href="/blog">Blog</a></body></html>')
+    assert extract_links(xhtml, backend) == [("/blog", "Blog")]
+    assert "Hello" in extract_text(xhtml, backend=backend)
+
+
+def test_make_soup_supports_selectors_and_unknown_backend_falls_back():
+    soup = make_soup(PAGE, backend="does-not-exist")
+    assert [a.get_text(strip=True) for a in soup.select("article a")] == ["Firstpost", "Second"]
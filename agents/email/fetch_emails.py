@@ -1,6 +1,6 @@
 import base64
 import logging
-from bs4 import BeautifulSoup
+from agents._tools.html_parsing import extract_text
 from googleapiclient.discovery import build
 import re
 
@@ -34,8 +34,7 @@ def get_plain_text_from_payload(payload,level=0):
             if mime == 'text/plain':
                 text_content += decoded_text
             elif level == 0 and mime == 'text/html':
-                soup = BeautifulSoup(decoded_text, "html.parser")
-                cleaned_text = soup.get_text(separator=" ")  # Keeps word spacing
+                cleaned_text = extract_text(decoded_text, separator=" ")  # Keeps word spacing
 
                 # Remove excessive spaces, newlines, and unwanted characters
                 cleaned_text = re.sub(r'[\r\n\t]+', ' ', cleaned_text)  # Replace \n, \r, \t with spaces
@@ -1,6 +1,6 @@
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
+from agents._tools.html_parsing import extract_links
 
 def extract_article_links(index_url):
     print(f"🔗 Accesez cu Playwright: {index_url}")
@@ -24,14 +24,12 @@ def extract_article_links(index_url):
         print(f"⚠️ Eroare Playwright: {e}")
         return []
 
-    soup = BeautifulSoup(html, "html.parser")
     links = []
 
     parsed_base = urlparse(index_url)
     base_domain = parsed_base.netloc
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
+    for href, _ in extract_links(html):
         full_url = urljoin(index_url, href)
         parsed = urlparse(full_url)
 
@@ -1,5 +1,5 @@
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from agents._tools.html_parsing import make_soup
 
 def fetch_page(url):
     with sync_playwright() as p:
@@ -45,7 +45,7 @@ def extract_title_fallback(soup):
 
 def scrape_article(url, selectors):
     html = fetch_page(url)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
 
     # 🔻 Elimină zgomotul: cookies, consent etc.
     for bad in soup.select('[id*="cookie"], [class*="cookie"], [id*="consent"], [class*="consent"]'):
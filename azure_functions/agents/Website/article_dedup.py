@@ -0,0 +1,142 @@
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+from typing import Iterable, List, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from seen_urls import SEEN_URLS_PATH
+
+# Parametri de tracking eliminați la canonicalizare
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "mkt_tok", "ref", "ref_src", "amp",
+}
+TRACKING_PREFIXES = ("utm_",)
+# Locale implicite: /en/articol și /articol sunt aceeași pagină
+DEFAULT_LOCALES = {"en"}
+
+# SimHash pe 64 de biți; două texte cu distanța Hamming <= prag sunt considerate duplicate
+SIMHASH_BITS = 64
+# Amprenta e împărțită în BAND_COUNT benzi: două amprente la distanță < BAND_COUNT au cel puțin o bandă identică
+BAND_COUNT = 7
+NEAR_DUPLICATE_DISTANCE = min(int(os.getenv("WEBSITE_NEAR_DUPLICATE_DISTANCE", "6")), BAND_COUNT - 1)
+SHINGLE_SIZE = 3
+# Textele prea scurte nu au o amprentă de încredere
+MIN_FINGERPRINT_WORDS = 30
+
+WORD_REGEX = re.compile(r"\w+", re.UNICODE)
+
+
+def canonical_article_url(url: str) -> str:
+    """Lowercase host without www, no fragment, tracking params, default locale prefix, AMP variant or trailing slash."""
+    parts = urlparse(url)
+    host = (parts.hostname or "").lower()
+    host = host[4:] if host.startswith("www.") else host
+    netloc = f"{host}:{parts.port}" if parts.port and parts.port not in (80, 443) else host
+    segments = [s for s in parts.path.split("/") if s]
+    if segments and segments[0].lower() in DEFAULT_LOCALES:
+        segments = segments[1:]
+    if segments and segments[-1].lower() == "amp":
+        segments = segments[:-1]
+    path = "/" + "/".join(segments)
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ))
+    return urlunparse((parts.scheme.lower() or "https", netloc, path, "", query, ""))
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash over word shingles, or None when the text is too short to fingerprint."""
+    words = WORD_REGEX.findall(text.lower())
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        shingle = " ".join(words[i:i + SHINGLE_SIZE])
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if weights[bit] > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint: int) -> List[int]:
+    bands = []
+    start = 0
+    for i in range(BAND_COUNT):
+        width = SIMHASH_BITS // BAND_COUNT + (1 if i < SIMHASH_BITS % BAND_COUNT else 0)
+        bands.append(fingerprint >> start & ((1 << width) - 1))
+        start += width
+    return bands
+
+
+def _signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+class ContentFingerprints:
+    """
+    Persistent SimHash index of stored articles (stored next to the seen-URL index). Candidates are
+    looked up by band and confirmed by Hamming distance, so a lookup touches only a small share of rows.
+    """
+
+    def __init__(self, path: str = SEEN_URLS_PATH, max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        self.max_distance = min(max_distance, BAND_COUNT - 1)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS fingerprints (url TEXT PRIMARY KEY, simhash INTEGER NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprint_bands (band INTEGER NOT NULL, value INTEGER NOT NULL, "
+            "url TEXT NOT NULL, PRIMARY KEY (band, value, url)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS fingerprint_bands_url ON fingerprint_bands (url)")
+        self._conn.commit()
+
+    def find_duplicate(self, fingerprint: int, exclude_url: Optional[str] = None) -> Optional[str]:
+        """URL of a stored article whose fingerprint is within max_distance, other than exclude_url."""
+        seen = set()
+        with self._lock:
+            for band, value in enumerate(_bands(fingerprint)):
+                rows = self._conn.execute(
+                    "SELECT f.url, f.simhash FROM fingerprint_bands b JOIN fingerprints f ON f.url = b.url "
+                    "WHERE b.band = ? AND b.value = ?", (band, value)
+                ).fetchall()
+                for url, stored in rows:
+                    if url in seen or url == exclude_url:
+                        continue
+                    seen.add(url)
+                    if hamming_distance(fingerprint, stored & ((1 << 64) - 1)) <= self.max_distance:
+                        return url
+        return None
+
+    def add(self, url: str, fingerprint: int):
+        with self._lock:
+            self._conn.execute("DELETE FROM fingerprint_bands WHERE url = ?", (url,))
+            self._conn.execute("INSERT OR REPLACE INTO fingerprints (url, simhash) VALUES (?, ?)", (url, _signed(fingerprint)))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO fingerprint_bands (band, value, url) VALUES (?, ?, ?)",
+                [(band, value, url) for band, value in enumerate(_bands(fingerprint))],
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def canonical_link(links: Iterable[str], page_url: str) -> Optional[str]:
+    """First usable rel=canonical href on the same site as the page, canonicalized."""
+    page_host = canonical_article_url(page_url).split("/")[2]
+    for href in links:
+        if href and href.startswith(("http://", "https://")):
+            canonical = canonical_article_url(href)
+            if canonical.split("/")[2] == page_host:
+                return canonical
+    return None
@@ -1,24 +1,54 @@
 import os
 import sys
-import json
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Tuple
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic.v1 import BaseModel, Field
-from bs4.element import Tag
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from agents._tools.llm_client import llm
+from agents._tools.html_parsing import make_soup, extract_links, extract_text
+from agents._tools.content_extraction import element_text, extract_main_text
 from blog_index_processor import BlogIndexProcessor
+from http_client import build_session, CircuitBreaker, HostLimiter, HostThrottle, PageFetcher, MAX_RETRIES
+from http_cache import HttpCache, HTTP_CACHE_ENABLED
+from feed_reader import FeedEntry, parse_feed
+from scraping_state import load_scraping_state, merge_scraping_state
+from page_store import PageStore
+from article_store import ArticleStore, ARTICLE_STORE_DIR
+from seen_urls import SeenUrlIndex
+from article_dedup import ContentFingerprints, canonical_article_url, canonical_link, hamming_distance, simhash
+from recency import order_by_recency, url_date_before
+from pagination import listing_dates, load_more_url, next_page_url, page_number, parse_load_more, with_page
+from date_extraction import selector_date, structured_publish_date
+from cms_profiles import CmsProfile, cms_article_links, cms_body, cms_date_selector, cms_profile, detect_cms
+from sitemap_reader import sitemap_seeds, iter_sitemap
 
 SCRAPING_STATE_FILENAME = "scraping_state.json"
 OUTPUT_FILENAME = "scraped_articles.json"
 
-EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.rar', '.mp4', '.avi', '.mov')
+# Frontiera de crawl a indexurilor: buget de pagini/adâncime, workeri, limită și pauză per host
+CRAWL_MAX_PAGES = int(os.getenv("ARTICLE_CRAWL_MAX_PAGES", "200"))
+CRAWL_MAX_DEPTH = int(os.getenv("ARTICLE_CRAWL_MAX_DEPTH", "20"))
+CRAWL_MAX_WORKERS = int(os.getenv("ARTICLE_CRAWL_MAX_WORKERS", "6"))
+CRAWL_PER_HOST_LIMIT = int(os.getenv("ARTICLE_CRAWL_PER_HOST_LIMIT", "3"))
+CRAWL_HOST_DELAY = float(os.getenv("ARTICLE_CRAWL_HOST_DELAY", "0.2"))
+
+# Mod recență: candidații se parcurg de la cel mai nou, iar un index se oprește după N articole
+# consecutive mai vechi decât cutoff-ul (0 dezactivează oprirea)
+RECENCY_MODE = os.getenv("ARTICLE_RECENCY_MODE", "1") != "0"
+RECENCY_STOP_AFTER = int(os.getenv("ARTICLE_RECENCY_STOP_AFTER", "5"))
+
+# Work item-urile (un index per item) salvează articolele și poziția la fiecare N candidați
+CHECKPOINT_EVERY = int(os.getenv("ARTICLE_CHECKPOINT_EVERY", "5"))
+
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
 }
@@ -35,13 +65,79 @@ class ArticleData(BaseModel):
 class DateSelector(BaseModel):
     selector: Optional[str] = Field(description="A specific CSS selector to find the publication date element. Should be null if no reliable selector can be found.")
 
+@dataclass
+class ScrapeRun:
+    """State of one client run, shared by the blog indexes it processes (each fan-out work item builds its own)."""
+    client_key: str
+    base_url: str
+    blog_index_urls: List[str]
+    rejected_index_urls: set
+    feed_entries: List[FeedEntry]
+    date_selector: Optional[str]
+    cutoff_dt: datetime
+    cms: Optional[str] = None
+    feed_urls: List[str] = field(default_factory=list)
+    crawled_indexes: Dict[str, List[str]] = field(default_factory=dict)
+    lastmods: Optional[Dict[str, datetime]] = None
+    # Articolele acceptate și formele canonice/amprentele lor; saved_count = câte sunt deja pe disc
+    new_articles: List[dict] = field(default_factory=list)
+    accepted_urls: set = field(default_factory=set)
+    accepted_canonicals: set = field(default_factory=set)
+    run_fingerprints: Dict[str, int] = field(default_factory=dict)
+    saved_fingerprints: set = field(default_factory=set)
+    saved_count: int = 0
+    newest_dt_found: Optional[datetime] = None
+    # Fan-out: articolele se revendică pentru work item în depozitul comun al jobului înainte de descărcare
+    claim: Optional[Callable[[str], bool]] = None
+
+    def plan(self) -> Dict:
+        """The client state a fan-out work item needs, in the same fields as scraping_state (kept in the job record)."""
+        return {
+            "client_key": self.client_key,
+            "blog_index_urls": list(self.blog_index_urls),
+            "rejected_index_urls": sorted(self.rejected_index_urls),
+            "date_selector": self.date_selector,
+            "cms": self.cms,
+            "feed_urls": list(self.feed_urls),
+        }
+
 class ArticleScraperV3:
-    def __init__(self, output_filename=OUTPUT_FILENAME):
+    def __init__(self, output_filename=OUTPUT_FILENAME, article_store: Optional[ArticleStore] = None,
+                 seen_urls: Optional[SeenUrlIndex] = None, fingerprints: Optional[ContentFingerprints] = None, crawl_workers: Optional[int] = None,
+                 max_pages: Optional[int] = None, max_depth: Optional[int] = None,
+                 recency_mode: Optional[bool] = None, recency_stop_after: Optional[int] = None,
+                 progress: Optional[Callable[[str, Dict], None]] = None):
         self.output_path = os.path.join(os.path.dirname(__file__), output_filename)
+        # Articolele se adaugă în depozitul append-only; vechiul scraped_articles.json e importat o singură dată
+        self.article_store = article_store if article_store is not None else ArticleStore(ARTICLE_STORE_DIR, legacy_path=self.output_path)
         self.state_path = os.path.join(os.path.dirname(__file__), SCRAPING_STATE_FILENAME)
-        self.processed_urls = self._load_processed_urls()
+        self.processed_urls = seen_urls if seen_urls is not None else self._load_processed_urls()
+        # Amprente SimHash ale articolelor salvate, pentru duplicate sub alte URL-uri
+        self.fingerprints = fingerprints if fingerprints is not None else ContentFingerprints()
+        self.run_stats: Counter = Counter()
+        # Apelat la fiecare etapă a rulării (modul job asincron raportează progresul prin el)
+        self.progress = progress
+        # Profilul CMS al site-ului curent (setat în run): extractoare comune pentru toți clienții de pe aceeași platformă
+        self.cms_profile: Optional[CmsProfile] = None
         self.scraping_state = self._load_scraping_state()
-        self.blog_index_processor = BlogIndexProcessor()
+        self.crawl_workers = max(1, crawl_workers if crawl_workers is not None else CRAWL_MAX_WORKERS)
+        self.max_pages = max_pages if max_pages is not None else CRAWL_MAX_PAGES
+        self.max_depth = max_depth if max_depth is not None else CRAWL_MAX_DEPTH
+        self.recency_mode = recency_mode if recency_mode is not None else RECENCY_MODE
+        self.recency_stop_after = recency_stop_after if recency_stop_after is not None else RECENCY_STOP_AFTER
+        self.session = build_session(REQUEST_HEADERS, pool_size=max(10, self.crawl_workers * 2))
+        self.http_cache = HttpCache() if HTTP_CACHE_ENABLED else None
+        self.host_limiter = HostLimiter(CRAWL_PER_HOST_LIMIT, min_interval=CRAWL_HOST_DELAY)
+        # Ritm adaptiv per domeniu, reîncercări cu backoff și circuit breaker (resetat la fiecare run)
+        self.throttle = HostThrottle()
+        self.breaker = CircuitBreaker()
+        self.fetcher = PageFetcher(self.session, self.host_limiter, self.http_cache,
+                                   throttle=self.throttle, breaker=self.breaker, max_retries=MAX_RETRIES)
+        # Paginile descărcate (și parsate) într-o rulare; run() pornește cu un store nou
+        self.pages = PageStore(self.fetcher)
+        self.blog_index_processor = BlogIndexProcessor(http_cache=self.http_cache, throttle=self.throttle, breaker=self.breaker)
+        # Aceleași reguli de URL (și același cache de parsare) ca la descoperirea indexurilor
+        self.url_rules = self.blog_index_processor.url_rules
 
     def _is_http_url(self, href: str) -> bool:
         href_lower = href.lower()
@@ -49,121 +145,268 @@ class ArticleScraperV3:
             return False
         return True
 
-    def _normalize_netloc(self, netloc: str) -> str:
-        return netloc[4:] if netloc.startswith("www.") else netloc
-
     def _is_internal(self, base_url: str, candidate_url: str) -> bool:
-        base_netloc = self._normalize_netloc(urlparse(base_url).netloc)
-        cand_netloc = self._normalize_netloc(urlparse(candidate_url).netloc)
-        return cand_netloc == base_netloc or cand_netloc.endswith("." + base_netloc)
+        return self.url_rules.is_internal(base_url, candidate_url)
 
-    def _load_processed_urls(self) -> set:
-        try:
-            with open(self.output_path, "r", encoding="utf-8") as f:
-                articles = json.load(f)
-            return {a.get("url") for a in articles if "url" in a}
-        except (FileNotFoundError, json.JSONDecodeError):
-            return set()
+    def _load_processed_urls(self) -> SeenUrlIndex:
+        # Index persistent (SQLite); la prima pornire este populat din indexul depozitului de articole
+        seen = SeenUrlIndex()
+        if not seen:
+            seen.add_many(self.article_store.iter_urls())
+        return seen
 
     def _load_scraping_state(self) -> dict:
-        try:
-            with open(self.state_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        return load_scraping_state(self.state_path)
 
-    def _save_scraping_state(self):
-        with open(self.state_path, "w", encoding="utf-8") as f:
-            json.dump(self.scraping_state, f, indent=2, ensure_ascii=False)
+    def _update_client_state(self, client_key: str, fields: Dict) -> Dict:
+        # Doar câmpurile date, peste starea recitită de pe disc: workerii paraleli (batchSize) scriu alți clienți
+        merge_scraping_state({client_key: fields}, self.state_path, self.scraping_state)
+        return self.scraping_state[client_key]
 
     def _save_articles(self, articles: List[dict]):
         try:
-            existing = []
-            if os.path.exists(self.output_path):
-                with open(self.output_path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-            with open(self.output_path, "w", encoding="utf-8") as f:
-                json.dump(existing + articles, f, indent=2, ensure_ascii=False)
+            self.article_store.append(articles)
+            # URL-urile (și formele canonice) devin "văzute" doar după ce articolele sunt pe disc
+            self.processed_urls.add_many(u for a in articles for u in (a.get("url"), a.get("canonical_url")) if u)
         except Exception as e:
             print(f"[ERROR] Could not save articles: {e}")
 
     def _get_html(self, url: str) -> Optional[str]:
-        import requests
+        return self.pages.text(url)
+
+    def _load_feed_entries(self, feed_urls: List[str]) -> List[FeedEntry]:
+        entries: Dict[str, FeedEntry] = {}
+        for feed_url in feed_urls:
+            page = self.pages.fetch(feed_url, accept_types=None)
+            parsed = parse_feed(page.text, page.final_url) if page.ok else None
+            for entry in parsed or []:
+                entries.setdefault(entry.url, entry)
+        return list(entries.values())
+
+    def _feed_entries_for_index(self, entries: List[FeedEntry], blog_index_url: str, cutoff_dt: datetime) -> Optional[List[FeedEntry]]:
+        # Returns the entries under this index newer than the cutoff, or None when the feed
+        # does not reach back to the cutoff (then the index still has to be crawled)
+        index_path = urlparse(blog_index_url).path.rstrip('/')
+        matching = [
+            e for e in entries
+            if self._is_internal(blog_index_url, e.url) and urlparse(e.url).path.startswith(index_path + '/')
+        ]
+        if not matching or any(e.published is None for e in matching):
+            return None
+        if min(e.published for e in matching) > cutoff_dt:
+            return None
+        return [e for e in matching if e.published >= cutoff_dt]
+
+    def _sitemap_lastmods(self, base_url: str, since: datetime) -> Dict[str, datetime]:
+        # lastmod din sitemap ca semnal de recență; intrările mai vechi decât cutoff-ul nu sunt citite deloc
+        lastmods: Dict[str, datetime] = {}
         try:
-            resp = requests.get(url, timeout=10, headers=REQUEST_HEADERS, allow_redirects=True)
-            if resp.status_code == 200:
-                return resp.text
-        except requests.RequestException as e:
-            print(f"[ERROR] Failed to fetch {url}: {e}")
-        return None
-
-    def find_individual_article_links(self, blog_index_url: str, excluded_index_urls: Optional[set] = None) -> List[str]:
-        from collections import deque
-        excluded_index_urls = excluded_index_urls or set()
-        visited = set()
-        index_parsed = urlparse(blog_index_url)
-        base_root = f"{index_parsed.scheme}://{index_parsed.netloc}"
-        index_path = index_parsed.path.rstrip('/')
-        index_segments = [seg for seg in index_path.split('/') if seg]
-        queue = deque([(blog_index_url, 0)])
-        article_candidates = set()
-        while queue:
-            current_url, depth = queue.popleft()
-            if current_url in visited:
+            for entry in iter_sitemap(self.fetcher, sitemap_seeds(self.fetcher, base_url), since=since):
+                if entry.lastmod:
+                    lastmods[entry.loc] = entry.lastmod
+        except Exception as e:
+            print(f"[WARN] Could not read sitemap lastmod for {base_url}: {e}")
+        return lastmods
+
+    def _frontier_priority(self, url: str) -> int:
+        # Paginarea înaintea categoriilor/tag-urilor, apoi restul secțiunilor
+        segments = [seg.lower() for seg in self.url_rules.classify(url).segments]
+        if segments and ('page' in segments[-1] or (len(segments) >= 2 and 'page' in segments[-2])):
+            return 0
+        if 'category' in segments or 'tag' in segments:
+            return 1
+        return 2
+
+    def _fetch_level(self, urls: List[str]):
+        # Descarcă un nivel al frontierei concurent; întoarce (url, html) pe măsură ce se termină
+        if self.crawl_workers <= 1 or len(urls) <= 1:
+            for url in urls:
+                yield url, self._get_html(url)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.crawl_workers, len(urls))) as executor:
+            futures = {executor.submit(self._get_html, url): url for url in urls}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    print(f"[ERROR] Failed to crawl {futures[future]}: {e}")
+
+    def _scan_index_page(self, current_url: str, html_content: str, depth: int, blog_index_url: str, index_path: str,
+                         index_segments: List[str], excluded_index_urls: set) -> List[Tuple[str, bool, bool]]:
+        # Pentru fiecare link relevant: (url absolut, arată ca articol, trebuie explorat la nivelul următor)
+        links = []
+        cms_links = set()
+        if self.cms_profile:
+            soup = self.pages.derived(current_url, "soup", lambda: make_soup(html_content))
+            cms_links = {urljoin(current_url, h) for h in self.pages.derived(
+                current_url, "cms_links", lambda: cms_article_links(soup, self.cms_profile))}
+        for href, _ in self.pages.derived(current_url, "links", lambda: extract_links(html_content)):
+            if not self._is_http_url(href):
                 continue
-            visited.add(current_url)
-            html_content = self._get_html(current_url)
-            if not html_content:
+            abs_url = urljoin(current_url, href)
+            if abs_url in excluded_index_urls:
                 continue
-            soup = BeautifulSoup(html_content, "html.parser")
-            for a in soup.find_all("a", href=True):
-                if not isinstance(a, Tag):
-                    continue
-                href_attr = a.attrs.get("href", "")
-                href = href_attr.strip() if isinstance(href_attr, str) else str(href_attr)
-                if not self._is_http_url(href):
-                    continue
-                abs_url = urljoin(current_url, href)
-                if abs_url in excluded_index_urls:
-                    continue
-                if not self._is_internal(blog_index_url, abs_url):
-                    continue
-                p = urlparse(abs_url)
-                segs = [s for s in p.path.split('/') if s]
-                if segs and len(segs[0]) == 2 and segs[0].isalpha() and segs[0].lower() not in {'en','ro'}:
-                    continue
-                if abs_url.lower().endswith(EXTENSIONS):
-                    continue
-                parsed = urlparse(abs_url)
-                if not parsed.path.startswith(index_path):
+            if not self._is_internal(blog_index_url, abs_url):
+                continue
+            info = self.url_rules.classify(abs_url)
+            if not info.locale_allowed or info.binary:
+                continue
+            if abs_url in cms_links:
+                # Linkurile din lista de articole a șablonului CMS sunt articole chiar în afara căii indexului
+                links.append((abs_url, True, False))
+                continue
+            if not info.path.startswith(index_path):
+                continue
+            path = info.path.rstrip('/')
+            segments = info.segments
+            is_index_like = (
+                ('page' in segments[-1].lower() if segments else False) or
+                (len(segments) >= 2 and 'page' in segments[-2].lower()) or
+                path.endswith('/category') or '/category/' in path or '/tag/' in path or
+                (len(segments) >= 3 and segments[0] == 'c' and 'page' in segments[-1].lower())
+            )
+            looks_like_article = len(segments) >= len(index_segments) + 1 and not is_index_like
+            follow = is_index_like or (len(segments) <= len(index_segments) + 2 and depth < 2)
+            links.append((abs_url, looks_like_article, follow))
+        return links
+
+    def _walk_pagination(self, blog_index_url: str, index_path: str, index_segments: List[str],
+                         excluded_index_urls: set, cutoff_dt: Optional[datetime]) -> Optional[List[str]]:
+        # Urmează lanțul de pagini al listei (rel=next, ?page=N, /page/N) sau endpoint-ul "load more";
+        # None când indexul nu are paginare detectabilă și trebuie folosită frontiera BFS
+        html_content = self._get_html(blog_index_url)
+        if not html_content:
+            return None
+        soup = self.pages.derived(blog_index_url, "soup", lambda: make_soup(html_content))
+        next_url = next_page_url(soup, blog_index_url)
+        endpoint = None if next_url else load_more_url(soup, blog_index_url)
+        if not next_url and not endpoint:
+            return None
+
+        article_candidates: Dict[str, None] = {}
+
+        def collect(page_url: str, page_html: str) -> List[str]:
+            scanned = self._scan_index_page(page_url, page_html, 0, blog_index_url, index_path, index_segments, excluded_index_urls)
+            found = [abs_url for abs_url, looks_like_article, _ in scanned if looks_like_article]
+            for abs_url in found:
+                article_candidates.setdefault(abs_url)
+            return found
+
+        def past_cutoff(dates: List[datetime]) -> bool:
+            # Lista e ordonată de la cel mai nou: dacă tot ce apare pe pagină e mai vechi, ne oprim
+            return cutoff_dt is not None and bool(dates) and max(dates) <= cutoff_dt
+
+        visited = {blog_index_url}
+        found = collect(blog_index_url, html_content)
+        while next_url and next_url not in visited and len(visited) < self.max_pages:
+            if past_cutoff(listing_dates(found, soup)):
+                break
+            visited.add(next_url)
+            page_url, html_content = next_url, self._get_html(next_url)
+            if not html_content:
+                break
+            soup = self.pages.derived(page_url, "soup", lambda: make_soup(html_content))
+            found = collect(page_url, html_content)
+            if not found:
+                break
+            next_url = next_page_url(soup, page_url)
+
+        while endpoint and endpoint not in visited and len(visited) < self.max_pages:
+            visited.add(endpoint)
+            page = self.fetcher.fetch(endpoint, accept_types=None)
+            if not page.ok:
+                break
+            more = parse_load_more(page.text, endpoint)
+            found = []
+            for abs_url in more.links:
+                info = self.url_rules.classify(abs_url)
+                if self._is_internal(blog_index_url, abs_url) and info.locale_allowed and not info.binary:
+                    article_candidates.setdefault(abs_url)
+                    found.append(abs_url)
+            if more.html:
+                found += collect(endpoint, more.html)
+            if not found or past_cutoff(more.dates + listing_dates(found)):
+                break
+            param, number = page_number(endpoint)
+            endpoint = more.next_url or (with_page(endpoint, number + 1) if param else None)
+
+        self.run_stats["pagination_pages"] += len(visited)
+        if len(visited) >= self.max_pages:
+            print(f"[WARN] Crawl budget of {self.max_pages} pages reached for {blog_index_url}.")
+        return list(article_candidates)
+
+    def find_individual_article_links(self, blog_index_url: str, excluded_index_urls: Optional[set] = None,
+                                      cutoff_dt: Optional[datetime] = None) -> List[str]:
+        excluded_index_urls = excluded_index_urls or set()
+        index_path = urlparse(blog_index_url).path.rstrip('/')
+        index_segments = [seg for seg in index_path.split('/') if seg]
+        # O listă paginată se parcurge pagină cu pagină până la cutoff, fără categorii și tag-uri
+        walked = self._walk_pagination(blog_index_url, index_path, index_segments, excluded_index_urls, cutoff_dt)
+        if walked is not None:
+            return walked
+        # Frontieră pe niveluri (BFS): fiecare nivel se descarcă concurent, deci fiecare pagină este
+        # explorată la adâncimea minimă, ca în varianta secvențială, iar rezultatul nu depinde de ordinea răspunsurilor
+        visited = set()
+        # Dicționar folosit ca mulțime ordonată: ordinea de apariție pe paginile index e un semnal de recență
+        article_candidates: Dict[str, None] = {}
+        level = [blog_index_url]
+        depth = 0
+        while level and depth <= self.max_depth and len(visited) < self.max_pages:
+            level = sorted(dict.fromkeys(u for u in level if u not in visited), key=self._frontier_priority)
+            level = level[:self.max_pages - len(visited)]
+            visited.update(level)
+            next_level = []
+            fetched = dict(self._fetch_level(level))
+            for current_url in level:
+                html_content = fetched.get(current_url)
+                if not html_content:
                     continue
-                path = parsed.path.rstrip('/')
-                segments = [seg for seg in path.split('/') if seg]
-                is_index_like = (
-                    ('page' in segments[-1].lower() if segments else False) or
-                    (len(segments) >= 2 and 'page' in segments[-2].lower()) or
-                    path.endswith('/category') or '/category/' in path or '/tag/' in path or
-                    (len(segments) >= 3 and segments[0] == 'c' and 'page' in segments[-1].lower())
-                )
-                looks_like_article = len(segments) >= len(index_segments) + 1 and not is_index_like
-                if looks_like_article:
-                    article_candidates.add(abs_url)
-                if is_index_like or (len(segments) <= len(index_segments) + 2 and depth < 2):
-                    if abs_url not in visited:
-                        queue.append((abs_url, depth + 1))
+                scanned = self._scan_index_page(current_url, html_content, depth, blog_index_url, index_path,
+                                                index_segments, excluded_index_urls)
+                for abs_url, looks_like_article, follow in scanned:
+                    if looks_like_article:
+                        article_candidates.setdefault(abs_url)
+                    if follow and abs_url not in visited:
+                        next_level.append(abs_url)
+            level = next_level
+            depth += 1
+        if level and len(visited) >= self.max_pages:
+            print(f"[WARN] Crawl budget of {self.max_pages} pages reached for {blog_index_url}.")
         return list(article_candidates)
 
+    def _structured_date(self, article_url: str) -> Optional[str]:
+        html_content = self._get_html(article_url)
+        if not html_content:
+            return None
+        soup = self.pages.derived(article_url, "soup", lambda: make_soup(html_content))
+        publish_date, source = structured_publish_date(soup, article_url)
+        if publish_date:
+            print(f"[INFO] Found publish date from {source} metadata on {article_url}; no LLM selector needed.")
+        return publish_date
+
+    def _cms_date_selector(self, article_url: str) -> Optional[str]:
+        # Selectorii cunoscuți ai CMS-ului, apoi cei găsiți deja la alți clienți de pe aceeași platformă
+        html_content = self._get_html(article_url)
+        if not self.cms_profile or not html_content:
+            return None
+        soup = self.pages.derived(article_url, "soup", lambda: make_soup(html_content))
+        learned = tuple(
+            state["date_selector"] for state in self.scraping_state.values()
+            if isinstance(state, dict) and state.get("cms") == self.cms_profile.name and state.get("date_selector")
+        )
+        selector = cms_date_selector(soup, self.cms_profile, learned)
+        if selector:
+            print(f"[INFO] Using {self.cms_profile.name} date selector '{selector}' for {article_url}; no LLM call needed.")
+        return selector
+
     def _find_date_selector_with_llm(self, article_url: str) -> Optional[str]:
         html_content = self._get_html(article_url)
         if not html_content:
             return None
         
-        soup = BeautifulSoup(html_content, "html.parser")
         # Clean the HTML for better LLM processing
-        for element in soup(["script", "style", "nav", "footer", "header"]):
-            element.decompose()
-        
-        body_text = soup.body.get_text(separator="\n", strip=True) if soup.body else ""
+        body_text = self.pages.derived(article_url, "body_text", lambda: extract_text(
+            html_content, drop_tags=("script", "style", "nav", "footer", "header")))
         
         try:
             parser = JsonOutputParser(pydantic_object=DateSelector)
@@ -196,42 +439,24 @@ class ArticleScraperV3:
         if not html_content:
             return None
         
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = self.pages.derived(url, "soup", lambda: make_soup(html_content))
         title = soup.title.string.strip() if soup.title and soup.title.string else ""
         if not title:
             h1 = soup.find('h1')
             title = h1.get_text(strip=True) if h1 else ""
         
-        text = soup.get_text(separator="\n", strip=True)
-        publish_date: Optional[str] = None
-
-        # 1. Use the provided CSS selector first
-        if date_selector:
-            date_element = soup.select_one(date_selector)
-            if date_element:
-                date_text = date_element.get('datetime') or date_element.get_text(strip=True)
-                if date_text:
-                    m = re.search(r"\d{4}-\d{2}-\d{2}", date_text)
-                    if m:
-                        publish_date = m.group(0)
-        
-        # 2. Fallback to existing methods if selector fails or is not present
-        if not publish_date:
-            meta_selectors = [
-                ("meta", {"property": "article:published_time"}),
-                ("meta", {"name": "publish_date"}),
-                ("time", {"datetime": True}),
-            ]
-            for tag, attrs in meta_selectors:
-                el = soup.find(tag, attrs)
-                if el and isinstance(el, Tag):
-                    val = el.attrs.get("content") or el.attrs.get("datetime")
-                    if isinstance(val, str):
-                        m = re.search(r"\d{4}-\d{2}-\d{2}", val)
-                        if m:
-                            publish_date = m.group(0)
-                            break
-        
+        # Doar corpul articolului: meniurile, bannerele și subsolurile nu mai ajung în text
+        body = cms_body(soup, self.cms_profile) if self.cms_profile else None
+        text = element_text(body) if body is not None else extract_main_text(soup)
+        canonical_hrefs = [urljoin(url, (link.get("href") or "").strip()) for link in soup.find_all("link", rel="canonical")]
+
+        # 1. Structured metadata: JSON-LD, OpenGraph/article:*, microdata, <time>, date in the URL path
+        publish_date, _ = structured_publish_date(soup, url)
+
+        # 2. The client's CSS selector (found by the LLM) when no structured source has a date
+        if not publish_date and date_selector:
+            publish_date = selector_date(soup, date_selector)
+
         if not publish_date:
             # Fallback to regex on the whole HTML
             date_match = re.search(r"\b\d{4}-\d{2}-\d{2}\b", html_content)
@@ -242,87 +467,344 @@ class ArticleScraperV3:
             "title": title,
             "authors": [],
             "text": text,
-            "publish_date": publish_date
+            "publish_date": publish_date,
+            "canonical_url": canonical_link(canonical_hrefs, url) or canonical_article_url(url),
         }
 
+    @contextmanager
+    def _run_scope(self, stats: Optional[Dict[str, int]] = None):
+        # Fiecare rulare (sau work item) pornește cu un store de pagini nou, contoare proprii și circuit breaker resetat
+        self.pages = PageStore(self.fetcher)
+        # Descoperirea și reverificarea indexurilor citesc din același store: o pagină se descarcă o dată per rulare
+        self.blog_index_processor.pages = self.pages
+        self.run_stats = Counter(stats or {})
+        self.cms_profile = None
+        self.breaker.reset()
+        try:
+            yield
+        finally:
+            self.blog_index_processor.pages = None
+            self.pages.close()
+            if self.breaker.open_hosts():
+                self.run_stats["circuit_open_hosts"] = len(self.breaker.open_hosts())
+            if self.run_stats:
+                print("[INFO] Run stats: " + ", ".join(f"{k}={v}" for k, v in sorted(self.run_stats.items())))
+
     def run(self, base_url: str, client_name: str):
+        with self._run_scope():
+            self._run(base_url, client_name)
+
+    def _report(self, stage: str, **details):
+        if not self.progress:
+            return
+        try:
+            self.progress(stage, {**details, "stats": dict(self.run_stats)})
+        except Exception as e:
+            print(f"[WARN] Progress callback failed: {e}")
+
+    def _is_duplicate_url(self, canonical_url: str, accepted_canonicals: set) -> bool:
+        return canonical_url in accepted_canonicals or canonical_url in self.processed_urls
+
+    def _claimed_elsewhere(self, ctx: ScrapeRun, *urls: str) -> bool:
+        # Un alt work item al aceluiași job procesează deja articolul (alt index care îl listează)
+        if ctx.claim is None:
+            return False
+        return not all(ctx.claim(u) for u in dict.fromkeys(urls))
+
+    def _near_duplicate(self, fingerprint: Optional[int], canonical_url: str, run_fingerprints: Dict[str, int]) -> Optional[str]:
+        if fingerprint is None:
+            return None
+        for url, other in run_fingerprints.items():
+            if url != canonical_url and hamming_distance(fingerprint, other) <= self.fingerprints.max_distance:
+                return url
+        return self.fingerprints.find_duplicate(fingerprint, exclude_url=canonical_url)
+
+    def _cutoff(self, latest_state_date_str: Optional[str]) -> datetime:
+        cutoff_dt = datetime.now(timezone.utc) - timedelta(days=183)
+        if latest_state_date_str:
+            try:
+                cutoff_dt = datetime.strptime(latest_state_date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            except ValueError:
+                print(f"[WARN] Invalid date format in state. Using 6-month lookback.")
+        return cutoff_dt
+
+    def _crawl_index(self, ctx: ScrapeRun, index_url: str) -> List[str]:
+        # Un index deja parcurs pentru selectorul de dată nu se mai parcurge în bucla principală
+        if index_url not in ctx.crawled_indexes:
+            ctx.crawled_indexes[index_url] = self.find_individual_article_links(
+                index_url, excluded_index_urls=ctx.rejected_index_urls, cutoff_dt=ctx.cutoff_dt)
+        return ctx.crawled_indexes[index_url]
+
+    def prepare_run(self, base_url: str, client_name: str) -> Optional[ScrapeRun]:
+        """Discovers or refreshes the client's indexes, CMS, feeds and date strategy; None when there is nothing to crawl."""
         client_key = get_client_key(client_name, base_url)
+        self._report("discovering_indexes", client_key=client_key)
         if client_key not in self.scraping_state:
             print(f"[INFO] {client_key} not found in scraping_state. Running BlogIndexProcessor...")
-            self.blog_index_processor.process_website(base_url, client_name, self.scraping_state)
-            self._save_scraping_state()
+            self._update_client_state(client_key, self.blog_index_processor.discover_website(base_url, client_name)[1])
+        else:
+            # Reverificare ieftină a indexurilor cunoscute; redescoperire doar la TTL expirat sau navigație schimbată
+            known = self.scraping_state[client_key]
+            refreshed = self.blog_index_processor.refresh_website(base_url, client_name, known)
+            if refreshed is not known:
+                self._update_client_state(client_key, {k: v for k, v in refreshed.items() if known.get(k) != v})
 
         client_state = self.scraping_state.get(client_key, {})
         blog_index_urls = client_state.get("blog_index_urls", [])
-        rejected_index_urls = set(client_state.get("rejected_index_urls", []))
         
         if not blog_index_urls:
             print(f"[WARN] No blog index URLs found for {base_url}.")
-            return
+            return None
+
+        # CMS detectat o singură dată per client (generator, asseturi, markup); None = platformă necunoscută
+        if "cms" not in client_state:
+            cms = detect_cms(self._get_html(base_url) or "") or detect_cms(self._get_html(blog_index_urls[0]) or "")
+            client_state = self._update_client_state(client_key, {"cms": cms})
+
+        # Feeds were added to discovery later; older clients get them discovered once here
+        if client_state.get("feed_urls") is None:
+            client_state = self._update_client_state(
+                client_key, {"feed_urls": self.blog_index_processor._discover_rss_feeds(base_url)})
+
+        ctx = self._run_context(client_key, base_url, client_state)
+        print(f"[INFO] Using cutoff date: {ctx.cutoff_dt.date()}")
 
         # Determine or find the date selector for this client
-        date_selector = client_state.get("date_selector")
-        if not date_selector:
-            print(f"[INFO] No date selector found for {client_key}. Attempting to find one with LLM.")
+        # "structured": articolele au dată în metadate, selectorul LLM nu e necesar
+        if not ctx.date_selector and client_state.get("date_strategy") != "structured":
+            print(f"[INFO] No date selector found for {client_key}. Checking structured metadata before asking the LLM.")
             # Find a selector using the first article of the first index page
-            if blog_index_urls:
-                first_index_links = self.find_individual_article_links(blog_index_urls[0], rejected_index_urls)
-                if first_index_links:
-                    date_selector = self._find_date_selector_with_llm(first_index_links[0])
-                    if date_selector:
-                        self.scraping_state.setdefault(client_key, {})["date_selector"] = date_selector
-                        self._save_scraping_state()
-                else:
-                    print(f"[WARN] Could not find any article links on {blog_index_urls[0]} to determine a date selector.")
-
-        latest_state_date_str = client_state.get("latest_article_date")
-        cutoff_dt = datetime.now(timezone.utc) - timedelta(days=183)
-        if latest_state_date_str:
+            index_path = urlparse(blog_index_urls[0]).path.rstrip('/')
+            first_index_links = [e.url for e in ctx.feed_entries if urlparse(e.url).path.startswith(index_path + '/')]
+            if not first_index_links:
+                first_index_links = self._crawl_index(ctx, blog_index_urls[0])
+            if first_index_links and self._structured_date(first_index_links[0]):
+                self._update_client_state(client_key, {"date_strategy": "structured"})
+            elif first_index_links:
+                # Modelul LLM este folosit doar pentru șabloane necunoscute
+                ctx.date_selector = self._cms_date_selector(first_index_links[0]) or self._find_date_selector_with_llm(first_index_links[0])
+                if ctx.date_selector:
+                    self._update_client_state(client_key, {"date_selector": ctx.date_selector})
+            else:
+                print(f"[WARN] Could not find any article links on {blog_index_urls[0]} to determine a date selector.")
+        return ctx
+
+    def _run_context(self, client_key: str, base_url: str, client_state: Dict,
+                      cutoff_dt: Optional[datetime] = None) -> ScrapeRun:
+        # Contextul rulării din starea clientului sau din planul unui work item (aceleași câmpuri)
+        self.cms_profile = cms_profile(client_state.get("cms"))
+        if self.cms_profile:
+            print(f"[INFO] {client_key} runs on {self.cms_profile.name}; using its built-in extractors.")
+        feed_urls = list(client_state.get("feed_urls") or [])
+        return ScrapeRun(
+            client_key=client_key,
+            base_url=base_url,
+            blog_index_urls=list(client_state["blog_index_urls"]),
+            rejected_index_urls=set(client_state.get("rejected_index_urls", [])),
+            feed_entries=self._load_feed_entries(feed_urls),
+            date_selector=client_state.get("date_selector"),
+            cutoff_dt=cutoff_dt or self._cutoff(client_state.get("latest_article_date")),
+            cms=client_state.get("cms"),
+            feed_urls=feed_urls,
+        )
+
+    def _flush_run(self, ctx: ScrapeRun):
+        # Salvează articolele acceptate de la ultima salvare, apoi amprentele lor
+        pending = ctx.new_articles[ctx.saved_count:]
+        if pending:
+            self._save_articles(pending)
+            ctx.saved_count = len(ctx.new_articles)
+            self.run_stats["saved_articles"] += len(pending)
+        for canonical_url, fingerprint in ctx.run_fingerprints.items():
+            if canonical_url not in ctx.saved_fingerprints:
+                self.fingerprints.add(canonical_url, fingerprint)
+                ctx.saved_fingerprints.add(canonical_url)
+
+    def _checkpoint(self, ctx: ScrapeRun, on_checkpoint: Callable[[Dict], None], article_links: List[str],
+                    feed_dates: Dict[str, datetime], position: int, consecutive_old: int, done: bool = False):
+        # Articolele sunt pe disc înainte ca poziția să avanseze: la reluare, cele salvate sunt deja "văzute"
+        self._flush_run(ctx)
+        on_checkpoint({
+            "article_links": article_links,
+            "feed_dates": {url: dt.isoformat() for url, dt in feed_dates.items()},
+            "position": position,
+            "consecutive_old": consecutive_old,
+            "newest_date": ctx.newest_dt_found.strftime("%Y-%m-%d") if ctx.newest_dt_found else None,
+            "stats": dict(self.run_stats),
+            "done": done,
+        })
+
+    def process_index(self, ctx: ScrapeRun, blog_index_url: str, checkpoint: Optional[Dict] = None,
+                      on_checkpoint: Optional[Callable[[Dict], None]] = None):
+        """
+        Lists one blog index and extracts its new articles into ctx. With on_checkpoint, accepted articles are
+        saved every CHECKPOINT_EVERY candidates together with the candidate list and position, and a
+        restarted work item passes the last checkpoint back to resume where it stopped.
+        """
+        checkpoint = checkpoint or {}
+        if "article_links" in checkpoint:
+            article_links = list(checkpoint["article_links"])
+            feed_dates = {url: datetime.fromisoformat(dt) for url, dt in checkpoint.get("feed_dates", {}).items()}
+            print(f"[INFO] Resuming {blog_index_url} at candidate {checkpoint.get('position', 0)} of {len(article_links)}.")
+        else:
+            index_feed_entries = self._feed_entries_for_index(ctx.feed_entries, blog_index_url, ctx.cutoff_dt)
+            if index_feed_entries is not None:
+                # The feed covers the whole window: no need to crawl the index pages
+                feed_dates = {e.url: e.published for e in index_feed_entries}
+                article_links = list(feed_dates)
+                print(f"[INFO] Using feed for {blog_index_url}: {len(article_links)} articles since cutoff.")
+            else:
+                feed_dates = {}
+                article_links = self._crawl_index(ctx, blog_index_url)
+                print(f"[INFO] Found {len(article_links)} potential articles in {blog_index_url}.")
+                if self.recency_mode:
+                    if ctx.lastmods is None:
+                        ctx.lastmods = self._sitemap_lastmods(ctx.base_url, ctx.cutoff_dt)
+                    article_links = order_by_recency(article_links, ctx.lastmods)
+            if on_checkpoint:
+                self._checkpoint(ctx, on_checkpoint, article_links, feed_dates, 0, 0)
+
+        consecutive_old = checkpoint.get("consecutive_old", 0)
+        for position in range(checkpoint.get("position", 0), len(article_links)):
+            article_url = article_links[position]
+            if on_checkpoint and position and position % CHECKPOINT_EVERY == 0:
+                self._checkpoint(ctx, on_checkpoint, article_links, feed_dates, position, consecutive_old)
+            if article_url in ctx.accepted_urls or article_url in self.processed_urls:
+                continue
+            if self.recency_mode and self.recency_stop_after and consecutive_old >= self.recency_stop_after:
+                # Candidații sunt ordonați de la cel mai nou: restul indexului e, cel mai probabil, mai vechi
+                remaining = [u for u in article_links[position:] if u not in ctx.accepted_urls and u not in self.processed_urls]
+                self.run_stats["skipped_old_fetches"] += len(remaining)
+                print(f"[INFO] {consecutive_old} consecutive articles older than cutoff in {blog_index_url}; "
+                      f"skipping {len(remaining)} remaining candidates.")
+                break
+            if url_date_before(article_url, ctx.cutoff_dt):
+                # Data din URL e clar mai veche decât cutoff-ul: nu mai descărcăm articolul
+                consecutive_old += 1
+                self.run_stats["skipped_old_fetches"] += 1
+                continue
+            if self._is_duplicate_url(canonical_article_url(article_url), ctx.accepted_canonicals) or \
+                    self._claimed_elsewhere(ctx, canonical_article_url(article_url)):
+                # Același articol sub alt URL (parametri de tracking, /en/, AMP): nu îl mai descărcăm
+                self.run_stats["duplicates_by_url"] += 1
+                continue
+
+            self._report("extracting_articles", index_url=blog_index_url, position=position + 1,
+                         candidates=len(article_links), accepted=len(ctx.new_articles))
+            self.run_stats["fetched_articles"] += 1
+            article_data = self.extract_article_data(article_url, ctx.date_selector)
+            if article_data and article_url in feed_dates:
+                article_data["publish_date"] = feed_dates[article_url].strftime("%Y-%m-%d")
+            if not (article_data and article_data.get("publish_date")):
+                continue
+
             try:
-                cutoff_dt = datetime.strptime(latest_state_date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-            except ValueError:
-                print(f"[WARN] Invalid date format in state. Using 6-month lookback.")
-        
-        print(f"[INFO] Using cutoff date: {cutoff_dt.date()}")
+                art_dt = datetime.strptime(article_data["publish_date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            except (ValueError, TypeError):
+                continue
 
-        new_articles = []
-        newest_dt_found: Optional[datetime] = None
-        for blog_index_url in blog_index_urls:
-            article_links = self.find_individual_article_links(blog_index_url, excluded_index_urls=rejected_index_urls)
-            print(f"[INFO] Found {len(article_links)} potential articles in {blog_index_url}.")
-            
-            for article_url in article_links:
-                if article_url in self.processed_urls:
+            if art_dt < ctx.cutoff_dt:
+                consecutive_old += 1
+            else:
+                consecutive_old = 0
+                canonical_url = article_data["canonical_url"]
+                if canonical_article_url(article_url) != canonical_url and (
+                        self._is_duplicate_url(canonical_url, ctx.accepted_canonicals) or self._claimed_elsewhere(ctx, canonical_url)):
+                    self.run_stats["duplicates_by_canonical"] += 1
                     continue
-                
-                article_data = self.extract_article_data(article_url, date_selector)
-                if not (article_data and article_data.get("publish_date")):
+                fingerprint = simhash(article_data["text"])
+                duplicate_of = self._near_duplicate(fingerprint, canonical_url, ctx.run_fingerprints)
+                if duplicate_of:
+                    print(f"[INFO] {article_url} duplicates {duplicate_of}; skipping.")
+                    self.run_stats["duplicates_by_content"] += 1
                     continue
+                if fingerprint is not None:
+                    ctx.run_fingerprints[canonical_url] = fingerprint
+                    if ctx.claim is not None:
+                        # Amprenta e vizibilă imediat pentru celelalte work item-uri (nu doar la checkpoint)
+                        self.fingerprints.add(canonical_url, fingerprint)
+                        ctx.saved_fingerprints.add(canonical_url)
+                ctx.accepted_canonicals.update((canonical_article_url(article_url), canonical_url))
+                ctx.new_articles.append(article_data)
+                ctx.accepted_urls.add(article_url)
+                if ctx.newest_dt_found is None or art_dt > ctx.newest_dt_found:
+                    ctx.newest_dt_found = art_dt
+        if on_checkpoint:
+            self._checkpoint(ctx, on_checkpoint, article_links, feed_dates, len(article_links), consecutive_old, done=True)
 
-                try:
-                    art_dt = datetime.strptime(article_data["publish_date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                except (ValueError, TypeError):
-                    continue
+    def record_latest_article_date(self, client_key: str, newest_dt: datetime):
+        """Moves the client's latest_article_date forward (never back), re-reading the state saved by other workers."""
+        entry = load_scraping_state(self.state_path).get(client_key) or self.scraping_state.get(client_key, {})
+        latest_state_date_str = entry.get("latest_article_date")
+        try:
+            if latest_state_date_str and newest_dt <= datetime.strptime(latest_state_date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc):
+                return
+        except ValueError:
+            pass
+        newest_str = newest_dt.strftime("%Y-%m-%d")
+        merge_scraping_state({client_key: {**entry, "latest_article_date": newest_str}}, self.state_path, self.scraping_state)
+        print(f"[INFO] Updated latest_article_date to {newest_str}")
 
-                if art_dt >= cutoff_dt:
-                    new_articles.append(article_data)
-                    self.processed_urls.add(article_url)
-                    if newest_dt_found is None or art_dt > newest_dt_found:
-                        newest_dt_found = art_dt
-        
-        if new_articles:
-            self._save_articles(new_articles)
-            print(f"[INFO] Saved {len(new_articles)} new articles.")
-            if newest_dt_found:
-                newest_str = newest_dt_found.strftime("%Y-%m-%d")
-                # Update state only if the newest found date is later than the one in the state
-                if not latest_state_date_str or newest_dt_found > datetime.strptime(latest_state_date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc):
-                    self.scraping_state.setdefault(client_key, {})["latest_article_date"] = newest_str
-                    self._save_scraping_state()
-                    print(f"[INFO] Updated latest_article_date to {newest_str}")
+    def finish_run(self, ctx: ScrapeRun, record_latest: bool = True):
+        if self.run_stats["skipped_old_fetches"]:
+            print(f"[INFO] Skipped {self.run_stats['skipped_old_fetches']} article fetches older than the cutoff.")
+        if ctx.new_articles:
+            self._report("saving", articles=len(ctx.new_articles))
+            self._flush_run(ctx)
+            print(f"[INFO] Saved {len(ctx.new_articles)} new articles.")
+            # Update state only if the newest found date is later than the one in the state
+            if record_latest and ctx.newest_dt_found:
+                self.record_latest_article_date(ctx.client_key, ctx.newest_dt_found)
         else:
             print("[INFO] No new articles found meeting the criteria.")
 
+    def _run(self, base_url: str, client_name: str):
+        ctx = self.prepare_run(base_url, client_name)
+        if ctx is None:
+            return
+        for index_number, blog_index_url in enumerate(ctx.blog_index_urls, start=1):
+            self._report("crawling_index", index_url=blog_index_url, index=index_number, indexes=len(ctx.blog_index_urls))
+            self.process_index(ctx, blog_index_url)
+        self.finish_run(ctx)
+
+    def plan_run(self, base_url: str, client_name: str) -> Optional[ScrapeRun]:
+        """
+        prepare_run() for the fan-out mode: the indexes are then processed by separate work items.
+        The sitemap lastmods are read here once and handed to every item.
+        """
+        with self._run_scope():
+            ctx = self.prepare_run(base_url, client_name)
+            if ctx is not None and self.recency_mode and ctx.lastmods is None:
+                ctx.lastmods = self._sitemap_lastmods(ctx.base_url, ctx.cutoff_dt)
+            return ctx
+
+    def run_index_item(self, base_url: str, blog_index_url: str, plan: Dict, cutoff_dt: datetime,
+                       checkpoint: Optional[Dict] = None, on_checkpoint: Optional[Callable[[Dict], None]] = None,
+                       claim: Optional[Callable[[str], bool]] = None,
+                       lastmods: Optional[Dict[str, datetime]] = None) -> Optional[datetime]:
+        """
+        One fan-out work item: a single blog index, resumable from its checkpoint. The run is rebuilt from
+        the job's plan (ScrapeRun.plan), not from this instance's scraping_state, and every article is
+        claimed through `claim` first, so items listing the same post do not both save it.
+        Returns the newest article date found.
+        """
+        if not plan.get("blog_index_urls"):
+            raise ValueError(f"The job has no run plan for {blog_index_url}")
+        checkpoint = checkpoint or {}
+        with self._run_scope(checkpoint.get("stats")):
+            ctx = self._run_context(plan["client_key"], base_url, plan, cutoff_dt)
+            ctx.claim = claim
+            if lastmods is not None:
+                ctx.lastmods = lastmods
+            if checkpoint.get("newest_date"):
+                ctx.newest_dt_found = datetime.strptime(checkpoint["newest_date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            if "crawled_links" in checkpoint:
+                # Indexul parcurs deja la planificare (pentru selectorul de dată) nu se mai parcurge
+                ctx.crawled_indexes[blog_index_url] = checkpoint["crawled_links"]
+            self.process_index(ctx, blog_index_url, checkpoint, on_checkpoint)
+            self.finish_run(ctx, record_latest=False)
+            return ctx.newest_dt_found
+
 if __name__ == "__main__":
     if len(sys.argv) < 3:
         print("Usage: python article_scraping.py [base_url] [client_name]")
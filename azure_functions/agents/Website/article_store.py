@@ -0,0 +1,165 @@
+import os
+import io
+import json
+import threading
+from typing import Dict, Iterator, List, Optional, Set
+
+try:
+    import zstandard
+except ImportError:  # zstandard este opțional; fără el segmentele rămân JSONL simplu
+    zstandard = None
+
+# Depozit append-only de articole: segmente JSONL (opțional zstd) + index separat cu URL-urile
+ARTICLE_STORE_DIR = os.getenv("WEBSITE_ARTICLE_STORE_DIR", os.path.join(os.path.dirname(__file__), "article_store"))
+ARTICLE_STORE_COMPRESS = os.getenv("WEBSITE_ARTICLE_STORE_COMPRESS", "0") == "1"
+SEGMENT_MAX_BYTES = int(os.getenv("WEBSITE_ARTICLE_SEGMENT_MAX_MB", "16")) * 1024 * 1024
+
+INDEX_FILENAME = "urls.idx"
+SEGMENT_PREFIX = "segment-"
+
+
+class ArticleStore:
+    """
+    Append-only article store. Each save appends one block of JSON lines to the active segment
+    (one zstd frame per block when compression is on) and then the article URLs to a compact
+    index file, so start-up reads only the index. compact() rewrites everything into one segment.
+    """
+
+    def __init__(self, store_dir: str = ARTICLE_STORE_DIR, compress: bool = ARTICLE_STORE_COMPRESS,
+                 segment_max_bytes: int = SEGMENT_MAX_BYTES, legacy_path: Optional[str] = None):
+        if compress and zstandard is None:
+            print("[WARN] zstandard is not installed; article segments will be stored uncompressed.")
+            compress = False
+        self.store_dir = store_dir
+        self.compress = compress
+        self.segment_max_bytes = segment_max_bytes
+        self.index_path = os.path.join(store_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        os.makedirs(store_dir, exist_ok=True)
+        if legacy_path and not os.path.exists(self.index_path):
+            self._import_legacy(legacy_path)
+
+    # --- segmente ---
+
+    def _segments(self) -> List[str]:
+        names = [n for n in os.listdir(self.store_dir) if n.startswith(SEGMENT_PREFIX) and not n.endswith(".tmp")]
+        return [os.path.join(self.store_dir, n) for n in sorted(names)]
+
+    def _segment_name(self, number: int) -> str:
+        suffix = ".jsonl.zst" if self.compress else ".jsonl"
+        return os.path.join(self.store_dir, f"{SEGMENT_PREFIX}{number:06d}{suffix}")
+
+    def _active_segment(self) -> str:
+        segments = self._segments()
+        if not segments:
+            return self._segment_name(1)
+        last = segments[-1]
+        number = int(os.path.basename(last)[len(SEGMENT_PREFIX):].split(".")[0])
+        # Segmentul curent se închide la depășirea dimensiunii sau la schimbarea compresiei
+        if os.path.getsize(last) >= self.segment_max_bytes or last.endswith(".zst") != self.compress:
+            return self._segment_name(number + 1)
+        return last
+
+    def _encode(self, articles: List[Dict], compress: bool) -> bytes:
+        data = "".join(json.dumps(a, ensure_ascii=False) + "\n" for a in articles).encode("utf-8")
+        return zstandard.ZstdCompressor().compress(data) if compress else data
+
+    @staticmethod
+    def _append_bytes(path: str, data: bytes):
+        # Un singur write + fsync: un bloc este fie complet pe disc, fie lipsește
+        with open(path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_segment(self, path: str) -> Iterator[Dict]:
+        with open(path, "rb") as raw:
+            if path.endswith(".zst"):
+                if zstandard is None:
+                    raise RuntimeError(f"zstandard is required to read {path}")
+                stream = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True),
+                                          encoding="utf-8")
+            else:
+                stream = io.TextIOWrapper(raw, encoding="utf-8")
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Ultima linie poate fi incompletă după o întrerupere; o ignorăm
+                    continue
+
+    # --- API ---
+
+    def iter_urls(self) -> Iterator[str]:
+        """URLs of all stored articles, streamed from the index only."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield line.rstrip("\n")
+        except FileNotFoundError:
+            return
+
+    def urls(self) -> Set[str]:
+        return set(self.iter_urls())
+
+    def append(self, articles: List[Dict]):
+        articles = [a for a in articles if a.get("url")]
+        if not articles:
+            return
+        with self._lock:
+            self._append_bytes(self._active_segment(), self._encode(articles, self.compress))
+            # Indexul se scrie după segment: un URL din index are mereu articolul pe disc
+            self._append_bytes(self.index_path, "".join(a["url"] + "\n" for a in articles).encode("utf-8"))
+
+    def iter_articles(self) -> Iterator[Dict]:
+        for path in self._segments():
+            yield from self._read_segment(path)
+
+    def compact(self) -> int:
+        """Rewrites all segments into one, keeping the latest copy of each URL, and rebuilds the index."""
+        with self._lock:
+            old_segments = self._segments()
+            latest: Dict[str, Dict] = {}
+            for path in old_segments:
+                for article in self._read_segment(path):
+                    if article.get("url"):
+                        latest.pop(article["url"], None)
+                        latest[article["url"]] = article
+            target = self._segment_name(1)
+            tmp_segment = target + ".tmp"
+            with open(tmp_segment, "wb") as f:
+                f.write(self._encode(list(latest.values()), self.compress))
+            tmp_index = self.index_path + ".tmp"
+            with open(tmp_index, "w", encoding="utf-8") as f:
+                f.write("".join(url + "\n" for url in latest))
+            os.replace(tmp_segment, target)
+            for path in old_segments:
+                if path != target:
+                    os.remove(path)
+            os.replace(tmp_index, self.index_path)
+            return len(latest)
+
+    def _import_legacy(self, legacy_path: str):
+        # Migrare unică din vechiul scraped_articles.json (listă JSON cu indent)
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                articles = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            articles = []
+        if articles:
+            print(f"[INFO] Importing {len(articles)} articles from {legacy_path} into the article store")
+            self.append(articles)
+        else:
+            open(self.index_path, "a", encoding="utf-8").close()
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2 or sys.argv[1] != "compact":
+        print("Usage: python article_store.py compact")
+        sys.exit(1)
+    print(f"[INFO] Compacted article store to {ArticleStore().compact()} articles")
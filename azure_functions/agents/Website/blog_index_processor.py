@@ -1,20 +1,31 @@
 import os
 import json
 import sys
-import re
-import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+import hashlib
 from urllib.parse import urljoin, urlparse
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic.v1 import BaseModel, Field
-from typing import Tuple, List, Dict, Any
-from xml.etree import ElementTree
+from typing import Tuple, List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
+import threading
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 from agents._tools.llm_client import llm
-
+from agents._tools.html_parsing import make_soup, extract_links
+from http_client import build_session, CircuitBreaker, HostLimiter, HostThrottle, PageFetcher, PageResponse, MAX_RETRIES, HTML_CONTENT_TYPES
+from http_cache import HttpCache, HTTP_CACHE_ENABLED
+from page_store import PageStore
+from classification_cache import ClassificationCache
+from page_heuristics import heuristic_page_type
+from sitemap_reader import sitemap_seeds, iter_sitemap
+from feed_reader import discover_feed_links, parse_feed, COMMON_FEED_PATHS
+from url_rules import UrlRuleEngine, load_url_rules
+from scraping_state import SCRAPING_STATE_PATH, merge_scraping_state
+
+# Valori implicite pentru filtrarea URL-urilor; url_rules.json le poate suprascrie și adaugă reguli per domeniu
 KEYWORDS = [
     'blog', 'news', 'articles', 'insights', 'resources', 'stories', 'press', 'events', 'updates', 'journal', 'media', 'publications'
 ]
@@ -44,17 +55,30 @@ COMMON_INDEX_PATHS = [
 # Tokenuri acceptate pentru secțiuni index (generice, fără hardcoding pe domenii)
 INDEX_TOKENS = {"blog", "community-blog", "resources", "insights", "news", "press", "stories", "updates", "articles", "c"}
 
-# Reguli specifice pe domeniu pentru a exclude anumite căi ca indexuri
-DOMAIN_EXCLUDE_INDEX_SEGMENTS = {
-    "uipath.com": {"/events", "/resources"}
-}
+# Regiunile de navigație din care se calculează amprenta homepage-ului
+NAV_REGION_SELECTOR = "nav, header, footer, [role=navigation]"
+# Amprentele calculate altfel (fără prefix, din toate linkurile) sunt înlocuite, nu comparate
+NAV_FINGERPRINT_PREFIX = "nav2:"
 
 # Limită de candidați pentru validare/LLM, pentru a accelera rularile
 MAX_INDEX_CANDIDATES = 80
 
+# Validare concurentă a candidaților: limită globală de workeri și limită per host
+VALIDATION_MAX_WORKERS = int(os.getenv("BLOG_INDEX_MAX_WORKERS", "8"))
+VALIDATION_PER_HOST_LIMIT = int(os.getenv("BLOG_INDEX_PER_HOST_LIMIT", "4"))
+
+# Modul batch: câte site-uri se procesează în paralel (limita per host rămâne cea de mai sus)
+BATCH_SITE_WORKERS = int(os.getenv("BLOG_INDEX_BATCH_SITE_WORKERS", "4"))
+# Redescoperire completă doar după TTL sau când navigația homepage-ului se schimbă;
+# între timp, indexurile cunoscute sunt reverificate ieftin cel mult o dată la VERIFY_INTERVAL_HOURS
+DISCOVERY_TTL_DAYS = int(os.getenv("BLOG_INDEX_DISCOVERY_TTL_DAYS", "30"))
+VERIFY_INTERVAL_HOURS = int(os.getenv("BLOG_INDEX_VERIFY_INTERVAL_HOURS", "24"))
+
+# Lista implicită de clienți pentru modul batch
+SITES_CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'config', 'sites.json'))
+
 # Acceptă doar locale en/ro; excludem alte prefixe de limbă
 ALLOWED_LOCALES = {"en", "ro"}
-LOCALE_REGEX = re.compile(r"^/([a-z]{2})(/|$)")
 
 LLM_PROMPT = """
 You are a web content analyst. Classify a web page based on its cleaned text content.
@@ -73,20 +97,73 @@ Rules:
 Return ONLY JSON with: {{"page_type": "...", "reason": "..."}}
 """
 
+BATCH_LLM_PROMPT = LLM_PROMPT.replace(
+    'Return ONLY JSON with: {{"page_type": "...", "reason": "..."}}',
+    'You will receive several pages, each starting with "### PAGE <id>" followed by its URL and cleaned text.\n'
+    'Classify every page independently.\n'
+    'Return ONLY JSON with: {{"results": [{{"id": "...", "page_type": "...", "reason": "..."}}]}} '
+    'containing exactly one entry per page id.'
+)
+
+# Versiunea promptului intră în cheia cache-ului de clasificări; orice modificare a prompturilor îl invalidează
+LLM_PROMPT_VERSION = hashlib.sha256((LLM_PROMPT + BATCH_LLM_PROMPT).encode("utf-8")).hexdigest()[:12]
+
+PAGE_TYPES = {"BLOG_INDEX", "RESOURCES_MIX", "SINGLE_ARTICLE", "PRODUCT_PAGE", "OTHER"}
+
+# Clasificare în loturi: câte pagini intră într-un singur apel LLM (1 = câte un apel per pagină)
+CLASSIFY_BATCH_SIZE = int(os.getenv("BLOG_INDEX_CLASSIFY_BATCH_SIZE", "5"))
+# Textul fiecărei pagini este trunchiat mai agresiv în modul lot
+BATCH_TEXT_LIMIT = 4000
+
 class PageAnalysis(BaseModel):
     page_type: str = Field(description="Type of the page")
     reason: str = Field(description="Short reason for classification")
 
+class BatchPageAnalysis(PageAnalysis):
+    id: str = Field(description="Id of the page as given in the request")
+
+class BatchPageAnalyses(BaseModel):
+    results: List[BatchPageAnalysis] = Field(description="One classification per page id")
+
 class BlogIndexLinks(BaseModel):
     urls: List[str] = Field(description="A list of URLs to main blog/news/resources index pages")
 
 class BlogIndexProcessor:
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, per_host_limit: Optional[int] = None,
+                 http_cache: Optional[HttpCache] = None, classification_cache: Optional[ClassificationCache] = None,
+                 batch_size: Optional[int] = None, url_rules: Optional[UrlRuleEngine] = None,
+                 throttle: Optional[HostThrottle] = None, breaker: Optional[CircuitBreaker] = None):
+        # max_workers=1 păstrează modul secvențial
+        self.max_workers = max(1, max_workers if max_workers is not None else VALIDATION_MAX_WORKERS)
+        self.host_limiter = HostLimiter(per_host_limit if per_host_limit is not None else VALIDATION_PER_HOST_LIMIT)
+        self.session = build_session(REQUEST_HEADERS, pool_size=max(10, self.max_workers * 2))
+        # Cache HTTP pe disc, partajat cu ArticleScraperV3 când acesta îl transmite
+        self.http_cache = http_cache if http_cache is not None else (HttpCache() if HTTP_CACHE_ENABLED else None)
+        # Ritm adaptiv, reîncercări și circuit breaker per domeniu; partajate cu ArticleScraperV3 când le transmite
+        self.throttle = throttle if throttle is not None else HostThrottle()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.fetcher = PageFetcher(self.session, self.host_limiter, self.http_cache,
+                                   throttle=self.throttle, breaker=self.breaker, max_retries=MAX_RETRIES)
+        # Store-ul de pagini al rulării ArticleScraperV3 în curs (setat de aceasta): homepage-ul și indexurile
+        # descărcate aici pentru descoperire/reverificare nu se mai descarcă o dată la crawl
+        self.pages: Optional[PageStore] = None
+        self.classification_cache = classification_cache if classification_cache is not None else ClassificationCache()
+        self.batch_size = max(1, batch_size if batch_size is not None else CLASSIFY_BATCH_SIZE)
+        # Motor de reguli compilat: clasifică fiecare URL într-o singură trecere (cu cache)
+        self.url_rules = url_rules if url_rules is not None else load_url_rules(KEYWORDS, EXCLUDE_KEYWORDS, EXTENSIONS, ALLOWED_LOCALES)
+        # Contorizează ce cale a decis clasificarea: heuristic / cache / llm / llm_batch
+        self.decision_counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
         self.output_parser = JsonOutputParser(pydantic_object=PageAnalysis)
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", LLM_PROMPT),
             ("human", "{text}")
         ])
+        self.batch_output_parser = JsonOutputParser(pydantic_object=BatchPageAnalyses)
+        self.batch_prompt = ChatPromptTemplate.from_messages([
+            ("system", BATCH_LLM_PROMPT),
+            ("human", "{pages}")
+        ])
         self.index_list_parser = JsonOutputParser(pydantic_object=BlogIndexLinks)
         self.index_list_prompt = ChatPromptTemplate.from_messages([
             ("system", "You are an expert web navigator. Given a site's base URL and a list of internal links (with anchor text), return only the root section URLs that likely serve as indexes for blog/news/resources articles. Output JSON with 'urls'."),
@@ -116,188 +193,246 @@ class BlogIndexProcessor:
             return False
         return True
 
-    def _normalize_netloc(self, netloc: str) -> str:
-        return netloc[4:] if netloc.startswith("www.") else netloc
-
     def _is_internal(self, base_url: str, candidate_url: str) -> bool:
-        base_netloc = self._normalize_netloc(urlparse(base_url).netloc)
-        cand_netloc = self._normalize_netloc(urlparse(candidate_url).netloc)
         # Accept same domain or subdomains
-        return cand_netloc == base_netloc or cand_netloc.endswith("." + base_netloc)
+        return self.url_rules.is_internal(base_url, candidate_url)
+
+    def _fetch(self, url: str, accept_types: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES) -> PageResponse:
+        source = self.pages if self.pages is not None else self.fetcher
+        return source.fetch(url, accept_types=accept_types)
 
     def _get_html(self, url: str) -> str:
-        try:
-            resp = requests.get(url, timeout=10, headers=REQUEST_HEADERS, allow_redirects=True)
-            if resp.status_code == 200:
-                return resp.text
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch {url}: {e}")
-        return ""
+        page = self._fetch(url)
+        return page.text if page.ok else ""
 
-    def _discover_from_sitemap(self, base_url: str) -> List[str]:
+    def _discover_from_sitemap(self, base_url: str, since: Optional[datetime] = None) -> List[str]:
         candidates: List[str] = []
+        seeds = sitemap_seeds(self.fetcher, base_url)
+        # Citire incrementală (iterparse), cu recursie în sitemapindex și suport .xml.gz
+        for entry in iter_sitemap(self.fetcher, seeds, since=since):
+            path = urlparse(entry.loc).path
+            segs = self._strip_locale_from_path(path)
+            # Acceptă secțiuni cu un segment (ex: /blog) sau pattern /c/category-name
+            if (len(segs) == 1 and segs[0].lower() in INDEX_TOKENS) or \
+               (len(segs) == 2 and segs[0].lower() == "c"):
+                candidates.append(entry.loc)
+        return list(dict.fromkeys(candidates))
+
+    def _probe_feed(self, url: str) -> Optional[str]:
+        page = self._fetch(url, accept_types=None)
+        if page.ok and parse_feed(page.text, page.final_url):
+            return page.final_url
+        return None
+
+    def _discover_rss_feeds(self, base_url: str, homepage_html: Optional[str] = None) -> List[str]:
+        # 1. Feed-uri declarate în homepage prin <link rel="alternate">
+        if homepage_html is None:
+            homepage_html = self._get_html(base_url)
+        declared = [u for u in discover_feed_links(homepage_html, base_url) if self._is_internal(base_url, u)]
+        feeds = [u for u in self._map_concurrently(self._probe_feed, declared, "feeds") if u]
+        if feeds:
+            return list(dict.fromkeys(feeds))
+        # 2. Fallback: căi comune, verificate concurent
         parsed = urlparse(base_url)
         root = f"{parsed.scheme}://{parsed.netloc}"
-        for path in ("/sitemap.xml", "/sitemap_index.xml"):
-            sitemap_url = urljoin(root, path)
-            try:
-                resp = requests.get(sitemap_url, timeout=10, headers=REQUEST_HEADERS, allow_redirects=True)
-                if resp.status_code != 200:
-                    continue
-                content = resp.text
-                # Simplu: căutăm URL-uri în sitemap care conțin cuvinte cheie
-                try:
-                    tree = ElementTree.fromstring(content)
-                    ns = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-                    loc_elems = tree.findall('.//sm:loc', ns)
-                    if not loc_elems:
-                        loc_elems = tree.findall('.//loc')
-                    for loc in loc_elems:
-                        url_text = loc.text or ""
-                        path = urlparse(url_text).path
-                        segs = self._strip_locale_from_path(path)
-                        # Acceptă secțiuni cu un segment (ex: /blog) sau pattern /c/category-name
-                        if (len(segs) == 1 and segs[0].lower() in INDEX_TOKENS) or \
-                           (len(segs) == 2 and segs[0].lower() == "c"):
-                            candidates.append(url_text)
-                except ElementTree.ParseError:
-                    # Fallback simplu pe regex
-                    for m in re.finditer(r"<loc>(.*?)</loc>", content, re.IGNORECASE):
-                        url_text = m.group(1)
-                        path = urlparse(url_text).path
-                        segs = self._strip_locale_from_path(path)
-                        # Acceptă secțiuni cu un segment (ex: /blog) sau pattern /c/category-name
-                        if (len(segs) == 1 and segs[0].lower() in INDEX_TOKENS) or \
-                           (len(segs) == 2 and segs[0].lower() == "c"):
-                            candidates.append(url_text)
-            except Exception:
-                continue
-        return list(set(candidates))
-
-    def _discover_rss_feeds(self, base_url: str) -> List[str]:
-        parsed = urlparse(base_url)
-        root = f"{parsed.scheme}://{parsed.netloc}"
-        common = [
-            "/feed", "/rss", "/rss.xml"
-        ] + [f"/{token}/feed" for token in INDEX_TOKENS] + [f"/{token}/rss" for token in INDEX_TOKENS]
-        feeds = []
-        for p in common:
-            u = urljoin(root, p)
-            try:
-                r = requests.head(u, timeout=5, headers=REQUEST_HEADERS, allow_redirects=True)
-                if 200 <= r.status_code < 400:
-                    # Păstrează doar feed-uri de secțiune (rădăcină sau 1 segment + feed)
-                    segs = self._strip_locale_from_path(urlparse(u).path)
-                    base_segs = [s for s in segs if s not in ("feed", "rss", "rss.xml")]
-                    if len(base_segs) == 1 and base_segs[0].lower() in INDEX_TOKENS:
-                        feeds.append(u)
-            except Exception:
-                continue
-        return list(set(feeds))
-
-    def _validate_url(self, url: str) -> bool:
-        try:
-            resp = requests.head(url, timeout=7, headers=REQUEST_HEADERS, allow_redirects=True)
-            if 200 <= resp.status_code < 400:
-                return True
-            # Fallback to GET for servers that don't support HEAD or block it
-            if resp.status_code in (405, 403):
-                resp_get = requests.get(url, timeout=10, headers=REQUEST_HEADERS, allow_redirects=True, stream=True)
-                return 200 <= resp_get.status_code < 400
-            return False
-        except Exception:
-            try:
-                resp_get = requests.get(url, timeout=10, headers=REQUEST_HEADERS, allow_redirects=True, stream=True)
-                return 200 <= resp_get.status_code < 400
-            except Exception:
-                return False
-
-    def _analyze_page_type(self, url: str) -> dict:
-        html = self._get_html(url)
-        if not html:
-            return {"page_type": "OTHER", "reason": "empty_or_fetch_error"}
-        soup = BeautifulSoup(html, "html.parser")
+        probes = [urljoin(root, p) for p in COMMON_FEED_PATHS]
+        for token in sorted(INDEX_TOKENS - {"c"}):
+            probes += [urljoin(root, f"/{token}/feed"), urljoin(root, f"/{token}/rss")]
+        feeds = [u for u in self._map_concurrently(self._probe_feed, probes, "feed probes") if u]
+        return list(dict.fromkeys(feeds))
+
+    def _record_decision(self, analysis: dict, decided_by: str) -> dict:
+        analysis["decided_by"] = decided_by
+        with self._counts_lock:
+            self.decision_counts[decided_by] += 1
+        return analysis
+
+    def _page_text(self, page: PageResponse) -> Tuple[str, Optional[dict]]:
+        # Întoarce textul curățat și, dacă structura e concludentă, o clasificare euristică
+        if not page.ok or not page.text:
+            return "", None
+        soup = make_soup(page.text)
+        heuristic = heuristic_page_type(soup, page.final_url)
+        if heuristic:
+            with self._counts_lock:
+                self.decision_counts["heuristic"] += 1
         # Curățare: scoate elemente de navigație/cod pentru un semnal mai bun
         for tag_name in ("script", "style", "nav", "footer", "header", "aside", "form"):
             for el in soup.find_all(tag_name):
                 el.decompose()
         text = soup.get_text(separator="\n", strip=True)
-        text = text[:15000]
+        return text[:15000], heuristic
+
+    def _cached_analysis(self, text: str) -> Optional[dict]:
+        cached = self.classification_cache.get(text, LLM_PROMPT_VERSION)
+        return self._record_decision(cached, "cache") if cached else None
+
+    def _classify_text(self, url: str, text: str) -> dict:
+        cached = self._cached_analysis(text)
+        if cached:
+            return cached
         try:
             chain = self.prompt | llm | self.output_parser
             result = chain.invoke({"text": text})
             page_type = result.get("page_type", "OTHER") if isinstance(result, dict) else "OTHER"
             reason = result.get("reason", "no_reason") if isinstance(result, dict) else "no_reason"
-            return {"page_type": page_type, "reason": reason}
+            analysis = {"page_type": page_type, "reason": reason}
+            self.classification_cache.put(text, LLM_PROMPT_VERSION, analysis, url=url)
+            return self._record_decision(analysis, "llm")
         except Exception as e:
             print(f"[ERROR] LLM analysis failed for {url}: {e}")
-            return {"page_type": "OTHER", "reason": "llm_error"}
-
-    def _resolve_final_url(self, url: str) -> str | None:
+            return self._record_decision({"page_type": "OTHER", "reason": "llm_error"}, "llm")
+
+    def _analyze_page_type(self, url: str, page: Optional[PageResponse] = None) -> dict:
+        # Primește pagina deja descărcată când există, pentru a evita încă un GET
+        text, heuristic = self._page_text(page if page is not None else self._fetch(url))
+        if heuristic:
+            return heuristic
+        if not text:
+            return {"page_type": "OTHER", "reason": "empty_or_fetch_error"}
+        return self._classify_text(url, text)
+
+    def _classify_batch(self, pages: List[Tuple[str, str]]) -> List[dict]:
+        # pages: (url, text); întoarce câte o analiză per pagină, în aceeași ordine
+        if len(pages) == 1:
+            return [self._classify_text(*pages[0])]
+        blocks = []
+        for idx, (url, text) in enumerate(pages, start=1):
+            blocks.append(f"### PAGE {idx}\nURL: {url}\n{text[:BATCH_TEXT_LIMIT]}")
+        by_id: Dict[str, dict] = {}
         try:
-            resp = requests.head(url, timeout=7, headers=REQUEST_HEADERS, allow_redirects=True)
-            if 200 <= resp.status_code < 400:
-                return resp.url
-            if resp.status_code in (405, 403):
-                resp_get = requests.get(url, timeout=10, headers=REQUEST_HEADERS, allow_redirects=True, stream=True)
-                if 200 <= resp_get.status_code < 400:
-                    return resp_get.url
+            chain = self.batch_prompt | llm | self.batch_output_parser
+            result = chain.invoke({"pages": "\n\n".join(blocks)})
+            items = result.get("results", []) if isinstance(result, dict) else []
+            for item in items:
+                if isinstance(item, dict) and item.get("page_type") in PAGE_TYPES:
+                    by_id[str(item.get("id", "")).strip()] = {
+                        "page_type": item["page_type"],
+                        "reason": item.get("reason") or "no_reason",
+                    }
+        except Exception as e:
+            print(f"[WARN] Batch LLM analysis failed for {len(pages)} pages: {e}")
+        expected = [str(i) for i in range(1, len(pages) + 1)]
+        if not all(i in by_id for i in expected):
+            # Răspuns incomplet sau invalid: împarte lotul în două și reîncearcă
+            mid = len(pages) // 2
+            return self._classify_batch(pages[:mid]) + self._classify_batch(pages[mid:])
+        analyses = [by_id[i] for i in expected]
+        for (url, text), analysis in zip(pages, analyses):
+            self.classification_cache.put(text, LLM_PROMPT_VERSION, analysis, url=url)
+            self._record_decision(analysis, "llm_batch")
+        return analyses
+
+    def _prepare_candidate(self, url: str) -> Optional[Dict[str, Any]]:
+        # Filtru generic de limbă (acceptă doar en/ro dacă există prefix de limbă)
+        if not self.url_rules.classify(url).locale_allowed:
             return None
-        except Exception:
-            try:
-                resp_get = requests.get(url, timeout=10, headers=REQUEST_HEADERS, allow_redirects=True, stream=True)
-                if 200 <= resp_get.status_code < 400:
-                    return resp_get.url
-                return None
-            except Exception:
-                return None
-
-    def find_blog_index_urls(self, base_url: str) -> Tuple[List[str], List[str], List[Dict[str, Any]], List[Dict[str, Any]]]:
-        html = self._get_html(base_url)
-        soup = BeautifulSoup(html, "html.parser")
+        # Excluderi specifice de domeniu (url_rules.json) pentru a evita secțiuni non-blog la clienți cunoscuți
+        if self.url_rules.excluded_index_path(url):
+            return {"url": url, "final_url": None, "excluded": True,
+                    "analysis": {"page_type": "OTHER", "reason": "domain_rule_excluded"}}
+        # Un singur GET: URL final, status, tip de conținut și corpul pentru etapele următoare
+        page = self._fetch(url)
+        if not page.ok:
+            return None
+        return {"url": url, "final_url": page.final_url, "excluded": False, "analysis": None, "page": page}
+
+    def _evaluate_candidate(self, url: str) -> Optional[Dict[str, Any]]:
+        result = self._prepare_candidate(url)
+        if result and result["analysis"] is None:
+            result["analysis"] = self._analyze_page_type(result["final_url"], result.pop("page"))
+        return result
+
+    def _prepare_candidate_text(self, url: str) -> Optional[Dict[str, Any]]:
+        # Variantă pentru modul lot: descarcă textul și consultă cache-ul, fără apel LLM
+        result = self._prepare_candidate(url)
+        if result and result["analysis"] is None:
+            text, heuristic = self._page_text(result.pop("page"))
+            result["text"] = text
+            if heuristic:
+                result["analysis"] = heuristic
+            elif not text:
+                result["analysis"] = {"page_type": "OTHER", "reason": "empty_or_fetch_error"}
+            else:
+                result["analysis"] = self._cached_analysis(text)
+        return result
+
+    def _map_concurrently(self, fn, items: List[Any], label: str) -> List[Any]:
+        # Rezultatele sunt întoarse în ordinea elementelor, indiferent de ordinea de terminare
+        total = len(items)
+        if self.max_workers <= 1 or total <= 1:
+            results = []
+            for i, item in enumerate(items, start=1):
+                if i % 10 == 0:
+                    print(f"[INFO] Processed {i}/{total} {label}...")
+                results.append(fn(item))
+            return results
+        results: List[Any] = [None] * total
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+            futures = {executor.submit(fn, item): idx for idx, item in enumerate(items)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Processing failed for {items[idx]}: {e}")
+                if done % 10 == 0:
+                    print(f"[INFO] Processed {done}/{total} {label}...")
+        return results
+
+    def _evaluate_candidates(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        if self.batch_size <= 1:
+            return self._map_concurrently(self._evaluate_candidate, urls, "candidates")
+        results = self._map_concurrently(self._prepare_candidate_text, urls, "candidates")
+        pending = [r for r in results if r is not None and r["analysis"] is None]
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        if batches:
+            print(f"[INFO] Classifying {len(pending)} pages in {len(batches)} LLM batches...")
+
+        def classify(batch):
+            analyses = self._classify_batch([(r["final_url"], r["text"]) for r in batch])
+            for r, analysis in zip(batch, analyses):
+                r["analysis"] = analysis
+
+        self._map_concurrently(classify, batches, "batches")
+        for r in results:
+            if r is not None:
+                r.pop("text", None)
+                if r["analysis"] is None:
+                    r["analysis"] = {"page_type": "OTHER", "reason": "llm_error"}
+        return results
+
+    def find_blog_index_urls(self, base_url: str, homepage_html: Optional[str] = None) -> Tuple[List[str], List[str], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        html = homepage_html if homepage_html is not None else self._get_html(base_url)
         heuristic_urls_set = set()
         priority_candidates: List[str] = []
         other_candidates: List[str] = []
         link_entries: List[str] = []
         # Construiește mapare anchor -> url absolut și filtrează scheme non-HTTP
-        for a in soup.find_all("a", href=True):
-            if not isinstance(a, Tag):
-                continue
-            href_attr = a.attrs.get("href", "")
-            href = href_attr.strip() if isinstance(href_attr, str) else str(href_attr)
+        for href, anchor_raw in extract_links(html):
             if not self._is_http_url(href):
                 continue
             abs_url = urljoin(base_url, href)
-            # Exclude locale neacceptate (păstrează root fără prefix)
-            path_only = urlparse(abs_url).path
-            m = LOCALE_REGEX.match(path_only)
-            if m and m.group(1) not in ALLOWED_LOCALES:
+            # O singură clasificare: locale neacceptate, fișiere binare / media, cuvinte cheie excluse
+            info = self.url_rules.classify(abs_url)
+            if info.rejected:
                 continue
             if not self._is_internal(base_url, abs_url):
                 continue
-            # Exclude fișiere binare / media
-            if abs_url.lower().endswith(EXTENSIONS):
-                continue
-            # Exclude după cuvinte cheie evidente
-            if any(x in abs_url.lower() for x in EXCLUDE_KEYWORDS):
-                continue
-            anchor_text = a.get_text(strip=True).lower()
+            anchor_text = anchor_raw.lower()
             if len(link_entries) < 200:
                 link_entries.append(f"{anchor_text or '-'} -> {abs_url}")
-            for keyword in KEYWORDS:
-                if keyword in abs_url.lower() or keyword in anchor_text:
-                    path = urlparse(abs_url).path
-                    segs = self._strip_locale_from_path(path)
-                    # Acceptă strict pagini index (rădăcină sau 1 segment din INDEX_TOKENS) sau pattern /c/category-name
-                    if (len(segs) == 1 and segs[0].lower() in INDEX_TOKENS) or \
-                       (len(segs) == 2 and segs[0].lower() == "c"):
-                        if abs_url not in heuristic_urls_set:
-                            heuristic_urls_set.add(abs_url)
-                            if 'blog' in abs_url.lower():
-                                priority_candidates.append(abs_url)
-                            else:
-                                other_candidates.append(abs_url)
-                    break
+            if info.include_keyword or self.url_rules.matches_include(anchor_text, info.netloc):
+                segs = list(info.segments[1:] if info.locale else info.segments)
+                # Acceptă strict pagini index (rădăcină sau 1 segment din INDEX_TOKENS) sau pattern /c/category-name
+                if (len(segs) == 1 and segs[0].lower() in INDEX_TOKENS) or \
+                   (len(segs) == 2 and segs[0].lower() == "c"):
+                    if abs_url not in heuristic_urls_set:
+                        heuristic_urls_set.add(abs_url)
+                        if 'blog' in abs_url.lower():
+                            priority_candidates.append(abs_url)
+                        else:
+                            other_candidates.append(abs_url)
 
         # LLM selecție inițială pe lista de linkuri din homepage
         try:
@@ -324,19 +459,23 @@ class BlogIndexProcessor:
                                 other_candidates.append(u_abs)
         except Exception as e:
             print(f"[WARN] LLM list selection failed: {e}")
-        # Simplificat: nu mai adăugăm candidați din sitemap/RSS – doar linkurile din homepage
+        # Simplificat: nu mai adăugăm candidați din sitemap/RSS – doar linkurile din homepage.
+        # Excepție: homepage fără candidați (ex: randat din JS) – folosim secțiunile din sitemap
+        if not heuristic_urls_set:
+            for u in self._discover_from_sitemap(base_url):
+                if u not in heuristic_urls_set:
+                    heuristic_urls_set.add(u)
+                    if 'blog' in u.lower():
+                        priority_candidates.append(u)
+                    else:
+                        other_candidates.append(u)
 
         # Fallback: încearcă căi comune direct pe domeniu (prioritar)
         parsed_base = urlparse(base_url)
         base_root = f"{parsed_base.scheme}://{parsed_base.netloc}"
         for path in COMMON_INDEX_PATHS:
             candidate = urljoin(base_root, path)
-            if any(x in candidate.lower() for x in EXCLUDE_KEYWORDS):
-                continue
-            if candidate.lower().endswith(EXTENSIONS):
-                continue
-            m = LOCALE_REGEX.match(urlparse(candidate).path)
-            if m and m.group(1) not in ALLOWED_LOCALES:
+            if self.url_rules.classify(candidate).rejected:
                 continue
             if candidate not in heuristic_urls_set:
                 heuristic_urls_set.add(candidate)
@@ -357,34 +496,16 @@ class BlogIndexProcessor:
         rejected_index_urls = []
         accepted_details = []
         rejected_details = []
-        for i, url in enumerate(heuristic_urls_ordered, start=1):
-            if i % 10 == 0:
-                print(f"[INFO] Processed {i}/{len(heuristic_urls_ordered)} candidates...")
-            # Excluderi specifice de domeniu pentru a evita secțiuni non-blog la clienți cunoscuți
-            parsed = urlparse(url)
-            netloc = self._normalize_netloc(parsed.netloc)
-            domain_key = netloc.split(":")[0]
-            # Filtru generic de limbă (acceptă doar en/ro dacă există prefix de limbă)
-            first_seg = next((s for s in parsed.path.split('/') if s), "")
-            if len(first_seg) == 2 and first_seg.isalpha() and first_seg.lower() not in ALLOWED_LOCALES:
-                continue
-            for rule_domain, excluded_paths in DOMAIN_EXCLUDE_INDEX_SEGMENTS.items():
-                if domain_key.endswith(rule_domain):
-                    for ex_path in excluded_paths:
-                        if parsed.path.startswith(ex_path):
-                            # Sare peste acest URL ca index
-                            rejected_index_urls.append(url)
-                            rejected_details.append({"url": url, "analysis": {"page_type": "OTHER", "reason": "domain_rule_excluded"}})
-                            url = None
-                            break
-                if url is None:
-                    break
-            if url is None:
+        for result in self._evaluate_candidates(heuristic_urls_ordered):
+            if result is None:
                 continue
-            final_url = self._resolve_final_url(url)
-            if not final_url:
+            url = result["url"]
+            analysis = result["analysis"]
+            if result["excluded"]:
+                rejected_index_urls.append(url)
+                rejected_details.append({"url": url, "analysis": analysis})
                 continue
-            analysis = self._analyze_page_type(final_url)
+            final_url = result["final_url"]
             if analysis.get("page_type") in ("BLOG_INDEX", "RESOURCES_MIX"):
                 canon = self._canonicalize_url(final_url)
                 if canon not in {self._canonicalize_url(u) for u in blog_index_urls}:
@@ -394,6 +515,10 @@ class BlogIndexProcessor:
                 if url not in rejected_index_urls:
                     rejected_index_urls.append(url)
                 rejected_details.append({"url": url, "analysis": analysis})
+        self.classification_cache.save()
+        counts = self.decision_counts
+        print(f"[INFO] Classification decisions: heuristic={counts['heuristic']}, cache={counts['cache']}, "
+              f"llm={counts['llm']}, llm_batch={counts['llm_batch']}")
         # Deduplicate final list strictly by canonical form
         seen = set()
         deduped = []
@@ -405,34 +530,174 @@ class BlogIndexProcessor:
             deduped.append(u)
         return deduped, rejected_index_urls, accepted_details, rejected_details
 
-    def process_website(self, base_url: str, client_name: str, scraping_state: dict):
+    def _nav_fingerprint(self, base_url: str, html: str) -> str:
+        # Amprenta secțiunilor din navigația homepage-ului (nav/header/footer): articolele listate în pagină,
+        # inclusiv cele de la rădăcină (/%postname%/), nu o schimbă. Fără regiuni de navigație, doar secțiunile
+        # de tip blog din INDEX_TOKENS.
+        soup = make_soup(html)
+        regions = soup.select(NAV_REGION_SELECTOR)
+        if regions:
+            hrefs = [a.get("href") or "" for region in regions for a in region.find_all("a", href=True)]
+        else:
+            hrefs = [href for href, _ in extract_links(html)]
+        sections = set()
+        for href in hrefs:
+            href = href.strip()
+            if not self._is_http_url(href):
+                continue
+            abs_url = urljoin(base_url, href)
+            info = self.url_rules.classify(abs_url)
+            if info.rejected or not self._is_internal(base_url, abs_url):
+                continue
+            segs = info.segments[1:] if info.locale else info.segments
+            if not (len(segs) == 1 or (len(segs) == 2 and segs[0].lower() == "c")):
+                continue
+            if regions or segs[0].lower() in INDEX_TOKENS:
+                sections.add("/" + "/".join(segs).lower())
+        return NAV_FINGERPRINT_PREFIX + hashlib.sha256("\n".join(sorted(sections)).encode("utf-8")).hexdigest()[:16]
+
+    def discover_website(self, base_url: str, client_name: str) -> Tuple[str, Dict[str, Any]]:
         client_key = f"{client_name}|{base_url}"
-        blog_index_urls, rejected_index_urls, accepted_details, rejected_details = self.find_blog_index_urls(base_url)
+        homepage_html = self._get_html(base_url)
+        blog_index_urls, rejected_index_urls, accepted_details, rejected_details = self.find_blog_index_urls(base_url, homepage_html)
+        feed_urls = self._discover_rss_feeds(base_url, homepage_html)
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
         # Replace with canonicalized unique URLs and drop any old duplicates in state
-        scraping_state[client_key] = {
+        entry = {
             "blog_index_urls": [self._canonicalize_url(u) for u in blog_index_urls],
+            "feed_urls": feed_urls,
             "rejected_index_urls": rejected_index_urls,
             # Noi câmpuri cu detalii pentru observabilitate
             "blog_index_details": accepted_details,
-            "rejected_index_details": rejected_details
+            "rejected_index_details": rejected_details,
+            "nav_fingerprint": self._nav_fingerprint(base_url, homepage_html),
+            "discovered_at": now,
+            "last_verified_at": now,
         }
-        print(f"[INFO] Selected {len(blog_index_urls)} blog index URLs for {client_key}")
+        print(f"[INFO] Selected {len(blog_index_urls)} blog index URLs and {len(feed_urls)} feeds for {client_key}")
+        return client_key, entry
+
+    def process_website(self, base_url: str, client_name: str, scraping_state: dict):
+        client_key, entry = self.discover_website(base_url, client_name)
+        scraping_state[client_key] = entry
+
+    def refresh_website(self, base_url: str, client_name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cheap revalidation of a known client: homepage nav fingerprint plus a (conditional) GET of each
+        known index. Full discovery runs only when the TTL expired, the nav changed or an index is gone.
+        Fields owned by the article scraper (date_selector, latest_article_date, ...) are kept.
+        """
+        now = datetime.now(timezone.utc)
+        discovered_at = _parse_timestamp(entry.get("discovered_at"))
+        last_verified_at = _parse_timestamp(entry.get("last_verified_at"))
+        if discovered_at and now - discovered_at > timedelta(days=DISCOVERY_TTL_DAYS):
+            print(f"[INFO] Discovery TTL expired for {base_url}. Rediscovering blog indexes...")
+            return {**entry, **self.discover_website(base_url, client_name)[1]}
+        if last_verified_at and now - last_verified_at < timedelta(hours=VERIFY_INTERVAL_HOURS):
+            return entry
+        homepage_html = self._get_html(base_url)
+        if not homepage_html:
+            # Homepage indisponibil temporar: păstrăm indexurile cunoscute și reîncercăm la rularea următoare
+            return entry
+        fingerprint = self._nav_fingerprint(base_url, homepage_html)
+        # Intrările vechi, fără amprentă sau cu amprenta în formatul vechi, o adoptă pe cea curentă fără redescoperire
+        known = entry.get("nav_fingerprint")
+        if known and known.startswith(NAV_FINGERPRINT_PREFIX) and known != fingerprint:
+            print(f"[INFO] Navigation changed on {base_url}. Rediscovering blog indexes...")
+            return {**entry, **self.discover_website(base_url, client_name)[1]}
+        index_urls = entry.get("blog_index_urls", [])
+        pages = self._map_concurrently(self._fetch, index_urls, "known indexes")
+        if any(_index_gone(index_url, page) for index_url, page in zip(index_urls, pages)):
+            print(f"[INFO] A known blog index is gone on {base_url}. Rediscovering blog indexes...")
+            return {**entry, **self.discover_website(base_url, client_name)[1]}
+        if any(page is None or not page.ok for page in pages):
+            # Eroare temporară (timeout, 5xx, circuit deschis): ca la homepage, reîncercăm la rularea următoare
+            print(f"[WARN] A known blog index is temporarily unreachable on {base_url}; keeping the known indexes.")
+            return entry
+        stamp = now.isoformat(timespec="seconds")
+        return {**entry, "nav_fingerprint": fingerprint, "discovered_at": entry.get("discovered_at") or stamp,
+                "last_verified_at": stamp}
+
+    def process_websites(self, clients: List[Dict[str, str]], state_path: str = SCRAPING_STATE_PATH,
+                         scraping_state: Optional[dict] = None, site_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Discovers many sites in parallel and merges all results into the state file in one atomic write."""
+        site_workers = max(1, site_workers if site_workers is not None else BATCH_SITE_WORKERS)
+        sites = [(c["base_url"], c.get("client_name") or c.get("name", "")) for c in clients if c.get("base_url")]
+        results: Dict[str, Dict[str, Any]] = {}
+
+        # Toate site-urile folosesc același fetcher, deci aceeași limită per host și același cache HTTP
+        def discover(site):
+            base_url, client_name = site
+            client_key, entry = self.discover_website(base_url, client_name)
+            results[client_key] = entry
+
+        print(f"[INFO] Discovering blog indexes for {len(sites)} sites ({site_workers} in parallel)...")
+        if site_workers <= 1 or len(sites) <= 1:
+            for site in sites:
+                try:
+                    discover(site)
+                except Exception as e:
+                    print(f"[ERROR] Discovery failed for {site[0]}: {e}")
+        else:
+            with ThreadPoolExecutor(max_workers=min(site_workers, len(sites))) as executor:
+                futures = {executor.submit(discover, site): site for site in sites}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"[ERROR] Discovery failed for {futures[future][0]}: {e}")
+                    if done % 10 == 0:
+                        print(f"[INFO] Processed {done}/{len(sites)} sites...")
+        merge_scraping_state(results, state_path, scraping_state)
+        print(f"[INFO] Batch discovery finished: {len(results)}/{len(sites)} sites saved to state")
+        return results
+
+
+def _index_gone(index_url: str, page: Optional[PageResponse]) -> bool:
+    # Doar 404/410 sau o redirecționare în afara căii indexului înseamnă că indexul nu mai există
+    if page is None:
+        return False
+    if page.status in (404, 410):
+        return True
+    index_path = urlparse(index_url).path.rstrip("/")
+    final_path = urlparse(page.final_url or index_url).path.rstrip("/")
+    return page.ok and final_path != index_path and not final_path.startswith(index_path + "/")
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def load_clients(path: str = SITES_CONFIG_PATH) -> List[Dict[str, str]]:
+    """Reads the client list (name + base_url), e.g. config/sites.json or a payload exported from Supabase."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("sites") or data.get("clients") or []
+    return [
+        {"client_name": c.get("client_name") or c.get("name", ""), "base_url": c["base_url"]}
+        for c in data if isinstance(c, dict) and c.get("base_url")
+    ]
 
 
 if __name__ == "__main__":
     import sys
+    if len(sys.argv) >= 2 and sys.argv[1] == "--batch":
+        sites_path = sys.argv[2] if len(sys.argv) >= 3 else SITES_CONFIG_PATH
+        BlogIndexProcessor().process_websites(load_clients(sites_path))
+        sys.exit(0)
     if len(sys.argv) < 3:
         print("Usage: python blog_index_processor.py [base_url] [client_name]")
+        print("       python blog_index_processor.py --batch [sites.json]")
         sys.exit(1)
     base_url = sys.argv[1]
     client_name = sys.argv[2]
-    scraping_state_path = os.path.join(os.path.dirname(__file__), "scraping_state.json")
-    try:
-        with open(scraping_state_path, "r", encoding="utf-8") as f:
-            scraping_state = json.load(f)
-    except Exception:
-        scraping_state = {}
     processor = BlogIndexProcessor()
-    processor.process_website(base_url, client_name, scraping_state)
-    with open(scraping_state_path, "w", encoding="utf-8") as f:
-        json.dump(scraping_state, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+    client_key, entry = processor.discover_website(base_url, client_name)
+    merge_scraping_state({client_key: entry})
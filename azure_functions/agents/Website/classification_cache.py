@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from typing import Optional, Dict, Any
+
+# Memorare a clasificărilor LLM (page_type/reason) după conținutul paginii
+CLASSIFICATION_CACHE_PATH = os.getenv(
+    "BLOG_INDEX_CLASSIFICATION_CACHE", os.path.join(os.path.dirname(__file__), "classification_cache.json")
+)
+CLASSIFICATION_CACHE_TTL_DAYS = int(os.getenv("BLOG_INDEX_CLASSIFICATION_TTL_DAYS", "30"))
+
+
+def content_key(text: str, prompt_version: str) -> str:
+    return hashlib.sha256(f"{prompt_version}\n{text}".encode("utf-8")).hexdigest()
+
+
+class ClassificationCache:
+    """Content-addressed store of page classifications, keyed by cleaned text + prompt version."""
+
+    def __init__(self, path: str = CLASSIFICATION_CACHE_PATH, ttl_days: int = CLASSIFICATION_CACHE_TTL_DAYS):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, text: str, prompt_version: str) -> Optional[Dict[str, str]]:
+        key = content_key(text, prompt_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry.get("stored_at", 0) <= self.ttl_seconds:
+                self.hits += 1
+                return dict(entry["analysis"])
+            if entry:
+                del self._entries[key]
+                self._dirty = True
+            self.misses += 1
+            return None
+
+    def put(self, text: str, prompt_version: str, analysis: Dict[str, str], url: str = ""):
+        key = content_key(text, prompt_version)
+        with self._lock:
+            self._entries[key] = {
+                "analysis": {"page_type": analysis.get("page_type"), "reason": analysis.get("reason")},
+                "url": url,
+                "prompt_version": prompt_version,
+                "stored_at": time.time(),
+            }
+            self._dirty = True
+
+    def invalidate(self, url: Optional[str] = None, older_than_days: Optional[float] = None) -> int:
+        """Removes entries for a URL, older than N days, or everything when no filter is given."""
+        with self._lock:
+            now = time.time()
+            to_remove = []
+            for key, entry in self._entries.items():
+                if url is not None and entry.get("url") != url:
+                    continue
+                if older_than_days is not None and now - entry.get("stored_at", 0) < older_than_days * 86400:
+                    continue
+                to_remove.append(key)
+            for key in to_remove:
+                del self._entries[key]
+            if to_remove:
+                self._dirty = True
+            return len(to_remove)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            entries = {k: v for k, v in self._entries.items() if now - v.get("stored_at", 0) <= self.ttl_seconds}
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self._entries = entries
+                self._dirty = False
+            except OSError as e:
+                print(f"[WARN] Could not save classification cache: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+if __name__ == "__main__":
+    usage = "Usage: python classification_cache.py [stats | clear [--url URL] [--older-than DAYS]]"
+    if len(sys.argv) < 2 or sys.argv[1] not in ("stats", "clear"):
+        print(usage)
+        sys.exit(1)
+    cache = ClassificationCache()
+    if sys.argv[1] == "stats":
+        print(f"[INFO] {len(cache)} cached classifications in {cache.path}")
+        sys.exit(0)
+    args = sys.argv[2:]
+    url_arg = None
+    older_than = None
+    try:
+        if "--url" in args:
+            url_arg = args[args.index("--url") + 1]
+        if "--older-than" in args:
+            older_than = float(args[args.index("--older-than") + 1])
+    except (IndexError, ValueError):
+        print(usage)
+        sys.exit(1)
+    removed = cache.invalidate(url=url_arg, older_than_days=older_than)
+    cache.save()
+    print(f"[INFO] Removed {removed} cached classifications.")
@@ -0,0 +1,125 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from date_extraction import selector_date
+
+# Meta generator: <meta name="generator" content="WordPress 6.5">
+GENERATOR_REGEX = re.compile(
+    r"<meta[^>]+name=[\"']generator[\"'][^>]+content=[\"']([^\"']+)|"
+    r"<meta[^>]+content=[\"']([^\"']+)[\"'][^>]+name=[\"']generator[\"']",
+    re.IGNORECASE,
+)
+# Corpul extras cu selectorul CMS trebuie să aibă măcar atâta text, altfel folosim extractorul generic
+MIN_BODY_CHARS = 200
+
+
+@dataclass(frozen=True)
+class CmsProfile:
+    """Signatures of a CMS and the selectors its stock themes use for article links, dates and body text."""
+    name: str
+    generator: Pattern
+    markers: Tuple[str, ...]
+    article_link_selectors: Tuple[str, ...]
+    date_selectors: Tuple[str, ...]
+    body_selectors: Tuple[str, ...]
+
+
+CMS_PROFILES: Dict[str, CmsProfile] = {p.name: p for p in (
+    CmsProfile(
+        name="wordpress",
+        generator=re.compile(r"^wordpress", re.I),
+        markers=("/wp-content/", "/wp-includes/", "/wp-json/", "wp-embed"),
+        article_link_selectors=(".entry-title a", "article .post-title a", "h2.wp-block-post-title a",
+                                "article h2 a", ".wp-block-latest-posts__post-title"),
+        date_selectors=("time.entry-date.published", "time.entry-date", ".posted-on time",
+                        ".wp-block-post-date time", ".post-date", ".entry-meta time"),
+        body_selectors=(".entry-content", ".wp-block-post-content", ".post-content", "article .content"),
+    ),
+    CmsProfile(
+        name="hubspot",
+        generator=re.compile(r"^hubspot", re.I),
+        markers=("js.hs-scripts.com", "hubspotusercontent", "hs-sites.com", "hs_cos_wrapper", "/hubfs/"),
+        article_link_selectors=(".blog-index__post-title a", ".blog-post__title a", ".post-item h2 a",
+                                ".blog-card__title a", "a.blog-index__post-title-link"),
+        date_selectors=(".blog-post__timestamp", ".hs-blog-post-date", ".blog-post__date", ".post-header time",
+                        ".blog-post__meta time"),
+        body_selectors=(".blog-post__body", "[id^='hs_cos_wrapper_post_body']", ".post-body"),
+    ),
+    CmsProfile(
+        name="webflow",
+        generator=re.compile(r"^webflow", re.I),
+        markers=("data-wf-site", "data-wf-page", "assets.website-files.com", "uploads-ssl.webflow.com",
+                 "cdn.prod.website-files.com"),
+        article_link_selectors=(".w-dyn-item a[href]",),
+        # Fără potriviri pe subșir (ex. [class*='date']): ar prinde "updated-date" sau "date-picker" și s-ar salva per client
+        date_selectors=(".w-dyn-item time", ".blog-date", ".post-date"),
+        body_selectors=(".w-richtext",),
+    ),
+    CmsProfile(
+        name="drupal",
+        generator=re.compile(r"^drupal", re.I),
+        markers=("/sites/default/files/", "drupal-settings-json", "Drupal.settings", "/core/misc/drupal"),
+        article_link_selectors=(".node__title a", ".views-row h2 a", ".views-row h3 a", "article h2 a"),
+        date_selectors=(".node__meta time", ".field--name-created time", ".field--name-field-date time",
+                        ".field--name-created", "article .submitted time"),
+        body_selectors=(".field--name-body", ".node__content", ".field-name-body"),
+    ),
+    CmsProfile(
+        # Contentful este headless: îl recunoaștem după CDN-ul de asseturi; șabloanele diferă de la site la site
+        name="contentful",
+        generator=re.compile(r"^contentful", re.I),
+        markers=("images.ctfassets.net", "assets.ctfassets.net", "videos.ctfassets.net"),
+        article_link_selectors=("article a[href]",),
+        date_selectors=("article time",),
+        body_selectors=("article [class*='rich-text']", "article [class*='RichText']"),
+    ),
+)}
+
+
+def detect_cms(html: str) -> Optional[str]:
+    """Name of the CMS behind a page, from its generator meta tag, then asset paths and markup markers."""
+    if not html:
+        return None
+    for m in GENERATOR_REGEX.finditer(html):
+        generator = (m.group(1) or m.group(2) or "").strip()
+        for profile in CMS_PROFILES.values():
+            if profile.generator.search(generator):
+                return profile.name
+    hits = {profile.name: sum(1 for marker in profile.markers if marker in html) for profile in CMS_PROFILES.values()}
+    best = max(hits, key=hits.get)
+    return best if hits[best] else None
+
+
+def cms_profile(name: Optional[str]) -> Optional[CmsProfile]:
+    return CMS_PROFILES.get(name) if name else None
+
+
+def cms_article_links(soup: BeautifulSoup, profile: CmsProfile) -> List[str]:
+    """Hrefs of the article links in an index page, using the first selector that matches anything."""
+    for selector in profile.article_link_selectors:
+        hrefs = [(a.get("href") or "").strip() for a in soup.select(selector) if isinstance(a, Tag)]
+        hrefs = [h for h in hrefs if h]
+        if hrefs:
+            return list(dict.fromkeys(hrefs))
+    return []
+
+
+def cms_date_selector(soup: BeautifulSoup, profile: CmsProfile, extra_selectors: Tuple[str, ...] = ()) -> Optional[str]:
+    """First selector (known for the CMS, then learned on other clients of the same CMS) that yields a date."""
+    for selector in dict.fromkeys(profile.date_selectors + tuple(extra_selectors)):
+        if selector_date(soup, selector):
+            return selector
+    return None
+
+
+def cms_body(soup: BeautifulSoup, profile: CmsProfile) -> Optional[Tag]:
+    """Article body element for the CMS, when one of its body selectors matches enough text."""
+    for selector in profile.body_selectors:
+        el = soup.select_one(selector)
+        if isinstance(el, Tag) and len(el.get_text(strip=True)) >= MIN_BODY_CHARS:
+            return el
+    return None
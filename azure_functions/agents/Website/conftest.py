@@ -0,0 +1,21 @@
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+# Modulele funcției se importă după nume (ca în function_app.py), iar clientul LLM
+# cere credențiale la import; testele nu fac apeluri reale către Azure OpenAI.
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+
+# Depozitele implicite (articole, URL-uri văzute, joburi, cache-uri) se creează într-un director
+# temporar, nu lângă cod: altfel importul scraped_articles.json ar ajunge în arborele sursă.
+_data_dir = tempfile.mkdtemp(prefix="website-tests-")
+atexit.register(shutil.rmtree, _data_dir, True)
+os.environ["WEBSITE_ARTICLE_STORE_DIR"] = os.path.join(_data_dir, "article_store")
+os.environ["WEBSITE_SEEN_URLS_PATH"] = os.path.join(_data_dir, "seen_urls.sqlite")
+os.environ["WEBSITE_SCRAPE_JOBS_DIR"] = os.path.join(_data_dir, "scrape_jobs")
+os.environ["WEBSITE_HTTP_CACHE_DIR"] = os.path.join(_data_dir, ".http_cache")
+os.environ["BLOG_INDEX_CLASSIFICATION_CACHE"] = os.path.join(_data_dir, "classification_cache.json")
@@ -0,0 +1,142 @@
+import re
+import json
+from datetime import datetime
+from typing import Any, Iterator, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from recency import url_path_date
+
+ISO_DATE_REGEX = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Meta taguri cu data publicării (OpenGraph / article:*, Dublin Core, variante uzuale)
+META_DATE_KEYS = (
+    "article:published_time",
+    "og:published_time",
+    "og:article:published_time",
+    "datepublished",
+    "publish_date",
+    "publish-date",
+    "pubdate",
+    "dc.date.issued",
+    "dc.date",
+    "date",
+)
+
+# Formate textuale uzuale în șabloanele CMS ("May 5, 2024", "5 May 2024", "05.05.2024")
+TEXT_DATE_FORMATS = ("%B %d, %Y", "%b %d, %Y", "%b. %d, %Y", "%d %B %Y", "%d %b %Y", "%Y/%m/%d", "%d.%m.%Y", "%d/%m/%Y")
+TEXT_DATE_REGEX = re.compile(
+    r"[A-Za-z]{3,9}\.? \d{1,2}, \d{4}|\d{1,2} [A-Za-z]{3,9} \d{4}|\d{4}/\d{2}/\d{2}|\d{1,2}[./]\d{1,2}[./]\d{4}"
+)
+
+
+def _iso_date(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    m = ISO_DATE_REGEX.search(value)
+    return m.group(0) if m else None
+
+
+def _walk_json_ld(node: Any) -> Iterator[Any]:
+    # Parcurge obiectele JSON-LD, inclusiv @graph și liste imbricate
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk_json_ld(item)
+    elif isinstance(node, dict):
+        yield node.get("datePublished")
+        for key in ("@graph", "mainEntity", "mainEntityOfPage"):
+            if key in node:
+                yield from _walk_json_ld(node[key])
+
+
+def json_ld_date(soup: BeautifulSoup) -> Optional[str]:
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(script.string or script.get_text() or "")
+        except (json.JSONDecodeError, TypeError):
+            continue
+        for value in _walk_json_ld(data):
+            date = _iso_date(value)
+            if date:
+                return date
+    return None
+
+
+def meta_date(soup: BeautifulSoup) -> Optional[str]:
+    found = {}
+    for meta in soup.find_all("meta"):
+        key = (meta.get("property") or meta.get("name") or meta.get("itemprop") or "").strip().lower()
+        if key in META_DATE_KEYS and key not in found:
+            found[key] = meta.get("content")
+    for key in META_DATE_KEYS:
+        date = _iso_date(found.get(key))
+        if date:
+            return date
+    return None
+
+
+def microdata_date(soup: BeautifulSoup) -> Optional[str]:
+    for el in soup.find_all(attrs={"itemprop": "datePublished"}):
+        if isinstance(el, Tag):
+            date = _iso_date(el.get("content") or el.get("datetime") or el.get_text(strip=True))
+            if date:
+                return date
+    return None
+
+
+def time_tag_date(soup: BeautifulSoup) -> Optional[str]:
+    el = soup.find("time", attrs={"datetime": True})
+    return _iso_date(el.get("datetime")) if isinstance(el, Tag) else None
+
+
+def text_date(value: Optional[str]) -> Optional[str]:
+    """YYYY-MM-DD from an ISO date or a common written date format in the text, or None."""
+    date = _iso_date(value)
+    if date or not value:
+        return date
+    for match in TEXT_DATE_REGEX.findall(value):
+        for fmt in TEXT_DATE_FORMATS:
+            try:
+                return datetime.strptime(match, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+    return None
+
+
+def selector_date(soup: BeautifulSoup, selector: str) -> Optional[str]:
+    """Date of the first element matching the CSS selector (datetime/content attribute, then its text)."""
+    try:
+        el = soup.select_one(selector)
+    except Exception:
+        # Selector invalid (de ex. generat de LLM): îl tratăm ca negăsit
+        return None
+    if not isinstance(el, Tag):
+        return None
+    return text_date(el.get("datetime") or el.get("content")) or text_date(el.get_text(" ", strip=True))
+
+
+def url_date(url: str) -> Optional[str]:
+    # Doar datele cu zi: /2024/05/slug ar da 1 mai pentru toate articolele din lună
+    dt = url_path_date(url, require_day=True)
+    return dt.strftime("%Y-%m-%d") if dt else None
+
+
+def structured_publish_date(soup: BeautifulSoup, url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Publication date from structured sources, most reliable first: JSON-LD datePublished,
+    OpenGraph/article:* and other meta tags, microdata, <time datetime>, then a date in the URL path
+    (only with the day: a month-only path is left to the client's date selector).
+    Returns (YYYY-MM-DD, source) or (None, None).
+    """
+    for source, extract in (
+        ("json_ld", lambda: json_ld_date(soup)),
+        ("meta", lambda: meta_date(soup)),
+        ("microdata", lambda: microdata_date(soup)),
+        ("time", lambda: time_tag_date(soup)),
+        ("url", lambda: url_date(url)),
+    ):
+        date = extract()
+        if date:
+            return date, source
+    return None, None
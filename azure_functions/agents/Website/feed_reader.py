@@ -0,0 +1,105 @@
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+from urllib.parse import urljoin
+from xml.etree import ElementTree
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from agents._tools.html_parsing import make_soup
+
+FEED_LINK_TYPES = ("application/rss+xml", "application/atom+xml", "application/rdf+xml")
+# Căi comune pentru feed-uri, verificate când homepage-ul nu declară niciun <link rel="alternate">
+COMMON_FEED_PATHS = ["/feed", "/rss", "/rss.xml", "/feed.xml", "/atom.xml", "/index.xml"]
+
+
+@dataclass
+class FeedEntry:
+    url: str
+    title: str
+    published: Optional[datetime]
+
+
+def discover_feed_links(html: str, base_url: str) -> List[str]:
+    """Feeds advertised with <link rel="alternate" type="application/rss+xml|atom+xml"> (comment feeds excluded)."""
+    if not html:
+        return []
+    soup = make_soup(html)
+    feeds: List[str] = []
+    for link in soup.find_all("link", href=True):
+        rel = [r.lower() for r in (link.get("rel") or [])]
+        link_type = (link.get("type") or "").lower()
+        if "alternate" not in rel or link_type not in FEED_LINK_TYPES:
+            continue
+        href = urljoin(base_url, link["href"].strip())
+        if "comments" in href.lower():
+            continue
+        if href not in feeds:
+            feeds.append(href)
+    return feeds
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(elem, *names: str) -> Optional[str]:
+    for child in elem:
+        if _local_name(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        # RSS: RFC 822 (ex: "Tue, 10 Jun 2025 09:00:00 GMT")
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            # Atom / dc:date: ISO 8601
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _atom_link(entry) -> Optional[str]:
+    fallback = None
+    for child in entry:
+        if _local_name(child.tag) != "link":
+            continue
+        href = child.attrib.get("href")
+        rel = child.attrib.get("rel", "alternate")
+        if href and rel == "alternate":
+            return href
+        fallback = fallback or href
+    return fallback
+
+
+def parse_feed(xml_text: str, feed_url: str = "") -> Optional[List[FeedEntry]]:
+    """Parses RSS 2.0, RSS 1.0 (RDF) and Atom. Returns None when the document is not a feed."""
+    try:
+        root = ElementTree.fromstring(xml_text.encode("utf-8") if isinstance(xml_text, str) else xml_text)
+    except ElementTree.ParseError:
+        return None
+    if _local_name(root.tag) not in ("rss", "feed", "rdf"):
+        return None
+    entries: List[FeedEntry] = []
+    for elem in root.iter():
+        name = _local_name(elem.tag)
+        if name == "item":
+            link = _child_text(elem, "link") or _child_text(elem, "guid")
+            published = parse_feed_date(_child_text(elem, "pubdate", "date", "published", "updated"))
+        elif name == "entry":
+            link = _atom_link(elem)
+            published = parse_feed_date(_child_text(elem, "published", "updated"))
+        else:
+            continue
+        if not link:
+            continue
+        entries.append(FeedEntry(url=urljoin(feed_url, link), title=_child_text(elem, "title") or "", published=published))
+    return entries
@@ -9,11 +9,23 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 
 # Import local scraper entrypoint for the Azure Function app
 from article_scraper import ArticleScraperV3
+from scrape_jobs import (JobStore, POISON_SUFFIX, SCRAPE_JOBS_QUEUE, SCRAPE_ITEMS_QUEUE, fail_poisoned, job_message,
+                         run_index_item, run_job)
 
 app = func.FunctionApp(http_auth_level=func.AuthLevel.FUNCTION)
 
+# Starea joburilor, comună triggerului HTTP, workerilor din cozi și endpoint-ului de status.
+# Se ține în contul de stocare al aplicației, ca toate instanțele să vadă aceleași joburi.
+job_store = JobStore(connection_string=os.getenv("AzureWebJobsStorage"))
+
+
+def _json_response(body: dict, status_code: int, headers: dict = None) -> func.HttpResponse:
+    return func.HttpResponse(json.dumps(body), status_code=status_code, mimetype="application/json", headers=headers)
+
+
 @app.route(route="article_scraper", auth_level=func.AuthLevel.FUNCTION, methods=["POST"])
-def article_scraper_trigger(req: func.HttpRequest) -> func.HttpResponse:
+@app.queue_output(arg_name="job_queue", queue_name=SCRAPE_JOBS_QUEUE, connection="AzureWebJobsStorage")
+def article_scraper_trigger(req: func.HttpRequest, job_queue: func.Out[str]) -> func.HttpResponse:
     logging.info('Python HTTP trigger function for article_scraper processed a request.')
 
     try:
@@ -21,32 +33,57 @@ def article_scraper_trigger(req: func.HttpRequest) -> func.HttpResponse:
         base_url = req_body.get("base_url")
         client_name = req_body.get("client_name")
     except ValueError:
-        return func.HttpResponse(
-            json.dumps({"error": "Invalid JSON in request body."}),
-            status_code=400,
-            mimetype="application/json"
-        )
+        return _json_response({"error": "Invalid JSON in request body."}, 400)
 
     if not base_url or not client_name:
-        return func.HttpResponse(
-            json.dumps({"error": "Please provide 'base_url' and 'client_name' in the request body."}),
-            status_code=400,
-            mimetype="application/json"
-        )
+        return _json_response({"error": "Please provide 'base_url' and 'client_name' in the request body."}, 400)
 
-    try:
-        scraper = ArticleScraperV3()
-        scraper.run(base_url, client_name)
-        
-        return func.HttpResponse(
-            json.dumps({"status": "success", "message": f"Scraping initiated for {client_name} at {base_url}."}),
-            status_code=200,
-            mimetype="application/json"
-        )
-    except Exception as e:
-        logging.error(f"Error during scraping: {e}")
-        return func.HttpResponse(
-            json.dumps({"error": str(e)}),
-            status_code=500,
-            mimetype="application/json"
-        )
+    # Scrapingul rulează în workerul din coadă; cererea HTTP se întoarce imediat cu id-ul jobului
+    job = job_store.create(base_url, client_name)
+    job_queue.set(job_message(job))
+    status_url = f"/api/article_scraper/jobs/{job['job_id']}"
+    return _json_response(
+        {"status": job["status"], "job_id": job["job_id"], "status_url": status_url,
+         "message": f"Scraping queued for {client_name} at {base_url}."},
+        202,
+        headers={"Location": status_url},
+    )
+
+
+@app.queue_trigger(arg_name="msg", queue_name=SCRAPE_JOBS_QUEUE, connection="AzureWebJobsStorage")
+@app.queue_output(arg_name="item_queue", queue_name=SCRAPE_ITEMS_QUEUE, connection="AzureWebJobsStorage")
+def article_scraper_worker(msg: func.QueueMessage, item_queue: func.Out[str]) -> None:
+    body = msg.get_body().decode("utf-8")
+    logging.info(f"article_scraper worker picked up {body}")
+    # Workerul doar planifică rularea; fiecare index de blog devine un mesaj în coada de work item-uri
+    job = run_job(job_store, body, ArticleScraperV3, enqueue_items=item_queue.set)
+    if job:
+        logging.info(f"article_scraper job {job['job_id']} is {job['status']}")
+
+
+@app.queue_trigger(arg_name="msg", queue_name=SCRAPE_ITEMS_QUEUE, connection="AzureWebJobsStorage")
+def article_scraper_index_worker(msg: func.QueueMessage) -> None:
+    body = msg.get_body().decode("utf-8")
+    logging.info(f"article_scraper index worker picked up {body}")
+    item = run_index_item(job_store, body, ArticleScraperV3)
+    if item:
+        logging.info(f"article_scraper work item {item['item_id']} finished with status {item['status']}")
+
+
+@app.queue_trigger(arg_name="msg", queue_name=SCRAPE_JOBS_QUEUE + POISON_SUFFIX, connection="AzureWebJobsStorage")
+def article_scraper_poisoned_job(msg: func.QueueMessage) -> None:
+    fail_poisoned(job_store, msg.get_body().decode("utf-8"))
+
+
+@app.queue_trigger(arg_name="msg", queue_name=SCRAPE_ITEMS_QUEUE + POISON_SUFFIX, connection="AzureWebJobsStorage")
+def article_scraper_poisoned_index_item(msg: func.QueueMessage) -> None:
+    # Un work item care a depășit de maxDequeueCount ori timpul funcției ar rămâne "running" la nesfârșit
+    fail_poisoned(job_store, msg.get_body().decode("utf-8"))
+
+
+@app.route(route="article_scraper/jobs/{job_id}", auth_level=func.AuthLevel.FUNCTION, methods=["GET"])
+def article_scraper_job_status(req: func.HttpRequest) -> func.HttpResponse:
+    job = job_store.status(req.route_params.get("job_id", ""))
+    if job is None:
+        return _json_response({"error": "Job not found."}, 404)
+    return _json_response(job, 200)
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+import requests
+
+# Cache-ul HTTP persistent pentru scrapere (ETag / Last-Modified)
+HTTP_CACHE_DIR = os.getenv("WEBSITE_HTTP_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".http_cache"))
+HTTP_CACHE_ENABLED = os.getenv("WEBSITE_HTTP_CACHE", "1") != "0"
+HTTP_CACHE_MAX_BYTES = int(os.getenv("WEBSITE_HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024
+HTTP_CACHE_MAX_AGE_DAYS = int(os.getenv("WEBSITE_HTTP_CACHE_MAX_AGE_DAYS", "14"))
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def canonical_cache_url(url: str) -> str:
+    """Normalizes a URL for use as a cache key: lowercase scheme/host, no default port, no fragment, sorted query."""
+    try:
+        parts = urlparse(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = str(parts.port) if parts.port else ""
+        netloc = host if not port or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+        path = parts.path or "/"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return f"{scheme}://{netloc}{path}" + (f"?{query}" if query else "")
+    except Exception:
+        return url
+
+
+class HttpCache:
+    """On-disk response cache keyed by canonical URL, revalidated with conditional GETs."""
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 max_age_days: int = HTTP_CACHE_MAX_AGE_DAYS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._evicted = False
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(canonical_cache_url(url).encode("utf-8")).hexdigest()
+        shard = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(shard, key + ".json"), os.path.join(shard, key + ".body")
+
+    def _read_meta(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _read_body(self, body_path: str) -> Optional[bytes]:
+        try:
+            with open(body_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _new_meta(self, url: str, resp: requests.Response, size: int) -> Optional[Dict[str, Any]]:
+        # Fără validatori nu putem face GET condițional, deci nu are rost să păstrăm răspunsul
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+        now = time.time()
+        return {
+            "url": canonical_cache_url(url),
+            "final_url": resp.url,
+            "status": resp.status_code,
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": resp.encoding,
+            "content_type": resp.headers.get("Content-Type", "").split(";")[0].strip().lower() or None,
+            "size": size,
+            "stored_at": now,
+            "last_used": now,
+        }
+
+    def store(self, url: str, resp: requests.Response):
+        meta = self._new_meta(url, resp, len(resp.content))
+        if meta is None:
+            return
+        meta_path, body_path = self._paths(url)
+        try:
+            self._write_atomic(body_path, resp.content)
+            self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            print(f"[WARN] Could not write HTTP cache entry for {url}: {e}")
+
+    def store_stream(self, url: str, resp: requests.Response, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """
+        Passes a body read incrementally through, writing it to the cache as it goes. The entry is
+        committed only when the whole body was read, so the body is never held in memory at once.
+        """
+        meta = self._new_meta(url, resp, 0)
+        meta_path, body_path = self._paths(url)
+        tmp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        f = None
+        if meta is not None:
+            try:
+                os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                f = open(tmp_path, "wb")
+            except OSError as e:
+                print(f"[WARN] Could not write HTTP cache entry for {url}: {e}")
+        try:
+            for chunk in chunks:
+                if f is not None:
+                    try:
+                        f.write(chunk)
+                        meta["size"] += len(chunk)
+                    except OSError as e:
+                        print(f"[WARN] Could not write HTTP cache entry for {url}: {e}")
+                        f = self._discard_tmp(f, tmp_path)
+                yield chunk
+            if f is not None:
+                f.close()
+                f = None
+                try:
+                    os.replace(tmp_path, body_path)
+                    self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+                except OSError as e:
+                    print(f"[WARN] Could not write HTTP cache entry for {url}: {e}")
+        finally:
+            # Citire întreruptă (buget de URL-uri atins, eroare de parsare sau de rețea): nu păstrăm un corp parțial
+            if f is not None:
+                self._discard_tmp(f, tmp_path)
+
+    def _discard_tmp(self, f: BinaryIO, tmp_path: str) -> None:
+        f.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        if not self._evicted:
+            self.evict()
+        meta_path, _ = self._paths(url)
+        return self._read_meta(meta_path)
+
+    def conditional_headers(self, meta: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _refresh(self, meta_path: str, meta: Dict[str, Any], resp: requests.Response):
+        meta["last_used"] = time.time()
+        meta["etag"] = resp.headers.get("ETag", meta.get("etag"))
+        meta["last_modified"] = resp.headers.get("Last-Modified", meta.get("last_modified"))
+        try:
+            self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+
+    def load_not_modified(self, url: str, meta: Dict[str, Any], resp: requests.Response) -> Optional[str]:
+        """Serves a 304 from disk and refreshes the entry; None if the stored body is gone."""
+        meta_path, body_path = self._paths(url)
+        body = self._read_body(body_path)
+        if body is None:
+            return None
+        self._refresh(meta_path, meta, resp)
+        return body.decode(meta.get("encoding") or "utf-8", errors="replace")
+
+    def open_not_modified(self, url: str, meta: Dict[str, Any], resp: requests.Response) -> Optional[BinaryIO]:
+        """Like load_not_modified, but returns the stored raw body as an open file to read incrementally."""
+        meta_path, body_path = self._paths(url)
+        try:
+            body = open(body_path, "rb")
+        except OSError:
+            return None
+        self._refresh(meta_path, meta, resp)
+        return body
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for shard in os.listdir(self.cache_dir):
+            shard_path = os.path.join(self.cache_dir, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                if not name.endswith(".json"):
+                    continue
+                meta_path = os.path.join(shard_path, name)
+                meta = self._read_meta(meta_path) or {}
+                entries.append({
+                    "meta_path": meta_path,
+                    "body_path": meta_path[:-len(".json")] + ".body",
+                    "size": int(meta.get("size", 0)),
+                    "last_used": float(meta.get("last_used", 0)),
+                })
+        return entries
+
+    def _remove(self, entry: Dict[str, Any]):
+        for path in (entry["meta_path"], entry["body_path"]):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self) -> int:
+        """Drops entries unused for longer than the max age, then least recently used ones until under the size cap."""
+        with self._lock:
+            self._evicted = True
+            entries = self._entries()
+            now = time.time()
+            removed = 0
+            kept = []
+            for entry in entries:
+                if now - entry["last_used"] > self.max_age_seconds:
+                    self._remove(entry)
+                    removed += 1
+                else:
+                    kept.append(entry)
+            total = sum(e["size"] for e in kept)
+            for entry in sorted(kept, key=lambda e: e["last_used"]):
+                if total <= self.max_bytes:
+                    break
+                self._remove(entry)
+                total -= entry["size"]
+                removed += 1
+            return removed
@@ -0,0 +1,392 @@
+import io
+import os
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache
+
+# Dimensiunea implicită a pool-ului de conexiuni per host
+DEFAULT_POOL_SIZE = 20
+DEFAULT_TIMEOUT = 10
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+# Corpurile mari (sitemap-uri) se citesc în bucăți de această dimensiune
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Ritm adaptiv per domeniu (cereri/secundă): scade la 429/503 sau răspunsuri lente, crește treptat la succes
+HOST_RATE = float(os.getenv("WEBSITE_HOST_RATE", "4"))
+HOST_MIN_RATE = float(os.getenv("WEBSITE_HOST_MIN_RATE", "0.2"))
+HOST_MAX_RATE = float(os.getenv("WEBSITE_HOST_MAX_RATE", "10"))
+SLOW_RESPONSE_SECONDS = float(os.getenv("WEBSITE_SLOW_RESPONSE_SECONDS", "3"))
+# Reîncercări cu backoff exponențial și jitter pentru erori de rețea, 429 și 5xx
+MAX_RETRIES = int(os.getenv("WEBSITE_FETCH_MAX_RETRIES", "2"))
+BACKOFF_BASE_SECONDS = float(os.getenv("WEBSITE_BACKOFF_BASE_SECONDS", "1"))
+BACKOFF_MAX_SECONDS = float(os.getenv("WEBSITE_BACKOFF_MAX_SECONDS", "30"))
+# Un Retry-After mai lung de atât nu este așteptat: domeniul e considerat indisponibil
+MAX_RETRY_AFTER_SECONDS = float(os.getenv("WEBSITE_MAX_RETRY_AFTER_SECONDS", "60"))
+# După atâtea eșecuri consecutive domeniul este oprit până la sfârșitul rulării
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("WEBSITE_CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+
+def build_session(headers: Optional[Dict[str, str]] = None, pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Creates a requests session with a connection pool sized for concurrent workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def host_key(url: str) -> str:
+    netloc = urlparse(url).netloc.lower().split(":")[0]
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+class HostLimiter:
+    """
+    Caps the number of in-flight requests per host, independently of the global worker count,
+    and optionally spaces request starts on the same host by at least min_interval seconds.
+    """
+
+    def __init__(self, per_host_limit: int, min_interval: float = 0.0):
+        self.per_host_limit = max(1, per_host_limit)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        key = host_key(url)
+        with self._lock:
+            sem = self._semaphores.get(key)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host_limit)
+                self._semaphores[key] = sem
+            return sem
+
+    def _wait_turn(self, url: str):
+        key = host_key(url)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(key, now))
+            self._next_start[key] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    @contextmanager
+    def slot(self, url: str):
+        sem = self._semaphore(url)
+        sem.acquire()
+        try:
+            if self.min_interval:
+                self._wait_turn(url)
+            yield
+        finally:
+            sem.release()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_MAX_SECONDS) -> float:
+    """Full-jitter exponential backoff; never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+class HostThrottle:
+    """
+    Per-host token bucket with an adaptive rate. 429/503 halve the host's rate (and honour Retry-After
+    by holding the host until then), slow responses lower it, fast successes raise it step by step.
+    """
+
+    def __init__(self, rate: float = HOST_RATE, min_rate: float = HOST_MIN_RATE, max_rate: float = HOST_MAX_RATE,
+                 slow_seconds: float = SLOW_RESPONSE_SECONDS):
+        self.initial_rate = max(min_rate, min(rate, max_rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.slow_seconds = slow_seconds
+        self._lock = threading.Lock()
+        self._rates: Dict[str, float] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def rate(self, url: str) -> float:
+        with self._lock:
+            return self._rates.get(host_key(url), self.initial_rate)
+
+    def acquire(self, url: str):
+        # Fiecare cerere își rezervă momentul de start; cererile pe alte domenii nu așteaptă
+        key = host_key(url)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(key, now))
+            self._next_start[key] = start + 1.0 / self._rates.get(key, self.initial_rate)
+        if start > now:
+            time.sleep(start - now)
+
+    def record(self, url: str, status: int, latency: float, retry_after: Optional[float] = None):
+        key = host_key(url)
+        with self._lock:
+            rate = self._rates.get(key, self.initial_rate)
+            if status in THROTTLE_STATUSES:
+                rate /= 2
+                if retry_after:
+                    self._next_start[key] = max(self._next_start.get(key, 0.0), time.monotonic() + retry_after)
+            elif status == 0 or latency > self.slow_seconds:
+                rate *= 0.75
+            elif status < 500:
+                rate += 0.25
+            self._rates[key] = max(self.min_rate, min(self.max_rate, rate))
+
+
+class CircuitBreaker:
+    """Parks a host for the rest of the run after failure_threshold consecutive failed fetches."""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD):
+        self.failure_threshold = max(1, failure_threshold)
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open: Set[str] = set()
+
+    def allow(self, url: str) -> bool:
+        with self._lock:
+            return host_key(url) not in self._open
+
+    def record(self, url: str, failed: bool):
+        key = host_key(url)
+        with self._lock:
+            if not failed:
+                self._failures.pop(key, None)
+                return
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if self._failures[key] >= self.failure_threshold and key not in self._open:
+                self._open.add(key)
+                print(f"[WARN] Circuit open for {key} after {self._failures[key]} failed fetches; skipping it for this run")
+
+    def open_hosts(self) -> Set[str]:
+        with self._lock:
+            return set(self._open)
+
+    def reset(self):
+        with self._lock:
+            self._failures.clear()
+            self._open.clear()
+
+
+class _ChunkReader(io.RawIOBase):
+    """File-like view over response chunks, so a parser can consume the body incrementally."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+@dataclass
+class PageResponse:
+    url: str
+    final_url: str
+    status: int
+    content_type: str
+    text: str = ""
+    from_cache: bool = False
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and self.error is None
+
+
+class PageFetcher:
+    """
+    Single fetch primitive: one GET that follows redirects, records the final URL and status,
+    checks the content type before reading the body, and always releases the connection.
+    With a throttle, retries and a circuit breaker, network errors, 429 and 5xx responses are
+    retried with backoff outside the host slot, and a host that keeps failing is skipped.
+    """
+
+    def __init__(self, session: requests.Session, host_limiter: Optional[HostLimiter] = None,
+                 http_cache: Optional[HttpCache] = None, timeout: float = DEFAULT_TIMEOUT,
+                 throttle: Optional[HostThrottle] = None, breaker: Optional[CircuitBreaker] = None,
+                 max_retries: int = 0):
+        self.session = session
+        self.host_limiter = host_limiter
+        self.http_cache = http_cache
+        self.timeout = timeout
+        self.throttle = throttle
+        self.breaker = breaker
+        self.max_retries = max(0, max_retries)
+
+    def fetch(self, url: str, accept_types: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES) -> PageResponse:
+        if self.breaker and not self.breaker.allow(url):
+            return PageResponse(url=url, final_url=url, status=0, content_type="", error="circuit_open")
+        page, _ = self._with_retries(url, lambda: (self._attempt(url, accept_types), None))
+        return page
+
+    @contextmanager
+    def fetch_stream(self, url: str) -> Iterator[Tuple[PageResponse, Optional[BinaryIO]]]:
+        """
+        fetch() for large bodies (sitemaps): yields (page, body), where body is a buffered binary stream read
+        incrementally by the caller, or None unless page.ok. The host slot, throttle, breaker and retries
+        apply as in fetch(); a fresh body is written to the HTTP cache as it is read, and a 304 is
+        streamed from the cached file. The connection stays open until the block exits.
+        """
+        if self.breaker and not self.breaker.allow(url):
+            yield PageResponse(url=url, final_url=url, status=0, content_type="", error="circuit_open"), None
+            return
+        with ExitStack() as stack:
+            yield self._with_retries(url, lambda: self._attempt_stream(url, stack))
+
+    def _with_retries(self, url: str, attempt_fn: Callable[[], Tuple[PageResponse, Any]]) -> Tuple[PageResponse, Any]:
+        attempt = 0
+        while True:
+            page, body = attempt_fn()
+            failed = page.status == 0 or page.status in RETRYABLE_STATUSES
+            give_up = (attempt >= self.max_retries or (page.retry_after or 0) > MAX_RETRY_AFTER_SECONDS
+                       or (self.breaker is not None and not self.breaker.allow(url)))
+            if not failed or give_up:
+                break
+            # Așteptarea se face în afara slotului, ca alte cereri să poată folosi host-ul între timp
+            time.sleep(backoff_delay(attempt, page.retry_after))
+            attempt += 1
+        if self.breaker:
+            self.breaker.record(url, failed=failed)
+        return page, body
+
+    def _attempt_stream(self, url: str, stack: ExitStack) -> Tuple[PageResponse, Optional[BinaryIO]]:
+        # La 200, răspunsul și slotul host-ului rămân deschise (în `stack`) cât timp apelantul citește corpul
+        attempt_stack = ExitStack()
+        try:
+            attempt_stack.enter_context(self.host_limiter.slot(url) if self.host_limiter else nullcontext())
+            if self.throttle:
+                self.throttle.acquire(url)
+            started = time.monotonic()
+            try:
+                page, body = self._open_stream(url, attempt_stack)
+            except requests.RequestException as e:
+                print(f"[ERROR] Failed to fetch {url}: {e}")
+                page, body = PageResponse(url=url, final_url=url, status=0, content_type="", error=str(e)), None
+            if self.throttle:
+                self.throttle.record(url, page.status, time.monotonic() - started, page.retry_after)
+        except BaseException:
+            attempt_stack.close()
+            raise
+        if body is None:
+            attempt_stack.close()
+        else:
+            stack.enter_context(attempt_stack)
+        return page, body
+
+    def _open_stream(self, url: str, stack: ExitStack) -> Tuple[PageResponse, Optional[BinaryIO]]:
+        meta = self.http_cache.lookup(url) if self.http_cache else None
+        headers = self.http_cache.conditional_headers(meta) if self.http_cache else {}
+        resp = stack.enter_context(self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True, headers=headers))
+        if resp.status_code == 304:
+            cached = self.http_cache.open_not_modified(url, meta, resp) if meta else None
+            if cached is not None:
+                return PageResponse(url=url, final_url=meta.get("final_url") or url, status=200,
+                                    content_type=meta.get("content_type") or "", from_cache=True), stack.enter_context(cached)
+            # Corpul lipsește din cache: refacem cererea fără validatori
+            resp = stack.enter_context(self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True))
+        content_type = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        page = PageResponse(url=url, final_url=resp.url, status=resp.status_code, content_type=content_type)
+        if resp.status_code != 200:
+            if resp.status_code in RETRYABLE_STATUSES:
+                page.retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            return page, None
+        # iter_content decomprimă Content-Encoding; fișierele .xml.gz rămân gzip la nivel de conținut
+        chunks = resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        if self.http_cache:
+            self.http_cache.record_miss()
+            chunks = self.http_cache.store_stream(url, resp, chunks)
+            stack.callback(chunks.close)
+        return page, io.BufferedReader(_ChunkReader(chunks))
+
+    def _attempt(self, url: str, accept_types: Optional[Tuple[str, ...]]) -> PageResponse:
+        slot = self.host_limiter.slot(url) if self.host_limiter else nullcontext()
+        with slot:
+            if self.throttle:
+                self.throttle.acquire(url)
+            started = time.monotonic()
+            try:
+                page = self._fetch(url, accept_types)
+            except requests.RequestException as e:
+                print(f"[ERROR] Failed to fetch {url}: {e}")
+                page = PageResponse(url=url, final_url=url, status=0, content_type="", error=str(e))
+            if self.throttle:
+                self.throttle.record(url, page.status, time.monotonic() - started, page.retry_after)
+        return page
+
+    def _fetch(self, url: str, accept_types: Optional[Tuple[str, ...]]) -> PageResponse:
+        meta = self.http_cache.lookup(url) if self.http_cache else None
+        headers = self.http_cache.conditional_headers(meta) if self.http_cache else {}
+        with self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True, headers=headers) as resp:
+            content_type = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if resp.status_code != 304:
+                return self._read(url, resp, content_type, accept_types)
+            text = self.http_cache.load_not_modified(url, meta, resp) if meta else None
+            if text is not None:
+                return PageResponse(url=url, final_url=meta.get("final_url") or url, status=200,
+                                    content_type=meta.get("content_type") or "text/html", text=text, from_cache=True)
+        # Corpul lipsește din cache: refacem cererea fără validatori
+        return self._fetch_uncached(url, accept_types)
+
+    def _fetch_uncached(self, url: str, accept_types: Optional[Tuple[str, ...]]) -> PageResponse:
+        with self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True) as resp:
+            content_type = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            return self._read(url, resp, content_type, accept_types)
+
+    def _read(self, url: str, resp: requests.Response, content_type: str,
+              accept_types: Optional[Tuple[str, ...]]) -> PageResponse:
+        page = PageResponse(url=url, final_url=resp.url, status=resp.status_code, content_type=content_type)
+        if resp.status_code != 200:
+            if resp.status_code in RETRYABLE_STATUSES:
+                page.retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            return page
+        # Verificare timpurie a tipului: nu descărcăm PDF-uri, imagini etc.
+        if accept_types and content_type and not content_type.startswith(accept_types):
+            page.error = f"unexpected_content_type:{content_type}"
+            return page
+        page.text = resp.text
+        if self.http_cache:
+            self.http_cache.record_miss()
+            self.http_cache.store(url, resp)
+        return page
@@ -0,0 +1,111 @@
+import re
+from collections import Counter
+from typing import Dict, Any, Optional
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+# Praguri pentru decizii fără LLM; între ele pagina e considerată ambiguă
+HEURISTIC_ACCEPT_SCORE = 0.8
+HEURISTIC_REJECT_SCORE = 0.05
+
+CARD_CLASS_TOKENS = ("card", "post", "article", "entry", "teaser", "story", "news-item", "blog-item")
+PAGINATION_HREF_REGEX = re.compile(r"([?&](page|p|paged)=\d+)|(/page/\d+)", re.IGNORECASE)
+DATE_TEXT_REGEX = re.compile(
+    r"\b(\d{4}-\d{2}-\d{2}"
+    r"|\d{1,2}[./]\d{1,2}[./]\d{4}"
+    r"|(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.? \d{1,2},? \d{4}"
+    r"|\d{1,2} (jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.? \d{4})\b",
+    re.IGNORECASE,
+)
+
+
+def _repeated_cards(soup: BeautifulSoup) -> int:
+    # Cel mai des repetat bloc de tip card/post care conține un link
+    signatures: Counter = Counter()
+    for el in soup.find_all(["article", "div", "li"]):
+        if not isinstance(el, Tag):
+            continue
+        classes = el.get("class") or []
+        class_sig = " ".join(sorted(c.lower() for c in classes))
+        if el.name != "article" and not any(tok in class_sig for tok in CARD_CLASS_TOKENS):
+            continue
+        if el.find("a", href=True) is None:
+            continue
+        signatures[(el.name, class_sig)] += 1
+    return max(signatures.values()) if signatures else 0
+
+
+def _has_pagination(soup: BeautifulSoup) -> bool:
+    if soup.find(["a", "link"], rel="next") is not None:
+        return True
+    for el in soup.find_all(class_=re.compile(r"pagination|pager", re.IGNORECASE)):
+        if isinstance(el, Tag) and el.find("a", href=True) is not None:
+            return True
+    for a in soup.find_all("a", href=True):
+        href = a.get("href")
+        if isinstance(href, str) and PAGINATION_HREF_REGEX.search(href):
+            return True
+    return False
+
+
+def _section_links(soup: BeautifulSoup, url: str) -> int:
+    # Linkuri distincte mai adânci decât secțiunea curentă (ex: /blog/<slug>)
+    parsed = urlparse(url)
+    prefix = parsed.path.rstrip("/") + "/"
+    found = set()
+    for a in soup.find_all("a", href=True):
+        href = a.get("href")
+        if not isinstance(href, str):
+            continue
+        target = urlparse(urljoin(url, href.strip()))
+        if target.netloc and target.netloc != parsed.netloc:
+            continue
+        path = target.path.rstrip("/")
+        if path.startswith(prefix) and len(path) > len(prefix) and not PAGINATION_HREF_REGEX.search(path):
+            found.add(path)
+    return len(found)
+
+
+def score_index_page(soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    """Structural signals for 'is this a listing of articles'; must run on the uncleaned soup."""
+    cards = _repeated_cards(soup)
+    time_tags = len(soup.find_all("time"))
+    date_strings = len(DATE_TEXT_REGEX.findall(soup.get_text(" ", strip=True)))
+    dates = max(time_tags, date_strings)
+    pagination = _has_pagination(soup)
+    section_links = _section_links(soup, url)
+    score = (
+        0.35 * min(section_links / 10, 1.0)
+        + 0.3 * min(dates / 8, 1.0)
+        + 0.2 * min(cards / 8, 1.0)
+        + (0.15 if pagination else 0.0)
+    )
+    return {
+        "score": round(score, 3),
+        "signals": {
+            "cards": cards,
+            "time_tags": time_tags,
+            "date_strings": date_strings,
+            "pagination": pagination,
+            "section_links": section_links,
+        },
+    }
+
+
+def heuristic_page_type(soup: BeautifulSoup, url: str) -> Optional[Dict[str, Any]]:
+    """Returns an analysis for confident cases, or None when the page should go to the LLM."""
+    result = score_index_page(soup, url)
+    score = result["score"]
+    signals = result["signals"]
+    if score >= HEURISTIC_ACCEPT_SCORE:
+        page_type = "BLOG_INDEX"
+        reason = (f"heuristic: {signals['section_links']} section links, {max(signals['time_tags'], signals['date_strings'])} dates, "
+                  f"{signals['cards']} repeated cards" + (", pagination" if signals["pagination"] else ""))
+    elif score <= HEURISTIC_REJECT_SCORE:
+        page_type = "OTHER"
+        reason = "heuristic: no listing structure (no section links, dates, cards or pagination)"
+    else:
+        return None
+    return {"page_type": page_type, "reason": reason, "decided_by": "heuristic", "heuristic_score": score}
@@ -0,0 +1,140 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from http_client import HTML_CONTENT_TYPES, PageFetcher, PageResponse
+
+# Memoria maximă pentru corpurile paginilor dintr-o rulare; peste limită, cele mai vechi trec pe disc
+PAGE_STORE_MAX_MB = int(os.getenv("WEBSITE_PAGE_STORE_MAX_MB", "64"))
+# Un arbore parsat (BeautifulSoup) ocupă de câteva ori mărimea HTML-ului din care provine
+PARSED_SIZE_FACTOR = 6
+
+
+def _estimated_size(value: Any, text_len: int) -> int:
+    # Mărimea aproximativă a unei valori derivate: textul/listele de URL-uri după lungime, restul (arbori) după HTML
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(len(v) if isinstance(v, str) else _estimated_size(v, 0) + 16 for v in value) + 8 * len(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return 0
+    return PARSED_SIZE_FACTOR * text_len
+
+
+class PageStore:
+    """
+    Run-scoped store of fetched pages (final URL, status, body) and of values derived from them
+    (links, parsed trees), so every page is downloaded and parsed at most once per run.
+    The memory cap counts bodies and (estimated) derived values; over it, the least recently used
+    pages are spilled to a temporary directory removed by close() and their derived values dropped.
+    """
+
+    def __init__(self, fetcher: PageFetcher, max_bytes: int = PAGE_STORE_MAX_MB * 1024 * 1024):
+        self.fetcher = fetcher
+        self.max_bytes = max_bytes
+        self.fetches = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._pages: Dict[str, PageResponse] = {}
+        self._in_flight: Dict[str, threading.Event] = {}
+        # Corpuri și valori derivate ținute în memorie, în ordine LRU
+        self._resident: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._resident_bytes = 0
+        self._spilled: Dict[str, str] = {}
+        self._spill_dir: Optional[str] = None
+
+    def fetch(self, url: str, accept_types: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES) -> PageResponse:
+        # Feed-urile și alte resurse ne-HTML au intrarea lor: aceeași adresă poate fi respinsă ca HTML
+        key = url if accept_types == HTML_CONTENT_TYPES else url + "\n" + ",".join(accept_types or ("*",))
+        while True:
+            with self._lock:
+                page = self._pages.get(key)
+                if page is not None:
+                    self.hits += 1
+                    return self._with_body(key, page)
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = self._in_flight[key] = threading.Event()
+                    break
+            # Alt fir descarcă deja pagina: așteptăm rezultatul în loc de o a doua cerere
+            event.wait()
+        try:
+            page = self.fetcher.fetch(url, accept_types=accept_types)
+            with self._lock:
+                self.fetches += 1
+                self._pages[key] = replace(page, text="")
+                self._resident[key] = {"text": page.text, "_bytes": len(page.text)}
+                self._resident_bytes += len(page.text)
+                self._spill_over_cap()
+            return page
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            event.set()
+
+    def text(self, url: str) -> Optional[str]:
+        page = self.fetch(url)
+        return page.text if page.ok else None
+
+    def derived(self, url: str, name: str, compute: Callable[[], Any]) -> Any:
+        """Memoizes a value computed from the page (e.g. its links or parsed tree) while the body is resident."""
+        with self._lock:
+            entry = self._resident.get(url)
+            if entry is not None and name in entry:
+                self._resident.move_to_end(url)
+                return entry[name]
+        value = compute()
+        with self._lock:
+            entry = self._resident.get(url)
+            if entry is not None and name not in entry:
+                size = _estimated_size(value, len(entry["text"]))
+                entry[name] = value
+                entry["_bytes"] += size
+                self._resident_bytes += size
+                self._resident.move_to_end(url)
+                self._spill_over_cap()
+        return value
+
+    def _with_body(self, url: str, page: PageResponse) -> PageResponse:
+        entry = self._resident.get(url)
+        if entry is not None:
+            self._resident.move_to_end(url)
+            return replace(page, text=entry["text"])
+        spill_path = self._spilled.get(url)
+        if spill_path is None:
+            return page
+        with open(spill_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return replace(page, text=text)
+
+    def _spill_over_cap(self):
+        while self._resident_bytes > self.max_bytes and len(self._resident) > 1:
+            # Valorile derivate pleacă odată cu pagina; doar corpul trece pe disc
+            url, entry = self._resident.popitem(last=False)
+            text = entry["text"]
+            self._resident_bytes -= entry["_bytes"]
+            if not text:
+                continue
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="page_store_")
+            path = os.path.join(self._spill_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            self._spilled[url] = path
+
+    def close(self):
+        with self._lock:
+            self._pages.clear()
+            self._resident.clear()
+            self._spilled.clear()
+            self._resident_bytes = 0
+            if self._spill_dir:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+        if self.fetches or self.hits:
+            print(f"[INFO] Page store: {self.fetches} fetched, {self.hits} served from the run store")
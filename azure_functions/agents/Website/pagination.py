@@ -0,0 +1,154 @@
+import re
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+
+from bs4 import BeautifulSoup
+
+from recency import url_period_end
+
+# Parametri de query folosiți pentru paginare
+PAGE_PARAMS = ("page", "paged", "pg")
+PATH_PAGE_REGEX = re.compile(r"/page/(\d+)/?$")
+# Textul/eticheta linkului "pagina următoare" în șabloanele uzuale
+NEXT_TEXT_REGEX = re.compile(r"^(next|next page|older|older posts|older entries|›|»|→|next ›|next »|next →)$", re.IGNORECASE)
+NEXT_CLASS_REGEX = re.compile(r"(?:^|[-_\s])next(?:[-_\s]|$)", re.IGNORECASE)
+LOAD_MORE_CLASS_REGEX = re.compile(r"load-?more|infinite|show-?more", re.IGNORECASE)
+LOAD_MORE_ATTRS = ("data-load-more", "data-next-url", "data-next-page-url", "data-endpoint", "data-ajax-url", "data-url",
+                   "data-href", "href")
+# Cheile uzuale din răspunsurile JSON ale butoanelor "load more"
+JSON_LINK_KEYS = ("link", "url", "permalink", "href")
+JSON_DATE_KEYS = ("date_gmt", "date", "published", "publishDate", "published_at")
+JSON_HTML_KEYS = ("html", "content", "data", "items_html")
+JSON_NEXT_KEYS = ("next", "next_url", "nextUrl", "next_page_url", "nextPage")
+
+
+def _same_page(a: str, b: str) -> bool:
+    pa, pb = urlparse(a), urlparse(b)
+    return (pa.netloc.lower(), pa.path.rstrip("/"), sorted(parse_qsl(pa.query))) == \
+           (pb.netloc.lower(), pb.path.rstrip("/"), sorted(parse_qsl(pb.query)))
+
+
+def page_number(url: str) -> Tuple[Optional[str], int]:
+    """(pagination parameter or "path", page number) of a listing URL; page 1 when it has no marker."""
+    parts = urlparse(url)
+    for key, value in parse_qsl(parts.query):
+        if key.lower() in PAGE_PARAMS and value.isdigit():
+            return key, int(value)
+    m = PATH_PAGE_REGEX.search(parts.path)
+    if m:
+        return "path", int(m.group(1))
+    return None, 1
+
+
+def with_page(url: str, number: int, param: Optional[str] = None) -> str:
+    """Listing URL for another page number, keeping the pagination scheme of the URL (or of `param`)."""
+    current, _ = page_number(url)
+    param = current or param or "page"
+    parts = urlparse(url)
+    if param == "path":
+        path = PATH_PAGE_REGEX.sub("", parts.path).rstrip("/") + f"/page/{number}/"
+        return urlunparse(parts._replace(path=path))
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != param]
+    query.append((param, str(number)))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def next_page_url(soup: BeautifulSoup, url: str) -> Optional[str]:
+    """
+    URL of the next listing page: rel="next", then a link labelled or classed as "next"/"older",
+    then a link to page N+1 in the ?page=N or /page/N scheme. None when the listing ends here.
+    """
+    for el in soup.find_all(["link", "a"], rel=True):
+        if "next" in [r.lower() for r in el.get("rel") or []] and el.get("href"):
+            return urljoin(url, el["href"].strip())
+    anchors = [a for a in soup.find_all("a", href=True) if not a["href"].startswith(("#", "javascript:"))]
+    for a in anchors:
+        label = a.get_text(" ", strip=True) or a.get("aria-label") or ""
+        classes = " ".join(a.get("class") or [])
+        if NEXT_TEXT_REGEX.match(label.strip()) or (classes and NEXT_CLASS_REGEX.search(classes)):
+            target = urljoin(url, a["href"].strip())
+            if not _same_page(target, url):
+                return target
+    param, number = page_number(url)
+    expected = [with_page(url, number + 1, p) for p in ([param] if param else ["page", "path", "paged"])]
+    for a in anchors:
+        target = urljoin(url, a["href"].strip())
+        if any(_same_page(target, e) for e in expected):
+            return target
+    return None
+
+
+def load_more_url(soup: BeautifulSoup, url: str) -> Optional[str]:
+    """
+    Endpoint of a "load more" / infinite-scroll control advertised in the markup. Site-wide feeds such as
+    the WordPress posts API are not used: they list every post, not only the posts of this index.
+    """
+    for el in soup.find_all(True):
+        marker = " ".join(el.get("class") or []) + " " + (el.get("id") or "")
+        if not (el.has_attr("data-load-more") or LOAD_MORE_CLASS_REGEX.search(marker)):
+            continue
+        for attr in LOAD_MORE_ATTRS:
+            value = el.get(attr)
+            if isinstance(value, str) and value.strip() and not value.startswith(("#", "javascript:")):
+                return urljoin(url, value.strip())
+    return None
+
+
+def _parse_date(value) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class LoadMorePage:
+    html: Optional[str] = None
+    links: List[str] = field(default_factory=list)
+    dates: List[datetime] = field(default_factory=list)
+    next_url: Optional[str] = None
+
+
+def parse_load_more(text: str, url: str) -> LoadMorePage:
+    """
+    One "load more" response: a JSON list of posts (links and dates), a JSON object wrapping an
+    HTML fragment and/or a post list, or a bare HTML fragment. Relative URLs resolve against `url`.
+    """
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return LoadMorePage(html=text or "")
+    page = LoadMorePage()
+    items = data
+    if isinstance(data, dict):
+        next_url = next((data[k] for k in JSON_NEXT_KEYS if isinstance(data.get(k), str) and data[k]), None)
+        page.next_url = urljoin(url, next_url) if next_url else None
+        page.html = next((data[k] for k in JSON_HTML_KEYS if isinstance(data.get(k), str)), None)
+        items = next((data[k] for k in ("posts", "items", "results", "data") if isinstance(data.get(k), list)), [])
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        link = next((item[k] for k in JSON_LINK_KEYS if isinstance(item.get(k), str)), None)
+        if link:
+            page.links.append(urljoin(url, link))
+        dt = next((d for d in (_parse_date(item.get(k)) for k in JSON_DATE_KEYS) if d), None)
+        if dt:
+            page.dates.append(dt)
+    return page
+
+
+def listing_dates(links: List[str], soup: Optional[BeautifulSoup] = None) -> List[datetime]:
+    """
+    Dates visible on a listing page: <time datetime> values (when the page is given) and dates in the
+    article URLs. A URL date counts as the end of its period, so /2024/05/slug is not older than late May.
+    """
+    times = soup.find_all("time", attrs={"datetime": True}) if soup is not None else []
+    dates = [d for d in (_parse_date(t.get("datetime")) for t in times) if d]
+    dates.extend(d for d in (url_period_end(link) for link in links) if d)
+    return dates
@@ -0,0 +1,61 @@
+import re
+import calendar
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Date în calea URL-ului: /2024/05/12/slug, /2024/05/slug, /2024-05-12-slug
+URL_DATE_REGEX = re.compile(r"/((?:19|20)\d{2})[/-](0[1-9]|1[0-2])(?:[/-](0[1-9]|[12]\d|3[01]))?(?=[/-]|$)")
+
+
+def url_path_date(url: str, require_day: bool = False) -> Optional[datetime]:
+    """
+    Date encoded in the URL path, or None. Month-only paths resolve to the first day of the month,
+    or to None with require_day (the path does not say which day the article was published).
+    """
+    m = URL_DATE_REGEX.search(urlparse(url).path)
+    if not m or (require_day and not m.group(3)):
+        return None
+    try:
+        return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3) or 1), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def url_period_end(url: str) -> Optional[datetime]:
+    """End (exclusive) of the period named by the URL date: the next day, or the next month for month-only paths."""
+    m = URL_DATE_REGEX.search(urlparse(url).path)
+    start = url_path_date(url)
+    if not m or start is None:
+        return None
+    if m.group(3):
+        return start + timedelta(days=1)
+    return start + timedelta(days=calendar.monthrange(start.year, start.month)[1])
+
+
+def url_date_before(url: str, cutoff: datetime) -> bool:
+    """True when the whole period named by the URL date (a day, or a month) ends before the cutoff."""
+    end = url_period_end(url)
+    return end is not None and end <= cutoff
+
+
+def order_by_recency(links: List[str], lastmod: Optional[Dict[str, datetime]] = None) -> List[str]:
+    """
+    Newest-first ordering of article candidates. Links with a date signal (URL path date, then sitemap
+    lastmod) are sorted by it; undated links keep their slot from the index page, which lists newest first.
+    """
+    lastmod = lastmod or {}
+    dated = []
+    slots = []
+    for position, url in enumerate(links):
+        dt = url_path_date(url) or lastmod.get(url)
+        if dt is not None:
+            dated.append((dt, position, url))
+            slots.append(position)
+    if not dated:
+        return list(links)
+    ordered = list(links)
+    dated.sort(key=lambda item: (-item[0].timestamp(), item[1]))
+    for slot, (_, _, url) in zip(slots, dated):
+        ordered[slot] = url
+    return ordered
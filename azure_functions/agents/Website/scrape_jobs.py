@@ -0,0 +1,509 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from datetime import datetime, timezone
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from azure.core import MatchConditions
+    from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+    from azure.storage.blob import BlobServiceClient
+except ImportError:  # azure-storage-blob e necesar doar când joburile se țin în Blob Storage
+    BlobServiceClient = None
+
+from http_cache import canonical_cache_url
+
+# Joburile asincrone ale funcției article_scraper: un document JSON per job și per work item, plus
+# revendicările articolelor de către work item-uri ("<job>.claim.<hash>") și lastmod-urile din sitemap ("<job>.lastmods").
+# În Azure se țin în Blob Storage (contul din AzureWebJobsStorage), vizibile pentru toate instanțele;
+# local și în teste, ca fișiere în SCRAPE_JOBS_DIR.
+SCRAPE_JOBS_DIR = os.getenv("WEBSITE_SCRAPE_JOBS_DIR", os.path.join(os.path.dirname(__file__), "scrape_jobs"))
+SCRAPE_JOBS_CONTAINER = os.getenv("WEBSITE_SCRAPE_JOBS_CONTAINER", "scrape-jobs")
+SCRAPE_JOBS_QUEUE = os.getenv("WEBSITE_SCRAPE_JOBS_QUEUE", "article-scraper-jobs")
+# Fan-out: fiecare index de blog al clientului devine un work item separat în această coadă
+SCRAPE_ITEMS_QUEUE = os.getenv("WEBSITE_SCRAPE_ITEMS_QUEUE", "article-scraper-index-items")
+# Progresul se scrie pe disc cel mult o dată la atâtea secunde (schimbările de etapă se scriu imediat)
+PROGRESS_WRITE_INTERVAL = float(os.getenv("WEBSITE_JOB_PROGRESS_INTERVAL_SECONDS", "2"))
+# Actualizări concurente ale aceluiași document (ETag schimbat între citire și scriere): se reîncearcă
+UPDATE_ATTEMPTS = 5
+# Mesajele care au eșuat de maxDequeueCount ori ajung în coada "<nume>-poison"
+POISON_SUFFIX = "-poison"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _seconds_between(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    if not start or not end:
+        return None
+    return round((datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds(), 1)
+
+
+class _WriteConflict(Exception):
+    pass
+
+
+def _record_ids(names: Iterable[str], prefix: str) -> List[str]:
+    # Prefixul se aplică id-ului, nu numelui: "<job>.json" nu face parte din "<job>."
+    ids = (n[:-len(".json")] for n in names if n.endswith(".json"))
+    return [record_id for record_id in ids if record_id.startswith(prefix)]
+
+
+class _FileRecords:
+    # Un fișier per document, scris atomic; concurența e limitată la un proces (lock-ul din JobStore)
+    def __init__(self, jobs_dir: str):
+        self.jobs_dir = jobs_dir
+        os.makedirs(jobs_dir, exist_ok=True)
+
+    def read(self, record_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            with open(os.path.join(self.jobs_dir, f"{record_id}.json"), "r", encoding="utf-8") as f:
+                return json.load(f), None
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None, None
+
+    def write(self, record_id: str, record: Dict[str, Any], etag: Optional[str] = None):
+        path = os.path.join(self.jobs_dir, f"{record_id}.json")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def create(self, record_id: str, record: Dict[str, Any]) -> bool:
+        # O_EXCL: dintre scrierile concurente ale aceluiași document reușește doar prima
+        try:
+            fd = os.open(os.path.join(self.jobs_dir, f"{record_id}.json"), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        return True
+
+    def delete(self, record_id: str):
+        try:
+            os.remove(os.path.join(self.jobs_dir, f"{record_id}.json"))
+        except FileNotFoundError:
+            pass
+
+    def ids(self, prefix: str) -> List[str]:
+        return sorted(_record_ids(os.listdir(self.jobs_dir), prefix))
+
+
+class _BlobRecords:
+    # Un blob per document; scrierile condiționate de ETag țin corecte actualizările de pe instanțe diferite
+    def __init__(self, container):
+        self.container = container
+
+    @classmethod
+    def connect(cls, connection_string: str, container_name: str) -> "_BlobRecords":
+        if BlobServiceClient is None:
+            raise RuntimeError("azure-storage-blob is required to keep scrape jobs in Blob Storage")
+        container = BlobServiceClient.from_connection_string(connection_string).get_container_client(container_name)
+        try:
+            container.create_container()
+        except ResourceExistsError:
+            pass
+        return cls(container)
+
+    def read(self, record_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            downloader = self.container.download_blob(f"{record_id}.json")
+            return json.loads(downloader.readall()), downloader.properties.etag
+        except ResourceNotFoundError:
+            return None, None
+
+    def write(self, record_id: str, record: Dict[str, Any], etag: Optional[str] = None):
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        conditions = {"etag": etag, "match_condition": MatchConditions.IfNotModified} if etag else {}
+        try:
+            self.container.upload_blob(f"{record_id}.json", data, overwrite=True, **conditions)
+        except ResourceModifiedError:
+            raise _WriteConflict(record_id)
+
+    def create(self, record_id: str, record: Dict[str, Any]) -> bool:
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        try:
+            self.container.upload_blob(f"{record_id}.json", data, overwrite=False)
+            return True
+        except ResourceExistsError:
+            return False
+
+    def delete(self, record_id: str):
+        try:
+            self.container.delete_blob(f"{record_id}.json")
+        except ResourceNotFoundError:
+            pass
+
+    def ids(self, prefix: str) -> List[str]:
+        return sorted(_record_ids((b.name for b in self.container.list_blobs(name_starts_with=prefix)), prefix))
+
+
+class JobStore:
+    """
+    Job and work item records (status, progress, counts, timings) shared by the HTTP trigger, the queue
+    workers and the status endpoint. With a storage connection string they live in Blob Storage, so any
+    instance sees them; otherwise in local files.
+    """
+
+    def __init__(self, jobs_dir: str = SCRAPE_JOBS_DIR, connection_string: Optional[str] = None,
+                 container_name: str = SCRAPE_JOBS_CONTAINER, records=None):
+        self._lock = threading.Lock()
+        if records is not None:
+            self._records = records
+        elif connection_string:
+            self._records = _BlobRecords.connect(connection_string, container_name)
+        else:
+            self._records = _FileRecords(jobs_dir)
+
+    @staticmethod
+    def _check_id(record_id: str) -> str:
+        # Id-ul vine din URL: acceptăm doar hex (uuid4) și "-" (work item-uri), fără separatori de cale
+        if not record_id or not all(c in "0123456789abcdef-" for c in record_id):
+            raise KeyError(record_id)
+        return record_id
+
+    def _write(self, record_id: str, record: Dict[str, Any]):
+        self._records.write(self._check_id(record_id), record)
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """A job or work item record by id."""
+        try:
+            return self._records.read(self._check_id(record_id))[0]
+        except KeyError:
+            return None
+
+    def create(self, base_url: str, client_name: str) -> Dict[str, Any]:
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": QUEUED,
+            "base_url": base_url,
+            "client_name": client_name,
+            "progress": {},
+            "counts": {},
+            "timings": {"created_at": _now()},
+            "error": None,
+        }
+        with self._lock:
+            self._write(job["job_id"], job)
+        return job
+
+    def create_items(self, job_id: str, index_urls: List[str],
+                     checkpoints: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """One work item per blog index; `checkpoints` seeds items with work already done while planning."""
+        items = []
+        for number, index_url in enumerate(index_urls, start=1):
+            item = {
+                "item_id": f"{job_id}-{number:03d}",
+                "job_id": job_id,
+                "index_url": index_url,
+                "status": QUEUED,
+                "attempts": 0,
+                "checkpoint": (checkpoints or {}).get(index_url, {}),
+                "counts": {},
+                "newest_date": None,
+                "timings": {"created_at": _now()},
+                "error": None,
+            }
+            with self._lock:
+                self._write(item["item_id"], item)
+            items.append(item)
+        return items
+
+    def items(self, job_id: str) -> List[Dict[str, Any]]:
+        ids = self._records.ids(f"{self._check_id(job_id)}-")
+        return [item for item in (self.get(record_id) for record_id in ids) if item is not None]
+
+    def update(self, record_id: str, **fields) -> Dict[str, Any]:
+        self._check_id(record_id)
+        for _ in range(UPDATE_ATTEMPTS):
+            with self._lock:
+                record, etag = self._records.read(record_id)
+                if record is None:
+                    raise KeyError(record_id)
+                for key, value in fields.items():
+                    # Momentele de timp se acumulează; progresul și contoarele se înlocuiesc
+                    record[key] = {**record.get(key, {}), **value} if key == "timings" else value
+                try:
+                    self._records.write(record_id, record, etag)
+                    return record
+                except _WriteConflict:
+                    # Altă instanță a scris documentul între timp: recitim și reaplicăm modificarea
+                    continue
+        raise RuntimeError(f"Record {record_id} kept changing during {UPDATE_ATTEMPTS} update attempts")
+
+    def claim(self, job_id: str, owner: str, url: str) -> bool:
+        """
+        Claims an article URL for one work item of a job, atomically across instances. True for the first
+        item to claim it, and again for that item (a resumed one); False when another item got there first.
+        """
+        canonical = canonical_cache_url(url)
+        claim_id = f"{self._check_id(job_id)}.claim.{hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()}"
+        if self._records.create(claim_id, {"url": canonical, "owner": owner}):
+            return True
+        record, _ = self._records.read(claim_id)
+        return record is not None and record.get("owner") == owner
+
+    def save_lastmods(self, job_id: str, lastmods: Dict[str, datetime]):
+        # Document separat: poate avea zeci de mii de intrări, iar jobul e rescris la fiecare actualizare
+        self._records.write(f"{self._check_id(job_id)}.lastmods", {url: dt.isoformat() for url, dt in lastmods.items()})
+
+    def lastmods(self, job_id: str) -> Optional[Dict[str, datetime]]:
+        """The sitemap lastmods read while planning the job, or None when they were not read."""
+        record, _ = self._records.read(f"{self._check_id(job_id)}.lastmods")
+        return {url: datetime.fromisoformat(dt) for url, dt in record.items()} if record is not None else None
+
+    def discard_run_data(self, job_id: str):
+        """Drops what the work items of a finished job shared (claims, lastmods); the job and item records stay."""
+        for record_id in self._records.ids(f"{self._check_id(job_id)}."):
+            self._records.delete(record_id)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The job as reported by the status endpoint. For a fanned-out job that is still running, progress
+        and counts are aggregated from its work items, which are the only records the workers write.
+        """
+        job = self.get(job_id)
+        if job is None or not job.get("items_total"):
+            return job
+        items = self.items(job_id)
+        job["items"] = [
+            {"index_url": i["index_url"], "status": i["status"], "attempts": i["attempts"], "error": i["error"],
+             "position": i["checkpoint"].get("position"), "candidates": len(i["checkpoint"].get("article_links", []))}
+            for i in items
+        ]
+        if job["status"] not in FINISHED_STATUSES:
+            done = sum(1 for i in items if i["status"] in FINISHED_STATUSES)
+            job["progress"] = {"stage": "processing_indexes", "items_done": done, "items_total": job["items_total"]}
+            job["counts"] = _sum_counts(i["counts"] or i["checkpoint"].get("stats", {}) for i in items)
+        return job
+
+
+def _sum_counts(counts: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    total: Counter = Counter()
+    for c in counts:
+        total.update(c)
+    return dict(total)
+
+
+def job_message(job: Dict[str, Any]) -> str:
+    """Queue message body for a job; the worker re-reads everything else from the store."""
+    return json.dumps({"job_id": job["job_id"]})
+
+
+def item_message(item: Dict[str, Any]) -> str:
+    return json.dumps({"item_id": item["item_id"]})
+
+
+def _message_id(message: str, key: str) -> Optional[str]:
+    try:
+        return json.loads(message)[key]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        print(f"[ERROR] Invalid job message: {message!r}")
+        return None
+
+
+class _ProgressReporter:
+    # Ține evidența duratei fiecărei etape și limitează scrierile de progres pe disc
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self.stage: Optional[str] = None
+        self.stage_started = time.monotonic()
+        self.stage_seconds: Dict[str, float] = {}
+        self.last_write = 0.0
+
+    def _close_stage(self):
+        if self.stage:
+            elapsed = time.monotonic() - self.stage_started
+            self.stage_seconds[self.stage] = round(self.stage_seconds.get(self.stage, 0.0) + elapsed, 1)
+
+    def __call__(self, stage: str, details: Dict[str, Any]):
+        now = time.monotonic()
+        changed = stage != self.stage
+        if changed:
+            self._close_stage()
+            self.stage, self.stage_started = stage, now
+        if not changed and now - self.last_write < PROGRESS_WRITE_INTERVAL:
+            return
+        self.last_write = now
+        counts = details.pop("stats", {})
+        self.store.update(self.job_id, progress={"stage": stage, **details, "updated_at": _now()}, counts=counts,
+                          timings={"stages": dict(self.stage_seconds)})
+
+    def finish(self) -> Dict[str, float]:
+        self._close_stage()
+        self.stage = None
+        return dict(self.stage_seconds)
+
+
+def run_job(store: JobStore, message: str, scraper_factory: Callable[..., Any],
+            enqueue_items: Optional[Callable[[List[str]], None]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Runs one queued job: marks it running, runs the scraper with a progress callback and records
+    the outcome, counts and timings. Finished jobs are skipped, so a redelivered message is harmless.
+    Failures are recorded on the job instead of raised, so the queue does not rerun a long crawl.
+
+    With `enqueue_items`, the job only plans the run (discovery, feeds, date selector) and fans the
+    client's blog indexes out as work items; run_index_item processes them and finishes the job.
+    """
+    job_id = _message_id(message, "job_id")
+    if job_id is None:
+        return None
+    job = store.get(job_id)
+    if job is None:
+        print(f"[ERROR] Unknown job {job_id}")
+        return None
+    if job["status"] in FINISHED_STATUSES:
+        print(f"[INFO] Job {job_id} already {job['status']}; ignoring redelivered message.")
+        return job
+    if job.get("items_total"):
+        # Planificarea s-a terminat deja (mesaj relivrat): work item-urile sunt create și în coadă
+        print(f"[INFO] Job {job_id} already fanned out; ignoring redelivered message.")
+        return job
+
+    started_at = _now()
+    store.update(job_id, status=RUNNING, timings={
+        "started_at": started_at,
+        "queue_wait_seconds": _seconds_between(job["timings"].get("created_at"), started_at),
+    })
+    reporter = _ProgressReporter(store, job_id)
+    scraper = None
+    status, error = SUCCEEDED, None
+    try:
+        scraper = scraper_factory(progress=reporter)
+        if enqueue_items is not None:
+            ctx = scraper.plan_run(job["base_url"], job["client_name"])
+            if ctx is not None and ctx.blog_index_urls:
+                return _fan_out(store, job_id, ctx, enqueue_items, reporter)
+        else:
+            scraper.run(job["base_url"], job["client_name"])
+    except Exception as e:
+        print(f"[ERROR] Job {job_id} failed: {e}")
+        status, error = FAILED, str(e)
+    finished_at = _now()
+    counts = dict(getattr(scraper, "run_stats", None) or {})
+    return store.update(job_id, status=status, error=error, counts=counts, progress={"stage": status, "updated_at": finished_at},
+                        timings={"finished_at": finished_at, "duration_seconds": _seconds_between(started_at, finished_at),
+                                 "stages": reporter.finish()})
+
+
+def _fan_out(store: JobStore, job_id: str, ctx, enqueue_items: Callable[[List[str]], None],
+             reporter: _ProgressReporter) -> Dict[str, Any]:
+    # Indexurile parcurse la planificare intră în checkpoint-ul work item-ului, ca să nu fie parcurse din nou
+    checkpoints = {url: {"crawled_links": links} for url, links in ctx.crawled_indexes.items()}
+    items = store.create_items(job_id, ctx.blog_index_urls, checkpoints)
+    # Planul rulării (indexuri, selector, CMS, feed-uri) stă în job: item-urile nu depind de starea locală a instanței
+    # lastmod-urile din sitemap se citesc o singură dată, la planificare, și se dau tuturor item-urilor
+    if ctx.lastmods is not None:
+        store.save_lastmods(job_id, ctx.lastmods)
+    job = store.update(job_id, client_key=ctx.client_key, cutoff=ctx.cutoff_dt.isoformat(), plan=ctx.plan(), items_total=len(items),
+                       progress={"stage": "processing_indexes", "items_done": 0, "items_total": len(items), "updated_at": _now()},
+                       timings={"planned_at": _now(), "stages": reporter.finish()})
+    enqueue_items([item_message(item) for item in items])
+    print(f"[INFO] Job {job_id} fanned out into {len(items)} index work items.")
+    return job
+
+
+def run_index_item(store: JobStore, message: str, scraper_factory: Callable[..., Any]) -> Optional[Dict[str, Any]]:
+    """
+    Processes one fan-out work item (a single blog index) on any instance: the run plan and the article
+    claims live in the store, and a job without a plan fails the item. The item's checkpoint is written
+    as it goes, so a redelivered message after a host recycle resumes from the last saved position.
+    The last item to finish aggregates the counts, records the newest article date and finishes the job.
+    """
+    item_id = _message_id(message, "item_id")
+    if item_id is None:
+        return None
+    item = store.get(item_id)
+    job = store.get(item["job_id"]) if item else None
+    if item is None or job is None:
+        print(f"[ERROR] Unknown work item {item_id}")
+        return None
+    if item["status"] in FINISHED_STATUSES:
+        print(f"[INFO] Work item {item_id} already {item['status']}; ignoring redelivered message.")
+        return item
+    if item["status"] == RUNNING:
+        print(f"[INFO] Work item {item_id} was interrupted; resuming from its checkpoint.")
+
+    started_at = _now()
+    store.update(item_id, status=RUNNING, attempts=item["attempts"] + 1, timings={"started_at": started_at})
+    scraper = None
+    status, error, newest_dt = SUCCEEDED, None, None
+    try:
+        scraper = scraper_factory()
+        newest_dt = scraper.run_index_item(
+            job["base_url"], item["index_url"], job.get("plan") or {}, cutoff_dt=datetime.fromisoformat(job["cutoff"]),
+            checkpoint=item["checkpoint"], on_checkpoint=lambda cp: store.update(item_id, checkpoint=cp),
+            claim=lambda url: store.claim(job["job_id"], item_id, url), lastmods=store.lastmods(job["job_id"]))
+    except Exception as e:
+        print(f"[ERROR] Work item {item_id} ({item['index_url']}) failed: {e}")
+        status, error = FAILED, str(e)
+    finished_at = _now()
+    item = store.update(item_id, status=status, error=error, counts=dict(getattr(scraper, "run_stats", None) or {}),
+                        newest_date=newest_dt.isoformat() if newest_dt else None,
+                        timings={"finished_at": finished_at, "duration_seconds": _seconds_between(started_at, finished_at)})
+    _finalize_job(store, job["job_id"], scraper)
+    return item
+
+
+def _finalize_job(store: JobStore, job_id: str, scraper):
+    # Rulează după fiecare work item; doar când toate sunt terminate se închide jobul (idempotent)
+    items = store.items(job_id)
+    if any(i["status"] not in FINISHED_STATUSES for i in items):
+        return
+    job = store.get(job_id)
+    if job is None or job["status"] in FINISHED_STATUSES:
+        return
+    failed = [i for i in items if i["status"] == FAILED]
+    newest = max((datetime.fromisoformat(i["newest_date"]) for i in items if i["newest_date"]), default=None)
+    # Ca la rularea secvențială: data se mută înainte doar dacă toate indexurile au fost procesate
+    if newest and not failed and scraper is not None:
+        scraper.record_latest_article_date(job["client_key"], newest)
+    store.discard_run_data(job_id)
+    status = FAILED if failed else SUCCEEDED
+    error = "; ".join(f"{i['index_url']}: {i['error']}" for i in failed) or None
+    finished_at = _now()
+    store.update(job_id, status=status, error=error, counts=_sum_counts(i["counts"] for i in items),
+                 progress={"stage": status, "items_done": len(items), "items_total": len(items), "updated_at": finished_at},
+                 timings={"finished_at": finished_at,
+                          "duration_seconds": _seconds_between(job["timings"].get("started_at"), finished_at)})
+    print(f"[INFO] Job {job_id} {status} after {len(items)} index work items.")
+
+
+def fail_poisoned(store: JobStore, message: str) -> Optional[Dict[str, Any]]:
+    """
+    Handles a message moved to a poison queue (its worker timed out or crashed maxDequeueCount times):
+    the job or work item is marked failed, and a fanned-out job is finished once its other items are.
+    """
+    try:
+        body = json.loads(message)
+    except (json.JSONDecodeError, TypeError):
+        print(f"[ERROR] Invalid poisoned message: {message!r}")
+        return None
+    record_id = (body.get("item_id") or body.get("job_id")) if isinstance(body, dict) else None
+    record = store.get(record_id) if record_id else None
+    if record is None:
+        print(f"[ERROR] Unknown poisoned record {record_id}")
+        return None
+    if record["status"] in FINISHED_STATUSES:
+        return record
+    finished_at = _now()
+    error = "Worker did not finish after repeated attempts (message moved to the poison queue)."
+    print(f"[ERROR] {record_id}: {error}")
+    record = store.update(record_id, status=FAILED, error=error, progress={"stage": FAILED, "updated_at": finished_at},
+                          timings={"finished_at": finished_at})
+    if "item_id" in record:
+        # Jobul are acum un item eșuat, deci data ultimului articol nu se mută și nu e nevoie de scraper
+        _finalize_job(store, record["job_id"], None)
+    return record
@@ -0,0 +1,47 @@
+import os
+import json
+import threading
+from typing import Any, Dict, Optional
+
+# Starea per client (indexuri descoperite, feed-uri, selector de dată, ultima dată văzută)
+SCRAPING_STATE_PATH = os.path.join(os.path.dirname(__file__), "scraping_state.json")
+
+_state_lock = threading.Lock()
+
+
+def load_scraping_state(path: str = SCRAPING_STATE_PATH) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_state(state: Dict[str, Any], path: str):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def save_scraping_state(state: Dict[str, Any], path: str = SCRAPING_STATE_PATH):
+    """Writes the state to a temp file and renames it, so readers never see a partial file."""
+    with _state_lock:
+        _write_state(state, path)
+
+
+def merge_scraping_state(updates: Dict[str, Dict[str, Any]], path: str = SCRAPING_STATE_PATH,
+                         state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Re-reads the state file, merges the updated fields into each client entry and saves it in one atomic
+    write. Fields not in the update (e.g. date_selector or latest_article_date after a rediscovery) are kept.
+    """
+    with _state_lock:
+        merged = load_scraping_state(path)
+        for client_key, entry in updates.items():
+            merged[client_key] = {**merged.get(client_key, {}), **entry}
+        _write_state(merged, path)
+    if state is not None:
+        for client_key in updates:
+            state[client_key] = merged[client_key]
+    return merged
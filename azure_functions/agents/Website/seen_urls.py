@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from itertools import islice
+from typing import Iterable
+
+from http_cache import canonical_cache_url
+
+# Indexul persistent al URL-urilor de articole deja procesate
+SEEN_URLS_PATH = os.getenv("WEBSITE_SEEN_URLS_PATH", os.path.join(os.path.dirname(__file__), "seen_urls.sqlite"))
+
+INSERT_BATCH_SIZE = 10000
+
+
+def url_hash(url: str) -> int:
+    """Signed 64-bit hash of the canonical URL (SQLite INTEGER range)."""
+    digest = hashlib.blake2b(canonical_cache_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class SeenUrlIndex:
+    """
+    Set-like, on-disk index of seen URLs. Rows are keyed by a 64-bit hash of the canonical URL and
+    keep the canonical URL itself, so a hash collision never reports a false positive. Lookups are
+    primary-key seeks and memory use does not grow with the number of articles.
+    """
+
+    def __init__(self, path: str = SEEN_URLS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (h INTEGER NOT NULL, url TEXT NOT NULL, PRIMARY KEY (h, url)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def __contains__(self, url: object) -> bool:
+        if not isinstance(url, str):
+            return False
+        canonical = canonical_cache_url(url)
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seen WHERE h = ? AND url = ?", (url_hash(url), canonical)).fetchone()
+        return row is not None
+
+    def add(self, url: str):
+        self.add_many([url])
+
+    def add_many(self, urls: Iterable[str]):
+        # Inserare în loturi: importul inițial poate avea milioane de URL-uri
+        rows = ((url_hash(u), canonical_cache_url(u)) for u in urls if u)
+        while True:
+            batch = list(islice(rows, INSERT_BATCH_SIZE))
+            if not batch:
+                return
+            with self._lock:
+                self._conn.executemany("INSERT OR IGNORE INTO seen (h, url) VALUES (?, ?)", batch)
+                self._conn.commit()
+
+    def __bool__(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,117 @@
+import gzip
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+from http_client import PageFetcher
+
+# Buget implicit: câte fișiere sitemap și câte URL-uri citim per site
+SITEMAP_MAX_FILES = 50
+SITEMAP_MAX_URLS = 50000
+DEFAULT_SITEMAP_PATHS = ("/sitemap.xml", "/sitemap_index.xml")
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[datetime]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parses W3C datetime values used in <lastmod> (date only or full timestamp)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        if len(value) == 10:
+            return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _open_body(body):
+    # Fișierele .xml.gz rămân gzip la nivel de conținut (Content-Encoding e deja decomprimat de requests)
+    if body.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=body)
+    return body
+
+
+def sitemap_seeds(fetcher: PageFetcher, base_url: str) -> List[str]:
+    """Sitemaps advertised in robots.txt, followed by the conventional locations."""
+    parsed = urlparse(base_url)
+    root = f"{parsed.scheme}://{parsed.netloc}"
+    seeds: List[str] = []
+    robots = fetcher.fetch(urljoin(root, "/robots.txt"), accept_types=None)
+    if robots.ok:
+        for line in robots.text.splitlines():
+            if line.lower().startswith("sitemap:"):
+                seeds.append(line.split(":", 1)[1].strip())
+    for path in DEFAULT_SITEMAP_PATHS:
+        url = urljoin(root, path)
+        if url not in seeds:
+            seeds.append(url)
+    return seeds
+
+
+def iter_sitemap(fetcher: PageFetcher, seeds: List[str], since: Optional[datetime] = None,
+                 max_files: int = SITEMAP_MAX_FILES, max_urls: int = SITEMAP_MAX_URLS) -> Iterator[SitemapEntry]:
+    """
+    Streams <url> entries from the given sitemaps, following <sitemapindex> children.
+    Entries (and child sitemaps) with a lastmod older than `since` are skipped. Files are streamed through
+    PageFetcher.fetch_stream (throttle, circuit breaker, retries, HTTP cache) and parsed while they download.
+    """
+    queue = deque(seeds)
+    seen = set()
+    files_read = 0
+    urls_yielded = 0
+    while queue and files_read < max_files and urls_yielded < max_urls:
+        sitemap_url = queue.popleft()
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        with fetcher.fetch_stream(sitemap_url) as (page, body):
+            if not page.ok:
+                continue
+            files_read += 1
+            try:
+                root = None
+                loc: Optional[str] = None
+                lastmod: Optional[datetime] = None
+                for event, elem in ElementTree.iterparse(_open_body(body), events=("start", "end")):
+                    if event == "start":
+                        if root is None:
+                            root = elem
+                        continue
+                    name = _local_name(elem.tag)
+                    if name == "loc" and loc is None:
+                        # Primul <loc> din intrare; ignoră extensiile (ex: <image:loc>)
+                        loc = (elem.text or "").strip()
+                    elif name == "lastmod":
+                        lastmod = parse_lastmod(elem.text)
+                    elif name in ("url", "sitemap"):
+                        if loc and not (since and lastmod and lastmod < since):
+                            if name == "sitemap":
+                                queue.append(loc)
+                            else:
+                                yield SitemapEntry(loc=loc, lastmod=lastmod)
+                                urls_yielded += 1
+                        loc, lastmod = None, None
+                        # Eliberează memoria pe măsură ce parcurgem fișierul
+                        elem.clear()
+                        if root is not None:
+                            root.clear()
+                        if urls_yielded >= max_urls:
+                            break
+            except (ElementTree.ParseError, OSError, EOFError, ValueError) as e:
+                print(f"[WARN] Could not read sitemap {sitemap_url}: {e}")
+                continue
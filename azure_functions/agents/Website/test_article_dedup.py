@@ -0,0 +1,52 @@
+import random
+
+from article_dedup import NEAR_DUPLICATE_DISTANCE, ContentFingerprints, canonical_article_url, canonical_link, hamming_distance, simhash
+
+
+def _text(seed, n=800):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(["agent", "model", "data", "cloud", "team", "release", "customer", "workflow",
+                                "pipeline", "report", "invoice", "robot", "test", "policy", "market"]) + str(rng.randint(0, 50))
+                    for _ in range(n))
+
+
+def test_canonical_article_url_collapses_variants():
+    canonical = "https://example.com/blog/post"
+    for variant in [
+        "https://www.example.com/blog/post/",
+        "https://example.com/en/blog/post",
+        "https://example.com/blog/post/amp",
+        "https://EXAMPLE.com/blog/post?utm_source=x&utm_medium=y&fbclid=1#share",
+    ]:
+        assert canonical_article_url(variant) == canonical
+    assert canonical_article_url("https://example.com/blog/post?page=2&utm_campaign=z") == canonical + "?page=2"
+    assert canonical_article_url("https://example.com/ro/blog/post") != canonical
+
+
+def test_canonical_link_ignores_other_sites():
+    assert canonical_link(["https://partner.com/post", "https://www.example.com/blog/post"],
+                          "https://example.com/c/ai/post") == "https://example.com/blog/post"
+    assert canonical_link([], "https://example.com/blog/post") is None
+
+
+def test_simhash_detects_near_duplicates_only():
+    text = _text(1)
+    words = text.split()
+    words[400] = "changed"
+    edited = " ".join(words) + " Share this article"
+    assert hamming_distance(simhash(text), simhash(edited)) <= NEAR_DUPLICATE_DISTANCE
+    assert hamming_distance(simhash(text), simhash(_text(2))) > 2 * NEAR_DUPLICATE_DISTANCE
+    assert simhash("too short") is None
+
+
+def test_fingerprint_index_finds_duplicates_by_band(tmp_path):
+    index = ContentFingerprints(str(tmp_path / "seen.sqlite"))
+    fp = simhash(_text(1))
+    index.add("https://example.com/blog/post", fp)
+    assert index.find_duplicate(fp ^ 0b101) == "https://example.com/blog/post"
+    assert index.find_duplicate(fp, exclude_url="https://example.com/blog/post") is None
+    assert index.find_duplicate(simhash(_text(2))) is None
+    # Amprentele cu bitul cel mai semnificativ setat se păstrează corect în SQLite
+    high = fp | (1 << 63)
+    index.add("https://example.com/blog/high", high)
+    assert index.find_duplicate(high) in ("https://example.com/blog/high", "https://example.com/blog/post")
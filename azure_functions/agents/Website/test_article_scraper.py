@@ -0,0 +1,261 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from article_scraper import CHECKPOINT_EVERY, ArticleScraperV3, ScrapeRun
+from article_dedup import ContentFingerprints
+from article_store import ArticleStore
+from cms_profiles import CMS_PROFILES
+from http_client import PageResponse
+from scrape_jobs import JobStore
+from scraping_state import load_scraping_state, merge_scraping_state, save_scraping_state
+from seen_urls import SeenUrlIndex
+
+# Un blog mic: paginare, o categorie și articole la adâncimi diferite
+SITE = {
+    "https://example.com/blog": ['/blog/post-1', '/blog/post-2', '/blog/page/2', '/blog/category/ai', '/about'],
+    "https://example.com/blog/page/2": ['/blog/post-3', '/blog/page/3'],
+    "https://example.com/blog/page/3": ['/blog/post-4'],
+    "https://example.com/blog/category/ai": ['/blog/post-5', '/blog/post-1'],
+}
+
+
+def _scraper(monkeypatch, workers, delay=0.02, paginate=True, **kwargs):
+    scraper = ArticleScraperV3(crawl_workers=workers, **kwargs)
+    if not paginate:
+        # Doar frontiera BFS, fără parcurgerea lanțului de paginare
+        monkeypatch.setattr(scraper, "_walk_pagination", lambda *args: None)
+    fetched = []
+    lock = threading.Lock()
+
+    def get_html(url):
+        time.sleep(delay)
+        with lock:
+            fetched.append(url)
+        links = SITE.get(url)
+        return "".join(f'<a href="{href}">x</a>' for href in links) if links is not None else None
+
+    monkeypatch.setattr(scraper, "_get_html", get_html)
+    return scraper, fetched
+
+
+def test_concurrent_frontier_matches_sequential_crawl(monkeypatch):
+    sequential, _ = _scraper(monkeypatch, workers=1, paginate=False)
+    concurrent, _ = _scraper(monkeypatch, workers=4, paginate=False)
+    expected = sorted(sequential.find_individual_article_links("https://example.com/blog"))
+    assert sorted(concurrent.find_individual_article_links("https://example.com/blog")) == expected
+    assert expected == [f"https://example.com/blog/post-{i}" for i in range(1, 6)]
+
+
+def test_frontier_respects_page_budget_and_prefers_pagination(monkeypatch):
+    scraper, fetched = _scraper(monkeypatch, workers=1, max_pages=2)
+    links = scraper.find_individual_article_links("https://example.com/blog")
+    assert fetched == ["https://example.com/blog", "https://example.com/blog/page/2"]
+    assert "https://example.com/blog/post-3" in links
+    assert "https://example.com/blog/post-5" not in links
+
+
+def test_paginated_listing_is_walked_without_categories(monkeypatch):
+    scraper, fetched = _scraper(monkeypatch, workers=1, delay=0)
+    links = scraper.find_individual_article_links("https://example.com/blog")
+    assert links == [f"https://example.com/blog/post-{i}" for i in range(1, 5)]
+    assert "https://example.com/blog/category/ai" not in fetched
+
+
+def test_query_pagination_stops_at_cutoff(monkeypatch):
+    scraper = ArticleScraperV3(crawl_workers=1)
+    pages = {
+        "https://example.com/news": '<a href="/news/2024/05/a">a</a><a href="/news?page=2">2</a>',
+        "https://example.com/news?page=2": '<a href="/news/2023/01/b">b</a><a href="/news?page=3">3</a>',
+        "https://example.com/news?page=3": '<a href="/news/2022/01/c">c</a>',
+    }
+    fetched = []
+    monkeypatch.setattr(scraper, "_get_html", lambda url: fetched.append(url) or pages.get(url))
+    links = scraper.find_individual_article_links("https://example.com/news",
+                                                  cutoff_dt=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    assert links == ["https://example.com/news/2024/05/a", "https://example.com/news/2023/01/b"]
+    assert "https://example.com/news?page=3" not in fetched
+
+    # Cutoff la jumătatea lunii: /2024/05/a poate fi de după 15 mai, deci pagina 2 se citește
+    fetched.clear()
+    scraper.find_individual_article_links("https://example.com/news", cutoff_dt=datetime(2024, 5, 15, tzinfo=timezone.utc))
+    assert "https://example.com/news?page=2" in fetched and "https://example.com/news?page=3" not in fetched
+
+
+def test_load_more_endpoint_is_followed(monkeypatch):
+    scraper = ArticleScraperV3(crawl_workers=1)
+    index = '<a href="/blog/first">1</a><button class="load-more" data-url="/api/posts?page=2">More</button>'
+    responses = {
+        "https://example.com/api/posts?page=2": '{"posts": [{"url": "/blog/second"}], "next": "/api/posts?page=3"}',
+        "https://example.com/api/posts?page=3": '{"html": "<a href=\\"/blog/third\\">3</a>"}',
+        "https://example.com/api/posts?page=4": '{"posts": []}',
+    }
+    monkeypatch.setattr(scraper, "_get_html", {"https://example.com/blog": index}.get)
+    monkeypatch.setattr(scraper.fetcher, "fetch", lambda url, accept_types=None: PageResponse(
+        url=url, final_url=url, status=200, content_type="application/json", text=responses[url]))
+    assert scraper.find_individual_article_links("https://example.com/blog") == [
+        "https://example.com/blog/first", "https://example.com/blog/second", "https://example.com/blog/third",
+    ]
+
+
+def test_cms_article_links_outside_index_path_are_collected(monkeypatch):
+    scraper = ArticleScraperV3(crawl_workers=1)
+    scraper.cms_profile = CMS_PROFILES["wordpress"]
+    pages = {
+        "https://example.com/blog": '<h2 class="entry-title"><a href="/2024/05/launch/">Launch</a></h2>'
+                                    '<a href="/blog/page/2">2</a><a href="/pricing">Pricing</a>',
+        "https://example.com/blog/page/2": '<h2 class="entry-title"><a href="/2024/04/beta/">Beta</a></h2>',
+    }
+    monkeypatch.setattr(scraper, "_get_html", pages.get)
+    assert scraper.find_individual_article_links("https://example.com/blog") == [
+        "https://example.com/2024/05/launch/", "https://example.com/2024/04/beta/",
+    ]
+
+
+def _stored_scraper(tmp_path):
+    return ArticleScraperV3(article_store=ArticleStore(str(tmp_path / "store")), seen_urls=SeenUrlIndex(str(tmp_path / "seen.sqlite")),
+                            fingerprints=ContentFingerprints(str(tmp_path / "seen.sqlite")), crawl_workers=1, recency_mode=False)
+
+
+def _index_run(index_url, links):
+    return ScrapeRun(client_key="example", base_url="https://example.com", blog_index_urls=[index_url],
+                     rejected_index_urls=set(), feed_entries=[], date_selector=None,
+                     cutoff_dt=datetime(2026, 1, 1, tzinfo=timezone.utc), crawled_indexes={index_url: links})
+
+
+def test_process_index_resumes_from_checkpoint_without_refetching_saved_articles(monkeypatch, tmp_path):
+    scraper = _stored_scraper(tmp_path)
+    links = [f"https://example.com/blog/post-{n}" for n in range(CHECKPOINT_EVERY + 3)]
+    fetched = []
+
+    def extract(url, date_selector):
+        if url == links[CHECKPOINT_EVERY + 1] and len(fetched) == CHECKPOINT_EVERY + 1:
+            raise RuntimeError("host recycled")
+        fetched.append(url)
+        return {"url": url, "canonical_url": url, "text": url, "publish_date": "2026-05-01"}
+
+    monkeypatch.setattr(scraper, "extract_article_data", extract)
+
+    def new_run():
+        return _index_run("https://example.com/blog", links)
+
+    checkpoints = []
+    with scraper._run_scope():
+        try:
+            scraper.process_index(new_run(), "https://example.com/blog", on_checkpoint=checkpoints.append)
+        except RuntimeError:
+            pass
+    assert checkpoints[-1]["position"] == CHECKPOINT_EVERY
+    assert all(link in scraper.processed_urls for link in links[:CHECKPOINT_EVERY])
+
+    with scraper._run_scope(checkpoints[-1]["stats"]):
+        scraper.process_index(new_run(), "https://example.com/blog", checkpoints[-1], checkpoints.append)
+    # Articolul acceptat după ultimul checkpoint (nesalvat) se descarcă din nou; cele salvate nu
+    assert fetched == links[:CHECKPOINT_EVERY + 1] + links[CHECKPOINT_EVERY:]
+    assert checkpoints[-1]["done"] and checkpoints[-1]["stats"]["saved_articles"] == len(links)
+
+
+def test_parallel_work_items_do_not_both_save_a_shared_article(monkeypatch, tmp_path):
+    blog, news = _stored_scraper(tmp_path), _stored_scraper(tmp_path)
+    fetched = []
+
+    def extract(url, date_selector):
+        fetched.append(url)
+        # /news/launch-repost are canonical-ul articolului din /blog
+        canonical = "https://example.com/blog/launch" if "launch" in url else url
+        return {"url": url, "canonical_url": canonical, "text": url, "publish_date": "2026-05-01"}
+
+    for scraper in (blog, news):
+        monkeypatch.setattr(scraper, "extract_article_data", extract)
+    blog_run = _index_run("https://example.com/blog", ["https://example.com/blog/launch", "https://example.com/blog/tips"])
+    news_run = _index_run("https://example.com/news", ["https://example.com/blog/tips", "https://example.com/news/launch-repost",
+                                                       "https://example.com/news/hiring"])
+    # Revendicările stau în depozitul joburilor, comun instanțelor (aici două JobStore peste același director)
+    blog_store, news_store = JobStore(str(tmp_path / "jobs")), JobStore(str(tmp_path / "jobs"))
+    job_id = blog_store.create("https://example.com", "Example")["job_id"]
+    blog_run.claim = lambda url: blog_store.claim(job_id, f"{job_id}-001", url)
+    news_run.claim = lambda url: news_store.claim(job_id, f"{job_id}-002", url)
+
+    # Niciun checkpoint între ele: ambele item-uri rulează înainte ca vreun articol să fie salvat
+    with blog._run_scope(), news._run_scope():
+        blog.process_index(blog_run, "https://example.com/blog")
+        news.process_index(news_run, "https://example.com/news")
+        blog.finish_run(blog_run, record_latest=False)
+        news.finish_run(news_run, record_latest=False)
+
+    saved = [a["url"] for a in blog_run.new_articles + news_run.new_articles]
+    assert sorted(saved) == ["https://example.com/blog/launch", "https://example.com/blog/tips", "https://example.com/news/hiring"]
+    assert fetched.count("https://example.com/blog/tips") == 1
+    assert news.run_stats["duplicates_by_url"] == 1 and news.run_stats["duplicates_by_canonical"] == 1
+
+
+def test_work_item_runs_from_the_job_plan_without_local_client_state(monkeypatch, tmp_path):
+    scraper = _stored_scraper(tmp_path)
+    scraper.scraping_state = {}
+    monkeypatch.setattr(scraper, "extract_article_data", lambda url, date_selector: {
+        "url": url, "canonical_url": url, "text": url, "publish_date": "2026-05-01", "selector": date_selector})
+    plan = _index_run("https://example.com/blog", []).plan()
+    plan.update(date_selector=".post-date", cms="wordpress")
+
+    newest = scraper.run_index_item("https://example.com", "https://example.com/blog", plan,
+                                    datetime(2026, 1, 1, tzinfo=timezone.utc),
+                                    checkpoint={"crawled_links": ["https://example.com/blog/post"]})
+
+    assert newest == datetime(2026, 5, 1, tzinfo=timezone.utc)
+    assert "https://example.com/blog/post" in scraper.processed_urls
+    assert scraper.cms_profile is CMS_PROFILES["wordpress"]
+    try:
+        scraper.run_index_item("https://example.com", "https://example.com/blog", {}, datetime(2026, 1, 1, tzinfo=timezone.utc))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a work item without a plan must fail")
+
+
+def test_prepare_run_writes_only_its_client_over_the_current_state_file(monkeypatch, tmp_path):
+    scraper = ArticleScraperV3(crawl_workers=1)
+    scraper.state_path = str(tmp_path / "scraping_state.json")
+    client_b = {"blog_index_urls": ["https://b.com/blog"], "cms": None, "feed_urls": [], "date_strategy": "structured"}
+    scraper.scraping_state = {"A|https://a.com": {"blog_index_urls": ["https://a.com/blog"]}, "B|https://b.com": client_b}
+    save_scraping_state(scraper.scraping_state, scraper.state_path)
+    # Alt worker termină un job pentru clientul A după ce acest scraper și-a citit starea
+    merge_scraping_state({"A|https://a.com": {"latest_article_date": "2026-05-01", "date_selector": ".date"}}, scraper.state_path)
+    monkeypatch.setattr(scraper.blog_index_processor, "refresh_website",
+                        lambda base_url, client_name, entry: {**entry, "last_verified_at": "2026-06-01T00:00:00+00:00"})
+
+    ctx = scraper.prepare_run("https://b.com", "B")
+
+    saved = load_scraping_state(scraper.state_path)
+    assert ctx.blog_index_urls == ["https://b.com/blog"]
+    assert saved["A|https://a.com"] == {"blog_index_urls": ["https://a.com/blog"], "latest_article_date": "2026-05-01",
+                                        "date_selector": ".date"}
+    assert saved["B|https://b.com"]["last_verified_at"] == "2026-06-01T00:00:00+00:00"
+
+
+def test_prepare_run_fetches_the_homepage_and_known_indexes_once(monkeypatch, tmp_path):
+    scraper = ArticleScraperV3(crawl_workers=1, recency_mode=False)
+    scraper.state_path = str(tmp_path / "scraping_state.json")
+    scraper.scraping_state = {"B|https://b.com": {"blog_index_urls": ["https://b.com/blog"], "feed_urls": []}}
+    save_scraping_state(scraper.scraping_state, scraper.state_path)
+    site = {
+        "https://b.com": '<nav><a href="/blog">Blog</a></nav>',
+        "https://b.com/blog": '<a href="/blog/post">Post</a>',
+        "https://b.com/blog/post": '<meta property="article:published_time" content="2026-05-01"><p>Post</p>',
+    }
+    fetched = []
+
+    def fetch(url, accept_types=None):
+        fetched.append(url)
+        return PageResponse(url=url, final_url=url, status=200 if url in site else 404,
+                            content_type="text/html", text=site.get(url, ""))
+
+    monkeypatch.setattr(scraper.fetcher, "fetch", fetch)
+    monkeypatch.setattr(scraper.blog_index_processor.fetcher, "fetch", lambda url, accept_types=None: (
+        _ for _ in ()).throw(AssertionError(f"{url} fetched outside the run's page store")))
+
+    ctx = scraper.plan_run("https://b.com", "B")
+
+    assert ctx.blog_index_urls == ["https://b.com/blog"]
+    # Reverificare (homepage + index), detectarea CMS-ului și crawl-ul pentru selectorul de dată
+    assert fetched.count("https://b.com") == 1 and fetched.count("https://b.com/blog") == 1
+    assert scraper.blog_index_processor.pages is None
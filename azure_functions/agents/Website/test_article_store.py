@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from article_store import ArticleStore
+
+
+def _article(i, text="t"):
+    return {"url": f"https://example.com/blog/post-{i}", "title": f"Post {i}", "text": text}
+
+
+def test_append_reads_back_and_index_lists_urls(tmp_path):
+    store = ArticleStore(str(tmp_path / "store"), segment_max_bytes=100)
+    store.append([_article(1), _article(2)])
+    store.append([_article(3)])
+    store.append([{"title": "no url"}])
+
+    reopened = ArticleStore(str(tmp_path / "store"))
+    assert reopened.urls() == {f"https://example.com/blog/post-{i}" for i in (1, 2, 3)}
+    assert [a["title"] for a in reopened.iter_articles()] == ["Post 1", "Post 2", "Post 3"]
+    assert len(reopened._segments()) == 2
+
+
+def test_compact_keeps_latest_copy_of_each_url(tmp_path):
+    store = ArticleStore(str(tmp_path / "store"), segment_max_bytes=1)
+    store.append([_article(1, "old")])
+    store.append([_article(2)])
+    store.append([_article(1, "new")])
+    assert store.compact() == 2
+    assert len(store._segments()) == 1
+    assert {a["url"]: a["text"] for a in store.iter_articles()}["https://example.com/blog/post-1"] == "new"
+    with open(store.index_path, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 2
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "scraped_articles.json"
+    legacy.write_text(json.dumps([_article(1), _article(2)]), encoding="utf-8")
+    ArticleStore(str(tmp_path / "store"), legacy_path=str(legacy))
+    store = ArticleStore(str(tmp_path / "store"), legacy_path=str(legacy))
+    assert len(list(store.iter_articles())) == 2
+
+
+def test_compressed_segments_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    store = ArticleStore(str(tmp_path / "store"), compress=True)
+    store.append([_article(1)])
+    store.append([_article(2)])
+    assert store._segments()[0].endswith(".jsonl.zst")
+    assert [a["url"] for a in store.iter_articles()] == [_article(1)["url"], _article(2)["url"]]
@@ -0,0 +1,253 @@
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+import blog_index_processor
+from blog_index_processor import BlogIndexProcessor
+from classification_cache import ClassificationCache
+from http_client import HostLimiter, PageResponse
+
+
+def _fake_pipeline(processor, delays):
+    def fetch(url, accept_types=None):
+        time.sleep(delays.get(url, 0))
+        return PageResponse(url=url, final_url=url, status=200, content_type="text/html", text="<html></html>")
+
+    def analyze(url, page=None):
+        assert page is not None and page.final_url == url
+        page_type = "BLOG_INDEX" if "blog" in url or "news" in url else "OTHER"
+        return {"page_type": page_type, "reason": "test"}
+
+    processor.fetcher.fetch = fetch
+    processor._analyze_page_type = analyze
+
+
+def test_concurrent_evaluation_keeps_priority_order():
+    urls = [
+        "https://example.com/blog",
+        "https://example.com/news",
+        "https://example.com/pricing",
+        "https://example.com/de",
+    ]
+    delays = {urls[0]: 0.2, urls[1]: 0.05, urls[2]: 0.1}
+    sequential = BlogIndexProcessor(max_workers=1, batch_size=1)
+    concurrent = BlogIndexProcessor(max_workers=4, per_host_limit=4, batch_size=1)
+    _fake_pipeline(sequential, delays)
+    _fake_pipeline(concurrent, delays)
+
+    expected = sequential._evaluate_candidates(urls)
+    actual = concurrent._evaluate_candidates(urls)
+
+    assert [r and r["url"] for r in actual] == [r and r["url"] for r in expected]
+    assert [r and r["analysis"]["page_type"] for r in actual] == ["BLOG_INDEX", "BLOG_INDEX", "OTHER", None]
+
+
+def test_domain_rule_exclusion_is_reported_without_fetching():
+    processor = BlogIndexProcessor(max_workers=2)
+    processor.fetcher.fetch = lambda url, accept_types=None: (_ for _ in ()).throw(AssertionError("fetched"))
+    result = processor._evaluate_candidate("https://www.uipath.com/resources")
+    assert result["excluded"] is True
+    assert result["analysis"]["reason"] == "domain_rule_excluded"
+
+
+def test_host_limiter_caps_in_flight_requests_per_host():
+    limiter = HostLimiter(per_host_limit=2)
+    in_flight = {"a.com": 0, "b.com": 0}
+    peak = {"a.com": 0, "b.com": 0}
+    lock = threading.Lock()
+
+    def worker(host):
+        with limiter.slot(f"https://www.{host}/page"):
+            with lock:
+                in_flight[host] += 1
+                peak[host] = max(peak[host], in_flight[host])
+            time.sleep(0.02)
+            with lock:
+                in_flight[host] -= 1
+
+    threads = [threading.Thread(target=worker, args=(h,)) for h in ["a.com", "b.com"] * 5]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == {"a.com": 2, "b.com": 2}
+
+
+def test_batch_classification_splits_and_retries_malformed_output(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_llm(prompt_value):
+        text = prompt_value.to_messages()[-1].content
+        ids = re.findall(r"### PAGE (\d+)", text)
+        calls.append(len(ids))
+        if len(ids) > 2:
+            # Răspuns incomplet: lipsește ultima pagină
+            ids = ids[:-1]
+        return json.dumps({"results": [{"id": i, "page_type": "BLOG_INDEX", "reason": "r"} for i in ids]})
+
+    monkeypatch.setattr(blog_index_processor, "llm", RunnableLambda(fake_llm))
+    processor = BlogIndexProcessor(max_workers=1, batch_size=4,
+                                   classification_cache=ClassificationCache(path=str(tmp_path / "c.json")))
+    pages = [(f"https://example.com/p{i}", f"text {i}") for i in range(4)]
+
+    analyses = processor._classify_batch(pages)
+
+    assert [a["page_type"] for a in analyses] == ["BLOG_INDEX"] * 4
+    assert calls == [4, 2, 2]
+    assert processor.classification_cache.get("text 3", blog_index_processor.LLM_PROMPT_VERSION) is not None
+
+
+def test_batch_discovery_merges_all_sites_into_state(tmp_path):
+    state_path = tmp_path / "state.json"
+    state_path.write_text(json.dumps({"Old|https://old.com": {"blog_index_urls": ["https://old.com/blog"]}}))
+    processor = BlogIndexProcessor(max_workers=1)
+
+    def discover(base_url, client_name):
+        if "broken" in base_url:
+            raise RuntimeError("boom")
+        return f"{client_name}|{base_url}", {"blog_index_urls": [base_url + "blog"]}
+
+    processor.discover_website = discover
+    clients = [
+        {"name": "A", "base_url": "https://a.com/"},
+        {"client_name": "B", "base_url": "https://b.com/"},
+        {"name": "C", "base_url": "https://broken.com/"},
+    ]
+    in_memory = {}
+    results = processor.process_websites(clients, state_path=str(state_path), scraping_state=in_memory, site_workers=3)
+
+    saved = json.loads(state_path.read_text())
+    assert set(results) == {"A|https://a.com/", "B|https://b.com/"}
+    assert set(saved) == {"Old|https://old.com", "A|https://a.com/", "B|https://b.com/"}
+    assert in_memory == results
+
+
+def test_batch_rediscovery_keeps_fields_owned_by_the_article_scraper(tmp_path):
+    state_path = tmp_path / "state.json"
+    state_path.write_text(json.dumps({"A|https://a.com/": {
+        "blog_index_urls": ["https://a.com/blog"], "date_selector": "time.published",
+        "latest_article_date": "2026-05-01", "cms": "wordpress",
+    }}))
+    processor = BlogIndexProcessor(max_workers=1)
+    processor.discover_website = lambda base_url, client_name: (
+        f"{client_name}|{base_url}", {"blog_index_urls": [base_url + "news"], "discovered_at": "now"})
+    in_memory = {}
+
+    processor.process_websites([{"name": "A", "base_url": "https://a.com/"}], state_path=str(state_path),
+                               scraping_state=in_memory, site_workers=1)
+
+    saved = json.loads(state_path.read_text())["A|https://a.com/"]
+    assert saved == {"blog_index_urls": ["https://a.com/news"], "date_selector": "time.published",
+                     "latest_article_date": "2026-05-01", "cms": "wordpress", "discovered_at": "now"}
+    assert in_memory["A|https://a.com/"] == saved
+
+
+def test_refresh_revalidates_cheaply_and_rediscovers_on_nav_change():
+    processor = BlogIndexProcessor(max_workers=1)
+    homepage = {"html": '<a href="/blog">Blog</a><a href="/pricing">Pricing</a><a href="/blog/post-1">Post</a>'}
+    processor._get_html = lambda url: homepage["html"]
+    processor.fetcher.fetch = lambda url, accept_types=None: PageResponse(url=url, final_url=url, status=200, content_type="text/html")
+    rediscovered = []
+
+    def discover(base_url, client_name):
+        rediscovered.append(base_url)
+        return f"{client_name}|{base_url}", {"blog_index_urls": ["https://example.com/news"], "discovered_at": "new"}
+
+    processor.discover_website = discover
+    fingerprint = processor._nav_fingerprint("https://example.com/", homepage["html"])
+    old = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    entry = {"blog_index_urls": ["https://example.com/blog"], "nav_fingerprint": fingerprint,
+             "discovered_at": old, "last_verified_at": old, "date_selector": "time"}
+
+    verified = processor.refresh_website("https://example.com/", "Example", entry)
+    assert not rediscovered
+    assert verified["discovered_at"] == old and verified["last_verified_at"] != old
+    # Reverificat recent: nicio cerere
+    assert processor.refresh_website("https://example.com/", "Example", verified) is verified
+
+    # Un link nou către articol nu schimbă amprenta; o secțiune nouă da
+    homepage["html"] += '<a href="/blog/post-2">Post 2</a>'
+    assert processor._nav_fingerprint("https://example.com/", homepage["html"]) == fingerprint
+    homepage["html"] += '<a href="/news">News</a>'
+    refreshed = processor.refresh_website("https://example.com/", "Example", entry)
+    assert rediscovered == ["https://example.com/"]
+    assert refreshed["blog_index_urls"] == ["https://example.com/news"]
+    assert refreshed["date_selector"] == "time"
+
+
+def test_nav_fingerprint_ignores_root_level_post_slugs():
+    processor = BlogIndexProcessor(max_workers=1)
+    nav = '<header><nav><a href="/blog">Blog</a><a href="/pricing">Pricing</a></nav></header>'
+    posts = '<main><a href="/first-post">First</a></main><footer><a href="/contact">Contact</a></footer>'
+    fingerprint = processor._nav_fingerprint("https://example.com/", nav + posts)
+
+    # Permalinkuri /%postname%/: un articol nou în pagină nu e o schimbare de navigație
+    assert processor._nav_fingerprint("https://example.com/", nav + posts.replace(
+        "</main>", '<a href="/second-post">Second</a></main>')) == fingerprint
+    assert processor._nav_fingerprint("https://example.com/", nav.replace(
+        "</nav>", '<a href="/solutions">Solutions</a></nav>') + posts) != fingerprint
+    # Fără regiuni de navigație contează doar secțiunile de tip blog
+    bare = '<a href="/blog">Blog</a><a href="/first-post">First</a>'
+    assert processor._nav_fingerprint("https://example.com/", bare + '<a href="/second-post">2</a>') == \
+        processor._nav_fingerprint("https://example.com/", bare)
+
+    # O amprentă în formatul vechi este înlocuită la reverificare, fără redescoperire
+    processor._get_html = lambda url: nav + posts
+    processor.fetcher.fetch = lambda url, accept_types=None: PageResponse(url=url, final_url=url, status=200, content_type="text/html")
+    processor.discover_website = lambda base_url, client_name: pytest.fail("unexpected rediscovery")
+    old = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    entry = {"blog_index_urls": ["https://example.com/blog"], "nav_fingerprint": "0123456789abcdef",
+             "discovered_at": old, "last_verified_at": old}
+    assert processor.refresh_website("https://example.com/", "Example", entry)["nav_fingerprint"] == fingerprint
+
+
+def test_refresh_rediscovers_only_when_a_known_index_is_gone():
+    processor = BlogIndexProcessor(max_workers=1)
+    homepage = '<a href="/blog">Blog</a>'
+    processor._get_html = lambda url: homepage
+    rediscovered = []
+    processor.discover_website = lambda base_url, client_name: rediscovered.append(base_url) or (
+        f"{client_name}|{base_url}", {"blog_index_urls": ["https://example.com/news"]})
+    old = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    entry = {"blog_index_urls": ["https://example.com/blog"], "discovered_at": old, "last_verified_at": old,
+             "nav_fingerprint": processor._nav_fingerprint("https://example.com/", homepage)}
+
+    def respond(status, final_url="https://example.com/blog"):
+        processor.fetcher.fetch = lambda url, accept_types=None: PageResponse(url=url, final_url=final_url, status=status, content_type="text/html")
+
+    # Erorile temporare păstrează indexurile cunoscute, fără redescoperire
+    respond(503)
+    assert processor.refresh_website("https://example.com/", "Example", entry) is entry
+    processor.fetcher.fetch = lambda url, accept_types=None: None
+    assert processor.refresh_website("https://example.com/", "Example", entry) is entry
+    assert not rediscovered
+
+    respond(200, final_url="https://example.com/")
+    processor.refresh_website("https://example.com/", "Example", entry)
+    respond(410)
+    processor.refresh_website("https://example.com/", "Example", entry)
+    assert rediscovered == ["https://example.com/", "https://example.com/"]
+
+
+def test_host_limiter_spaces_requests_on_same_host():
+    limiter = HostLimiter(per_host_limit=4, min_interval=0.05)
+    starts = []
+    lock = threading.Lock()
+
+    def worker():
+        with limiter.slot("https://example.com/page"):
+            with lock:
+                starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    starts.sort()
+    assert all(b - a >= 0.045 for a, b in zip(starts, starts[1:]))
@@ -0,0 +1,37 @@
+import time
+
+from classification_cache import ClassificationCache, content_key
+
+
+def test_hit_requires_same_text_and_prompt_version(tmp_path):
+    cache = ClassificationCache(path=str(tmp_path / "cache.json"), ttl_days=30)
+    cache.put("page text", "v1", {"page_type": "BLOG_INDEX", "reason": "list of posts"}, url="https://example.com/blog")
+
+    assert cache.get("page text", "v1") == {"page_type": "BLOG_INDEX", "reason": "list of posts"}
+    assert cache.get("page text", "v2") is None
+    assert cache.get("other text", "v1") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_entries_persist_and_expire(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ClassificationCache(path=path, ttl_days=1)
+    cache.put("fresh", "v1", {"page_type": "OTHER", "reason": "r"})
+    cache.put("stale", "v1", {"page_type": "OTHER", "reason": "r"})
+    cache._entries[content_key("stale", "v1")]["stored_at"] = time.time() - 2 * 86400
+    cache.save()
+
+    reloaded = ClassificationCache(path=path, ttl_days=1)
+    assert reloaded.get("fresh", "v1") is not None
+    assert reloaded.get("stale", "v1") is None
+
+
+def test_invalidate_by_url_and_all(tmp_path):
+    cache = ClassificationCache(path=str(tmp_path / "cache.json"))
+    cache.put("a", "v1", {"page_type": "OTHER", "reason": "r"}, url="https://example.com/a")
+    cache.put("b", "v1", {"page_type": "OTHER", "reason": "r"}, url="https://example.com/b")
+
+    assert cache.invalidate(url="https://example.com/a") == 1
+    assert cache.get("a", "v1") is None
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
@@ -0,0 +1,55 @@
+from bs4 import BeautifulSoup
+
+from cms_profiles import CMS_PROFILES, cms_article_links, cms_body, cms_date_selector, detect_cms
+
+WORDPRESS_INDEX = """<html><head><meta name="generator" content="WordPress 6.5.2">
+<link rel="stylesheet" href="/wp-content/themes/x/style.css"></head><body>
+<article><h2 class="entry-title"><a href="/2024/05/first-post/">First</a></h2></article>
+<article><h2 class="entry-title"><a href="/2024/04/second-post/">Second</a></h2></article>
+<a href="/page/2/">Older posts</a></body></html>"""
+
+
+def _soup(html):
+    return BeautifulSoup(html, "html.parser")
+
+
+def test_detects_cms_from_generator_and_markers():
+    assert detect_cms(WORDPRESS_INDEX) == "wordpress"
+    assert detect_cms('<meta content="Drupal 10 (https://www.drupal.org)" name="Generator">') == "drupal"
+    assert detect_cms('<html data-wf-site="abc"><img src="https://cdn.prod.website-files.com/a.png"></html>') == "webflow"
+    assert detect_cms('<script src="//js.hs-scripts.com/123.js"></script>') == "hubspot"
+    assert detect_cms('<img src="https://images.ctfassets.net/space/a.jpg">') == "contentful"
+    assert detect_cms("<html><body>Hand-written site</body></html>") is None
+
+
+def test_article_links_from_stock_theme_markup():
+    links = cms_article_links(_soup(WORDPRESS_INDEX), CMS_PROFILES["wordpress"])
+    assert links == ["/2024/05/first-post/", "/2024/04/second-post/"]
+
+
+def test_date_selector_uses_builtin_then_learned_selectors():
+    hubspot = CMS_PROFILES["hubspot"]
+    assert cms_date_selector(_soup('<div class="blog-post__timestamp">May 5, 2024</div>'), hubspot) == ".blog-post__timestamp"
+    page = _soup('<span class="custom-date">3 June 2024</span>')
+    assert cms_date_selector(page, hubspot) is None
+    assert cms_date_selector(page, hubspot, (".custom-date",)) == ".custom-date"
+
+
+def test_webflow_date_selectors_ignore_other_date_classes():
+    webflow = CMS_PROFILES["webflow"]
+    assert cms_date_selector(_soup('<div class="updated-date">June 9, 2024</div>'), webflow) is None
+    assert cms_date_selector(_soup('<div class="blog-date">May 5, 2024</div>'), webflow) == ".blog-date"
+
+
+def test_contentful_date_selector_ignores_times_outside_the_article():
+    contentful = CMS_PROFILES["contentful"]
+    assert cms_date_selector(_soup('<footer><time>2024-06-09</time></footer><article><p>Post</p></article>'), contentful) is None
+    assert cms_date_selector(_soup('<article><time datetime="2024-05-05">May 5</time></article>'), contentful) == "article time"
+
+
+def test_body_selector_requires_substantial_text():
+    webflow = CMS_PROFILES["webflow"]
+    body = "Long paragraph about the product. " * 10
+    page = _soup(f'<div class="w-richtext"><p>{body}</p></div><div class="footer">Footer</div>')
+    assert cms_body(page, webflow).get_text(strip=True) == body.strip()
+    assert cms_body(_soup('<div class="w-richtext">Short</div>'), webflow) is None
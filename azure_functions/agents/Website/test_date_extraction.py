@@ -0,0 +1,36 @@
+from bs4 import BeautifulSoup
+
+from date_extraction import selector_date, structured_publish_date
+
+
+def _date(html, url="https://example.com/blog/post"):
+    return structured_publish_date(BeautifulSoup(html, "html.parser"), url)
+
+
+def test_json_ld_wins_over_other_sources():
+    html = """
+    <script type="application/ld+json">{"@graph": [{"@type": "WebPage"},
+        {"@type": "BlogPosting", "datePublished": "2024-05-03T10:00:00+00:00"}]}</script>
+    <meta property="article:published_time" content="2024-01-01">
+    <p>Updated 2020-01-01</p>
+    """
+    assert _date(html) == ("2024-05-03", "json_ld")
+
+
+def test_meta_microdata_time_and_url_fallbacks():
+    assert _date('<meta name="pubdate" content="2023-07-08">') == ("2023-07-08", "meta")
+    assert _date('<span itemprop="datePublished" content="2022-02-02">Feb 2</span>') == ("2022-02-02", "microdata")
+    assert _date('<time datetime="2021-03-04T08:00">March 4</time>') == ("2021-03-04", "time")
+    assert _date("<p>no dates</p>", "https://example.com/2020/06/12/post") == ("2020-06-12", "url")
+    # O cale doar cu luna nu spune ziua publicării: lăsăm selectorul clientului să decidă
+    assert _date("<p>no dates</p>", "https://example.com/2020/06/post") == (None, None)
+    assert _date('<script type="application/ld+json">{broken</script>') == (None, None)
+
+
+def test_selector_date_reads_attributes_and_written_dates():
+    soup = BeautifulSoup('<time class="a" datetime="2024-02-03">Feb 3</time><span class="b">Posted 5 May 2024</span>'
+                         '<span class="c">Sep. 3, 2023</span>', "html.parser")
+    assert selector_date(soup, "time.a") == "2024-02-03"
+    assert selector_date(soup, ".b") == "2024-05-05"
+    assert selector_date(soup, ".c") == "2023-09-03"
+    assert selector_date(soup, ".missing") is None and selector_date(soup, "[[broken") is None
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+from feed_reader import discover_feed_links, parse_feed
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>Blog</title>
+  <item><title>First</title><link>https://example.com/blog/first</link><pubDate>Tue, 10 Jun 2025 09:00:00 GMT</pubDate></item>
+  <item><title>Second</title><link>/blog/second</link><dc:date>2025-05-01T08:00:00Z</dc:date></item>
+</channel></rss>"""
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>News</title>
+  <entry><title>Launch</title><link rel="alternate" href="https://example.com/news/launch"/>
+    <link rel="edit" href="https://example.com/api/1"/><updated>2025-04-02T10:00:00Z</updated></entry>
+</feed>"""
+
+
+def test_discovers_alternate_feed_links_without_comment_feeds():
+    html = """<html><head>
+      <link rel="alternate" type="application/rss+xml" href="/blog/feed/">
+      <link rel="alternate" type="application/rss+xml" href="/blog/comments/feed/">
+      <link rel="alternate" type="application/atom+xml" href="https://example.com/news.atom">
+      <link rel="stylesheet" href="/style.css">
+    </head></html>"""
+    assert discover_feed_links(html, "https://example.com/") == [
+        "https://example.com/blog/feed/",
+        "https://example.com/news.atom",
+    ]
+
+
+def test_parses_rss_with_publish_dates():
+    entries = parse_feed(RSS, "https://example.com/blog/feed")
+    assert [e.url for e in entries] == ["https://example.com/blog/first", "https://example.com/blog/second"]
+    assert entries[0].published == datetime(2025, 6, 10, 9, tzinfo=timezone.utc)
+    assert entries[1].published == datetime(2025, 5, 1, 8, tzinfo=timezone.utc)
+
+
+def test_parses_atom_alternate_links():
+    entries = parse_feed(ATOM)
+    assert [(e.url, e.title) for e in entries] == [("https://example.com/news/launch", "Launch")]
+    assert entries[0].published == datetime(2025, 4, 2, 10, tzinfo=timezone.utc)
+
+
+def test_non_feed_documents_are_rejected():
+    assert parse_feed("<html><body>Not a feed</body></html>") is None
+    assert parse_feed("not xml at all") is None
@@ -0,0 +1,111 @@
+import os
+import gzip
+import json
+import time
+
+import requests
+
+from http_cache import HttpCache, canonical_cache_url
+from http_client import PageFetcher
+
+
+def _response(url, status, body=b"", headers=None):
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = status
+    resp._content = body
+    resp._content_consumed = True
+    resp.headers.update({"Content-Type": "text/html; charset=utf-8"})
+    resp.headers.update(headers or {})
+    resp.encoding = "utf-8"
+    return resp
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, timeout=None, allow_redirects=True, stream=False, headers=None):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+def _get(cache, session, url):
+    return PageFetcher(session, http_cache=cache).fetch(url)
+
+
+def test_canonical_cache_url_normalizes_host_port_and_query():
+    assert canonical_cache_url("HTTPS://Example.com:443/blog?b=2&a=1#top") == "https://example.com/blog?a=1&b=2"
+    assert canonical_cache_url("http://example.com") == "http://example.com/"
+
+
+def test_not_modified_is_served_from_disk(tmp_path):
+    cache = HttpCache(cache_dir=str(tmp_path))
+    url = "https://example.com/blog"
+    session = FakeSession([
+        _response(url, 200, b"<html>v1</html>", {"ETag": '"abc"', "Last-Modified": "Mon, 01 Sep 2025 10:00:00 GMT"}),
+        _response(url, 304),
+    ])
+
+    first = _get(cache, session, url)
+    second = _get(cache, session, url + "#fragment")
+
+    assert first.text == "<html>v1</html>" and not first.from_cache
+    assert second.text == "<html>v1</html>" and second.from_cache
+    assert session.sent_headers[1] == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Sep 2025 10:00:00 GMT"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_streamed_bodies_are_cached_only_when_read_to_the_end(tmp_path):
+    cache = HttpCache(cache_dir=str(tmp_path))
+    url = "https://example.com/sitemap.xml.gz"
+    body = gzip.compress(b"<urlset/>" * 100)
+    headers = {"ETag": '"gz"', "Content-Type": "application/gzip"}
+    session = FakeSession([_response(url, 200, body, headers), _response(url, 200, body, headers), _response(url, 304)])
+    fetcher = PageFetcher(session, http_cache=cache)
+
+    # Citire întreruptă după primii octeți: nu rămâne nimic în cache
+    with fetcher.fetch_stream(url) as (page, stream):
+        assert page.ok and stream.read(2) == body[:2]
+    assert cache.lookup(url) is None
+
+    with fetcher.fetch_stream(url) as (page, stream):
+        assert stream.read() == body and not page.from_cache
+    with fetcher.fetch_stream(url) as (page, stream):
+        assert stream.read() == body and page.from_cache and page.content_type == "application/gzip"
+    assert session.sent_headers[2] == {"If-None-Match": '"gz"'}
+
+
+def test_responses_without_validators_are_not_stored(tmp_path):
+    cache = HttpCache(cache_dir=str(tmp_path))
+    url = "https://example.com/news"
+    session = FakeSession([_response(url, 200, b"x"), _response(url, 200, b"y")])
+    _get(cache, session, url)
+    _get(cache, session, url)
+    assert session.sent_headers == [{}, {}]
+
+
+def test_evict_by_age_and_size(tmp_path):
+    cache = HttpCache(cache_dir=str(tmp_path), max_bytes=15, max_age_days=1)
+    for i in range(3):
+        url = f"https://example.com/p{i}"
+        _get(cache, FakeSession([_response(url, 200, b"0123456789", {"ETag": f'"{i}"'})]), url)
+    meta_path, _ = cache._paths("https://example.com/p0")
+    entry = cache._read_meta(meta_path)
+    entry["last_used"] = time.time() - 3 * 86400
+    cache._write_atomic(meta_path, json.dumps(entry).encode())
+
+    removed = cache.evict()
+
+    assert removed == 2
+    remaining = [name for shard in os.listdir(tmp_path) for name in os.listdir(tmp_path / shard) if name.endswith(".json")]
+    assert len(remaining) == 1
+
+
+def test_non_html_body_is_not_read():
+    url = "https://example.com/whitepaper"
+    resp = _response(url, 200, b"%PDF", {"Content-Type": "application/pdf"})
+    page = PageFetcher(FakeSession([resp])).fetch(url)
+    assert not page.ok
+    assert page.text == "" and page.error == "unexpected_content_type:application/pdf"
@@ -0,0 +1,117 @@
+import time
+
+import requests
+
+import http_client
+from http_client import CircuitBreaker, HostThrottle, PageFetcher, parse_retry_after
+
+
+def _response(url, status, body=b"", headers=None):
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = status
+    resp._content = body
+    resp._content_consumed = True
+    resp.headers.update({"Content-Type": "text/html; charset=utf-8"})
+    resp.headers.update(headers or {})
+    resp.encoding = "utf-8"
+    return resp
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, timeout=None, allow_redirects=True, stream=False, headers=None):
+        self.calls += 1
+        resp = self.responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+def test_retries_throttled_and_failed_fetches_with_retry_after(monkeypatch):
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    url = "https://example.com/blog"
+    session = FakeSession([
+        _response(url, 429, headers={"Retry-After": "2"}),
+        requests.ConnectionError("reset"),
+        _response(url, 200, b"<html>ok</html>"),
+    ])
+
+    page = PageFetcher(session, max_retries=2).fetch(url)
+
+    assert page.ok and page.text == "<html>ok</html>" and session.calls == 3
+    assert delays[0] >= 2
+
+
+def test_long_retry_after_is_not_waited_for(monkeypatch):
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+    url = "https://example.com/blog"
+    session = FakeSession([_response(url, 503, headers={"Retry-After": "3600"})])
+
+    page = PageFetcher(session, max_retries=3).fetch(url)
+
+    assert page.status == 503 and page.retry_after == 3600 and session.calls == 1
+
+
+def test_circuit_breaker_parks_failing_host_only(monkeypatch):
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+    breaker = CircuitBreaker(failure_threshold=2)
+    session = FakeSession([
+        _response("https://slow.com/a", 500),
+        requests.Timeout("timed out"),
+        _response("https://ok.com/a", 200, b"<html>ok</html>"),
+    ])
+    fetcher = PageFetcher(session, breaker=breaker)
+
+    fetcher.fetch("https://slow.com/a")
+    fetcher.fetch("https://www.slow.com/b")
+    parked = fetcher.fetch("https://slow.com/c")
+    healthy = fetcher.fetch("https://ok.com/a")
+
+    assert parked.error == "circuit_open" and session.calls == 3
+    assert healthy.ok and breaker.open_hosts() == {"slow.com"}
+
+
+def test_streamed_fetch_retries_and_respects_the_breaker(monkeypatch):
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+    breaker = CircuitBreaker(failure_threshold=1)
+    session = FakeSession([
+        requests.ConnectionError("reset"),
+        _response("https://example.com/sitemap.xml", 200, b"<urlset/>"),
+        _response("https://down.com/sitemap.xml", 500),
+        _response("https://down.com/sitemap.xml", 500),
+    ])
+    fetcher = PageFetcher(session, breaker=breaker, max_retries=1)
+
+    with fetcher.fetch_stream("https://example.com/sitemap.xml") as (page, body):
+        assert page.ok and body.read() == b"<urlset/>"
+    with fetcher.fetch_stream("https://down.com/sitemap.xml") as (page, body):
+        assert page.status == 500 and body is None
+    with fetcher.fetch_stream("https://down.com/sitemap_index.xml") as (page, body):
+        assert page.error == "circuit_open" and body is None
+    assert session.calls == 4
+
+
+def test_throttle_adapts_rate_per_host():
+    throttle = HostThrottle(rate=4, min_rate=0.5, max_rate=5, slow_seconds=1)
+    throttle.record("https://a.com/x", 429, 0.1)
+    throttle.record("https://a.com/x", 200, 2.0)
+    assert throttle.rate("https://a.com/") == 1.5
+    throttle.record("https://a.com/x", 200, 0.1)
+    assert throttle.rate("https://a.com/") == 1.75
+    assert throttle.rate("https://b.com/") == 4
+
+    throttle.record("https://b.com/x", 503, 0.1, retry_after=0.05)
+    started = time.monotonic()
+    throttle.acquire("https://b.com/y")
+    assert time.monotonic() - started >= 0.04
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
@@ -0,0 +1,33 @@
+from bs4 import BeautifulSoup
+
+from page_heuristics import heuristic_page_type, score_index_page
+
+
+def _listing_html(n=12):
+    cards = "".join(
+        f'<article class="post-card"><a href="/blog/post-{i}"><h2>Post {i}</h2></a>'
+        f'<time datetime="2025-0{1 + i % 9}-10">Jan {i + 1}, 2025</time></article>'
+        for i in range(n)
+    )
+    return f'<html><body><main>{cards}</main><nav class="pagination"><a href="/blog/page/2">2</a></nav></body></html>'
+
+
+def test_obvious_listing_is_accepted_without_llm():
+    soup = BeautifulSoup(_listing_html(), "html.parser")
+    analysis = heuristic_page_type(soup, "https://example.com/blog")
+    assert analysis["page_type"] == "BLOG_INDEX"
+    assert analysis["decided_by"] == "heuristic"
+
+
+def test_page_without_listing_structure_is_rejected():
+    soup = BeautifulSoup("<html><body><h1>Contact us</h1><p>Write to us.</p></body></html>", "html.parser")
+    analysis = heuristic_page_type(soup, "https://example.com/news")
+    assert analysis["page_type"] == "OTHER"
+
+
+def test_ambiguous_page_goes_to_llm():
+    html = '<html><body><a href="/resources/a">A</a><a href="/resources/b">B</a><p>2024-05-01</p></body></html>'
+    soup = BeautifulSoup(html, "html.parser")
+    assert heuristic_page_type(soup, "https://example.com/resources") is None
+    signals = score_index_page(soup, "https://example.com/resources")["signals"]
+    assert signals["section_links"] == 2 and signals["date_strings"] == 1
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+
+from http_client import PageResponse
+from page_store import PageStore
+
+
+class _FakeFetcher:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def fetch(self, url, accept_types=None):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append(url)
+        status = 404 if "missing" in url else 200
+        return PageResponse(url=url, final_url=url + "/", status=status, content_type="text/html",
+                            text="" if status != 200 else f"<html>{url}</html>" * 10)
+
+
+def test_each_page_is_fetched_and_parsed_once():
+    fetcher = _FakeFetcher(delay=0.02)
+    store = PageStore(fetcher)
+    threads = [threading.Thread(target=store.fetch, args=("https://example.com/a",)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    page = store.fetch("https://example.com/a")
+    assert fetcher.calls == ["https://example.com/a"]
+    assert page.final_url == "https://example.com/a/" and "example.com/a" in page.text
+    assert store.text("https://example.com/missing") is None
+
+    parses = []
+    for _ in range(3):
+        store.derived("https://example.com/a", "soup", lambda: parses.append(1) or "tree")
+    assert parses == [1]
+
+
+def test_bodies_over_the_cap_spill_to_disk_and_are_cleaned_up():
+    fetcher = _FakeFetcher()
+    store = PageStore(fetcher, max_bytes=400)
+    urls = [f"https://example.com/p{i}" for i in range(4)]
+    originals = [store.fetch(u).text for u in urls]
+    assert store._spill_dir is not None
+    assert [store.fetch(u).text for u in urls] == originals
+    assert len(fetcher.calls) == 4
+    spill_dir = store._spill_dir
+    store.close()
+    assert not os.path.exists(spill_dir)
+
+
+def test_derived_values_count_towards_the_cap_and_leave_with_their_page():
+    fetcher = _FakeFetcher()
+    body_len = len(_FakeFetcher().fetch("https://example.com/p0").text)
+    store = PageStore(fetcher, max_bytes=body_len * 4)
+    store.fetch("https://example.com/p0")
+    store.fetch("https://example.com/p1")
+    assert store._spill_dir is None
+    # Un arbore parsat e estimat la câteva ori mărimea HTML-ului: depășește limita și scoate pagina cea mai veche
+    store.derived("https://example.com/p1", "soup", object)
+    assert store._resident_bytes <= store.max_bytes or len(store._resident) == 1
+    assert "https://example.com/p0" in store._spilled
+    assert store.fetch("https://example.com/p0").text == fetcher.fetch("https://example.com/p0").text
+    store.derived("https://example.com/p1", "links", lambda: ["https://example.com/a", "https://example.com/b"])
+    assert store._resident_bytes == sum(e["_bytes"] for e in store._resident.values())
+
+
+def test_feeds_are_stored_apart_from_html_pages():
+    fetcher = _FakeFetcher()
+    store = PageStore(fetcher)
+    store.fetch("https://example.com/feed", accept_types=None)
+    store.fetch("https://example.com/feed", accept_types=None)
+    store.fetch("https://example.com/feed")
+    assert fetcher.calls == ["https://example.com/feed"] * 2
+    assert store.hits == 1
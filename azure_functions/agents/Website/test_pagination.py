@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+from bs4 import BeautifulSoup
+
+from pagination import listing_dates, load_more_url, next_page_url, page_number, parse_load_more, with_page
+
+
+def _next(html, url="https://example.com/blog"):
+    return next_page_url(BeautifulSoup(html, "html.parser"), url)
+
+
+def test_next_page_from_rel_label_and_page_number():
+    assert _next('<link rel="next" href="/blog/page/2/">') == "https://example.com/blog/page/2/"
+    assert _next('<a href="/blog?page=1">1</a><a class="pagination__older" href="/blog?page=2">Older posts</a>') \
+        == "https://example.com/blog?page=2"
+    assert _next('<a href="/blog?page=3">3</a><a href="/blog?page=2">2</a>') == "https://example.com/blog?page=2"
+    assert _next('<a href="/blog?paged=4">4</a>', "https://example.com/blog?paged=3") == "https://example.com/blog?paged=4"
+    assert _next('<a href="/blog/page/2">2</a>', "https://example.com/blog/page/2") is None
+    assert _next('<a href="/blog/post">Post</a><a href="/blog/category/ai">AI</a>') is None
+
+
+def test_page_number_and_with_page_keep_the_scheme():
+    assert page_number("https://example.com/blog?page=3&sort=new") == ("page", 3)
+    assert page_number("https://example.com/blog/page/7/") == ("path", 7)
+    assert page_number("https://example.com/blog?p=123") == (None, 1)
+    assert with_page("https://example.com/blog/page/7/", 8) == "https://example.com/blog/page/8/"
+    assert with_page("https://example.com/blog?sort=new", 2) == "https://example.com/blog?sort=new&page=2"
+
+
+def test_load_more_endpoint_discovery_ignores_the_site_wide_wordpress_api():
+    soup = BeautifulSoup('<div id="posts-loadmore" data-endpoint="/api/more?offset=12"></div>', "html.parser")
+    assert load_more_url(soup, "https://example.com/blog") == "https://example.com/api/more?offset=12"
+    # API-ul WordPress listează toate articolele site-ului, nu doar pe cele ale indexului
+    soup = BeautifulSoup('<link rel="https://api.w.org/" href="https://example.com/wp-json/">', "html.parser")
+    assert load_more_url(soup, "https://example.com/news") is None
+
+
+def test_listing_dates_count_month_paths_until_the_end_of_the_month():
+    dates = listing_dates(["https://example.com/2024/05/launch", "https://example.com/2024/04/12/beta", "https://example.com/x"])
+    assert dates == [datetime(2024, 6, 1, tzinfo=timezone.utc), datetime(2024, 4, 13, tzinfo=timezone.utc)]
+
+
+def test_parse_load_more_handles_post_lists_wrapped_html_and_fragments():
+    posts = parse_load_more('[{"link": "/a", "date_gmt": "2024-05-01T10:00:00"}, {"link": "/b"}]', "https://example.com/x")
+    assert posts.links == ["https://example.com/a", "https://example.com/b"] and posts.dates[0].year == 2024
+    wrapped = parse_load_more('{"html": "<a href=\\"/c\\">c</a>", "next_url": "/x?page=3"}', "https://example.com/x")
+    assert wrapped.html == '<a href="/c">c</a>' and wrapped.next_url == "https://example.com/x?page=3"
+    assert parse_load_more("<li><a href='/d'>d</a></li>", "https://example.com/x").html.startswith("<li>")
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from recency import order_by_recency, url_date_before, url_path_date
+
+
+def test_url_path_date_formats():
+    assert url_path_date("https://example.com/blog/2024/05/12/post") == datetime(2024, 5, 12, tzinfo=timezone.utc)
+    assert url_path_date("https://example.com/2023/11/post") == datetime(2023, 11, 1, tzinfo=timezone.utc)
+    assert url_path_date("https://example.com/2023/11/post", require_day=True) is None
+    assert url_path_date("https://example.com/news/2022-02-03-launch") == datetime(2022, 2, 3, tzinfo=timezone.utc)
+    assert url_path_date("https://example.com/blog/top-2024-tools") is None
+    assert url_path_date("https://example.com/products/1234/56") is None
+
+
+def test_order_by_recency_sorts_dated_links_and_keeps_undated_slots():
+    links = [
+        "https://example.com/blog/2021/01/old",
+        "https://example.com/blog/featured",
+        "https://example.com/blog/2024/03/new",
+        "https://example.com/blog/lastmod-only",
+    ]
+    lastmod = {"https://example.com/blog/lastmod-only": datetime(2023, 6, 1, tzinfo=timezone.utc)}
+    assert order_by_recency(links, lastmod) == [
+        "https://example.com/blog/2024/03/new",
+        "https://example.com/blog/featured",
+        "https://example.com/blog/lastmod-only",
+        "https://example.com/blog/2021/01/old",
+    ]
+    undated = ["https://example.com/blog/a", "https://example.com/blog/b"]
+    assert order_by_recency(undated) == undated
+
+
+def test_url_date_before_uses_the_whole_period():
+    cutoff = datetime(2024, 5, 10, tzinfo=timezone.utc)
+    assert url_date_before("https://example.com/2024/05/09/post", cutoff)
+    assert not url_date_before("https://example.com/2024/05/10/post", cutoff)
+    # O lună întreagă: articolul poate fi din 10-31 mai
+    assert not url_date_before("https://example.com/2024/05/post", cutoff)
+    assert url_date_before("https://example.com/2024/04/post", cutoff)
+    assert not url_date_before("https://example.com/blog/post", cutoff)
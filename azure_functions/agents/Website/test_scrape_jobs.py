@@ -0,0 +1,275 @@
+import json
+from collections import Counter, deque
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from scrape_jobs import (FAILED, QUEUED, RUNNING, SUCCEEDED, JobStore, fail_poisoned, job_message, run_index_item,
+                         run_job)
+
+
+class FakeScraper:
+    """Calls the progress hook like ArticleScraperV3.run does."""
+
+    def __init__(self, progress=None, fail=False):
+        self.progress = progress
+        self.fail = fail
+        self.run_stats = Counter()
+
+    def run(self, base_url, client_name):
+        self.progress("crawling_index", {"index_url": base_url + "/blog", "stats": {}})
+        self.run_stats["saved_articles"] += 3
+        self.progress("extracting_articles", {"position": 1, "candidates": 3, "stats": dict(self.run_stats)})
+        if self.fail:
+            raise RuntimeError("site unreachable")
+
+
+def test_queued_job_runs_through_local_queue_and_reports_status(tmp_path):
+    store = JobStore(str(tmp_path))
+    queue = deque()
+    job = store.create("https://example.com", "Example")
+    queue.append(job_message(job))
+    assert store.get(job["job_id"])["status"] == QUEUED
+
+    finished = run_job(store, queue.popleft(), FakeScraper)
+
+    assert finished["status"] == SUCCEEDED and finished["error"] is None
+    assert finished["counts"] == {"saved_articles": 3}
+    assert finished["progress"]["stage"] == SUCCEEDED
+    timings = finished["timings"]
+    assert {"created_at", "started_at", "finished_at", "duration_seconds", "queue_wait_seconds"} <= set(timings)
+    assert set(timings["stages"]) == {"crawling_index", "extracting_articles"}
+    assert store.get(job["job_id"]) == finished
+
+
+def test_failures_are_recorded_and_redelivery_is_ignored(tmp_path):
+    store = JobStore(str(tmp_path))
+    job = store.create("https://example.com", "Example")
+    calls = []
+
+    def factory(progress=None):
+        calls.append(1)
+        return FakeScraper(progress, fail=True)
+
+    failed = run_job(store, job_message(job), factory)
+    again = run_job(store, job_message(job), factory)
+
+    assert failed["status"] == FAILED and failed["error"] == "site unreachable"
+    assert failed["counts"] == {"saved_articles": 3}
+    assert again == failed and len(calls) == 1
+
+
+def test_unknown_or_malformed_job_ids_are_rejected(tmp_path):
+    store = JobStore(str(tmp_path))
+    assert store.get("../../etc/passwd") is None
+    assert run_job(store, json.dumps({"job_id": "abc123"}), FakeScraper) is None
+    assert run_job(store, "not json", FakeScraper) is None
+
+
+class FakeFanOutScraper:
+    """Plans two indexes and processes one per work item, checkpointing after every candidate like process_index."""
+
+    links = ["a1", "a2", "a3", "a4"]
+
+    def __init__(self, progress=None, crash_at=None, log=None):
+        self.progress = progress
+        self.crash_at = crash_at
+        self.log = log if log is not None else []
+        self.run_stats = Counter()
+
+    def plan_run(self, base_url, client_name):
+        index_urls = [base_url + "/blog", base_url + "/news"]
+        return SimpleNamespace(client_key="example", blog_index_urls=index_urls,
+                               crawled_indexes={base_url + "/blog": self.links},
+                               cutoff_dt=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                               lastmods={base_url + "/blog/a1": datetime(2026, 2, 1, tzinfo=timezone.utc)},
+                               plan=lambda: {"client_key": "example", "blog_index_urls": index_urls, "cms": "wordpress"})
+
+    def run_index_item(self, base_url, blog_index_url, plan, cutoff_dt=None, checkpoint=None, on_checkpoint=None,
+                       claim=None, lastmods=None):
+        # Planul și lastmod-urile vin din job, nu din starea locală sau dintr-o nouă citire a sitemap-ului
+        if not plan.get("blog_index_urls"):
+            raise ValueError("no run plan")
+        assert plan["cms"] == "wordpress" and claim is not None
+        assert lastmods == {base_url + "/blog/a1": datetime(2026, 2, 1, tzinfo=timezone.utc)}
+        self.run_stats.update(checkpoint.get("stats", {}))
+        links = checkpoint.get("article_links") or checkpoint.get("crawled_links") or self.links
+        for position in range(checkpoint.get("position", 0), len(links)):
+            if (blog_index_url, position) == self.crash_at:
+                raise RuntimeError("host recycled")
+            self.log.append((blog_index_url, links[position], checkpoint.get("crawled_links") is not None))
+            self.run_stats["saved_articles"] += 1
+            on_checkpoint({"article_links": links, "position": position + 1, "stats": dict(self.run_stats)})
+        return datetime(2026, 3 if blog_index_url.endswith("/blog") else 2, 1, tzinfo=timezone.utc)
+
+    def record_latest_article_date(self, client_key, newest_dt):
+        self.log.append(("latest", client_key, newest_dt))
+
+
+def test_job_fans_out_index_work_items_and_finishes_after_the_last_one(tmp_path):
+    store = JobStore(str(tmp_path))
+    jobs, items = deque(), deque()
+    log = []
+    job = store.create("https://example.com", "Example")
+    jobs.append(job_message(job))
+
+    planned = run_job(store, jobs.popleft(), lambda progress=None: FakeFanOutScraper(progress, log=log),
+                      enqueue_items=items.extend)
+
+    assert planned["status"] == RUNNING and planned["items_total"] == 2 and len(items) == 2
+    # lastmod-urile stau într-un document separat, nu în job și nici în răspunsul de status
+    assert "lastmods" not in planned and "lastmods" not in store.status(job["job_id"])
+    assert store.status(job["job_id"])["progress"]["items_done"] == 0
+    run_index_item(store, items.popleft(), lambda: FakeFanOutScraper(log=log))
+    assert store.get(job["job_id"])["status"] == RUNNING
+    run_index_item(store, items.popleft(), lambda: FakeFanOutScraper(log=log))
+
+    finished = store.status(job["job_id"])
+    assert finished["status"] == SUCCEEDED and finished["counts"] == {"saved_articles": 8}
+    assert [i["status"] for i in finished["items"]] == [SUCCEEDED, SUCCEEDED]
+    # Indexul parcurs la planificare nu se mai parcurge în work item
+    assert all(seeded for url, _, seeded in log[:4]) and not any(seeded for *_, seeded in log[4:8])
+    assert log[8:] == [("latest", "example", datetime(2026, 3, 1, tzinfo=timezone.utc))]
+    assert store.lastmods(job["job_id"]) is None
+
+
+def test_interrupted_work_item_resumes_from_its_checkpoint(tmp_path):
+    store = JobStore(str(tmp_path))
+    items = deque()
+    log = []
+    job = store.create("https://example.com", "Example")
+    run_job(store, job_message(job), lambda progress=None: FakeFanOutScraper(progress), enqueue_items=items.extend)
+    news = items.pop()
+
+    crashed = run_index_item(store, news, lambda: FakeFanOutScraper(crash_at=("https://example.com/news", 2), log=log))
+    assert crashed["status"] == FAILED
+    # Un host reciclat la jumătatea itemului lasă statusul "running"; mesajul relivrat îl reia
+    store.update(crashed["item_id"], status=RUNNING, error=None)
+    resumed = run_index_item(store, news, lambda: FakeFanOutScraper(log=log))
+
+    assert resumed["status"] == SUCCEEDED and resumed["attempts"] == 2
+    assert [link for _, link, _ in log] == ["a1", "a2", "a3", "a4"]
+    assert resumed["counts"] == {"saved_articles": 4}
+
+
+def test_failed_work_item_fails_the_job_without_moving_the_latest_date(tmp_path):
+    store = JobStore(str(tmp_path))
+    items = deque()
+    log = []
+    job = store.create("https://example.com", "Example")
+    run_job(store, job_message(job), lambda progress=None: FakeFanOutScraper(progress), enqueue_items=items.extend)
+
+    factory = lambda: FakeFanOutScraper(crash_at=("https://example.com/news", 1), log=log)
+    while items:
+        run_index_item(store, items.popleft(), factory)
+    again = run_index_item(store, json.dumps({"item_id": f"{job['job_id']}-002"}), factory)
+
+    finished = store.get(job["job_id"])
+    assert finished["status"] == FAILED and "https://example.com/news: host recycled" in finished["error"]
+    assert finished["counts"] == {"saved_articles": 5}
+    assert again["attempts"] == 1 and not [entry for entry in log if entry[0] == "latest"]
+
+
+def test_poisoned_work_item_is_failed_and_finishes_the_job(tmp_path):
+    store = JobStore(str(tmp_path))
+    items = deque()
+    job = store.create("https://example.com", "Example")
+    run_job(store, job_message(job), lambda progress=None: FakeFanOutScraper(progress), enqueue_items=items.extend)
+    run_index_item(store, items.popleft(), FakeFanOutScraper)
+    # Workerul celui de-al doilea item a depășit timpul de două ori: mesajul ajunge în coada poison
+    stuck = items.popleft()
+    store.update(json.loads(stuck)["item_id"], status=RUNNING)
+
+    poisoned = fail_poisoned(store, stuck)
+
+    assert poisoned["status"] == FAILED and "poison" in poisoned["error"]
+    finished = store.get(job["job_id"])
+    assert finished["status"] == FAILED and finished["counts"] == {"saved_articles": 4}
+    assert fail_poisoned(store, job_message(job))["status"] == FAILED
+
+
+def test_work_item_without_a_run_plan_fails_instead_of_succeeding_empty(tmp_path):
+    store = JobStore(str(tmp_path))
+    items = deque()
+    job = store.create("https://example.com", "Example")
+    run_job(store, job_message(job), lambda progress=None: FakeFanOutScraper(progress), enqueue_items=items.extend)
+    # Job scris de o versiune mai veche, fără plan: item-ul nu poate reconstrui rularea
+    record = store.get(job["job_id"])
+    del record["plan"]
+    store._records.write(job["job_id"], record)
+
+    item = run_index_item(store, items.popleft(), FakeFanOutScraper)
+
+    assert item["status"] == FAILED and "no run plan" in item["error"]
+
+
+def test_claims_are_exclusive_per_job_across_stores_and_discarded(tmp_path):
+    first, second = JobStore(str(tmp_path)), JobStore(str(tmp_path))
+    job = first.create("https://example.com", "Example")
+    job_id = job["job_id"]
+    assert first.claim(job_id, f"{job_id}-001", "https://example.com/blog/post")
+    assert not second.claim(job_id, f"{job_id}-002", "https://EXAMPLE.com/blog/post#top")
+    # Itemul reluat își regăsește revendicarea; alt job nu e blocat
+    assert second.claim(job_id, f"{job_id}-001", "https://example.com/blog/post")
+    other = first.create("https://example.com", "Example")
+    assert second.claim(other["job_id"], f"{other['job_id']}-002", "https://example.com/blog/post")
+    assert first.items(job_id) == []
+    first.discard_run_data(job_id)
+    assert second.claim(job_id, f"{job_id}-002", "https://example.com/blog/post")
+    assert first.get(job_id) is not None
+
+
+class FakeContainer:
+    """In-memory stand-in for a blob ContainerClient, with ETag checks; `interleave` writes between a read and a write."""
+
+    def __init__(self):
+        from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+        self.blobs, self.interleave = {}, None
+        self.exists, self.modified, self.not_found = ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+
+    def download_blob(self, name):
+        if name not in self.blobs:
+            raise self.not_found(name)
+        data, etag = self.blobs[name]
+        return SimpleNamespace(readall=lambda: data, properties=SimpleNamespace(etag=etag))
+
+    def upload_blob(self, name, data, overwrite=False, etag=None, match_condition=None):
+        if self.interleave:
+            interleave, self.interleave = self.interleave, None
+            interleave()
+        if not overwrite and name in self.blobs:
+            raise self.exists(name)
+        if etag is not None and self.blobs.get(name, (None, None))[1] != etag:
+            raise self.modified(name)
+        self.blobs[name] = (data, str(int(self.blobs.get(name, (None, "0"))[1]) + 1))
+
+    def delete_blob(self, name):
+        if self.blobs.pop(name, None) is None:
+            raise self.not_found(name)
+
+    def list_blobs(self, name_starts_with=""):
+        return [SimpleNamespace(name=n) for n in sorted(self.blobs) if n.startswith(name_starts_with)]
+
+
+def test_blob_records_are_shared_between_instances_and_retry_conflicting_updates():
+    pytest.importorskip("azure.storage.blob")
+    from scrape_jobs import _BlobRecords
+
+    container = FakeContainer()
+    http_instance, worker_instance = JobStore(records=_BlobRecords(container)), JobStore(records=_BlobRecords(container))
+    job = http_instance.create("https://example.com", "Example")
+    worker_instance.create_items(job["job_id"], ["https://example.com/blog"])
+    assert worker_instance.get(job["job_id"])["client_name"] == "Example"
+    assert [i["index_url"] for i in http_instance.items(job["job_id"])] == ["https://example.com/blog"]
+
+    # Altă instanță scrie jobul între citire și scriere: actualizarea se reia peste versiunea nouă
+    container.interleave = lambda: http_instance.update(job["job_id"], counts={"saved_articles": 2})
+    worker_instance.update(job["job_id"], status=RUNNING)
+    assert http_instance.get(job["job_id"])["status"] == RUNNING
+    assert http_instance.get(job["job_id"])["counts"] == {"saved_articles": 2}
+
+    assert http_instance.claim(job["job_id"], "item-1", "https://example.com/blog/post")
+    assert not worker_instance.claim(job["job_id"], "item-2", "https://example.com/blog/post")
+    worker_instance.discard_run_data(job["job_id"])
+    assert worker_instance.claim(job["job_id"], "item-2", "https://example.com/blog/post")
@@ -0,0 +1,34 @@
+import seen_urls
+from seen_urls import SeenUrlIndex, url_hash
+
+
+def test_membership_uses_canonical_urls_and_persists(tmp_path):
+    path = str(tmp_path / "seen.sqlite")
+    seen = SeenUrlIndex(path)
+    assert not seen
+    seen.add("https://Example.com/blog/post?b=2&a=1#comments")
+    seen.add_many(["https://example.com/blog/other", "https://example.com/blog/other", ""])
+    assert "https://example.com/blog/post?a=1&b=2" in seen
+    assert "https://example.com/blog/missing" not in seen
+    assert None not in seen
+    seen.close()
+
+    reopened = SeenUrlIndex(path)
+    assert reopened and len(reopened) == 2
+    assert "https://example.com/blog/other" in reopened
+
+
+def test_hash_collisions_are_verified_against_the_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(seen_urls, "url_hash", lambda url: 42)
+    seen = SeenUrlIndex(str(tmp_path / "seen.sqlite"))
+    seen.add("https://example.com/a")
+    assert "https://example.com/b" not in seen
+    seen.add("https://example.com/b")
+    assert len(seen) == 2
+
+
+def test_hash_is_signed_64_bit():
+    h = url_hash("https://example.com/blog/post")
+    assert -(2 ** 63) <= h < 2 ** 63
+    assert h == url_hash("https://EXAMPLE.com/blog/post#top")
+
@@ -0,0 +1,81 @@
+import io
+import gzip
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from http_client import PageResponse
+from sitemap_reader import iter_sitemap, parse_lastmod, sitemap_seeds
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/posts.xml.gz</loc><lastmod>2025-06-01</lastmod></sitemap>
+  <sitemap><loc>https://example.com/old.xml</loc><lastmod>2019-01-01</lastmod></sitemap>
+</sitemapindex>"""
+
+POSTS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url><loc>https://example.com/blog/new</loc><lastmod>2025-05-20T10:00:00+00:00</lastmod>
+    <image:image><image:loc>https://example.com/img.png</image:loc></image:image></url>
+  <url><loc>https://example.com/blog/older</loc><lastmod>2023-02-01</lastmod></url>
+  <url><loc>https://example.com/blog/undated</loc></url>
+</urlset>"""
+
+
+class FakeFetcher:
+    def __init__(self, files):
+        self.files = files
+        self.requested = []
+
+    def fetch(self, url, accept_types=None):
+        self.requested.append(url)
+        body = self.files.get(url)
+        if body is None:
+            return PageResponse(url=url, final_url=url, status=404, content_type="")
+        return PageResponse(url=url, final_url=url, status=200, content_type="text/plain", text=body.decode("utf-8"))
+
+    @contextmanager
+    def fetch_stream(self, url):
+        self.requested.append(url)
+        body = self.files.get(url)
+        if body is None:
+            yield PageResponse(url=url, final_url=url, status=404, content_type=""), None
+        else:
+            yield PageResponse(url=url, final_url=url, status=200, content_type="application/xml"), io.BufferedReader(io.BytesIO(body))
+
+
+def test_streams_gzip_children_and_filters_by_lastmod():
+    session = FakeFetcher({
+        "https://example.com/sitemap.xml": INDEX,
+        "https://example.com/posts.xml.gz": gzip.compress(POSTS),
+        "https://example.com/old.xml": POSTS,
+    })
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    entries = list(iter_sitemap(session, ["https://example.com/sitemap.xml"], since=since))
+
+    assert [e.loc for e in entries] == ["https://example.com/blog/new", "https://example.com/blog/undated"]
+    assert entries[0].lastmod == datetime(2025, 5, 20, 10, tzinfo=timezone.utc)
+    assert "https://example.com/old.xml" not in session.requested
+
+
+def test_budget_limits_files_and_urls():
+    session = FakeFetcher({
+        "https://example.com/sitemap.xml": INDEX,
+        "https://example.com/posts.xml.gz": gzip.compress(POSTS),
+        "https://example.com/old.xml": POSTS,
+    })
+    assert len(list(iter_sitemap(session, ["https://example.com/sitemap.xml"], max_files=1))) == 0
+    assert len(list(iter_sitemap(session, ["https://example.com/sitemap.xml"], max_urls=2))) == 2
+
+
+def test_parse_lastmod_formats():
+    assert parse_lastmod("2025-01-02") == datetime(2025, 1, 2, tzinfo=timezone.utc)
+    assert parse_lastmod("2025-01-02T03:04:05Z") == datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert parse_lastmod("not a date") is None
+
+
+def test_seeds_come_from_robots_then_default_locations():
+    fetcher = FakeFetcher({"https://example.com/robots.txt": b"User-agent: *\nSitemap: https://example.com/news.xml\n"})
+    assert sitemap_seeds(fetcher, "https://example.com/blog") == [
+        "https://example.com/news.xml", "https://example.com/sitemap.xml", "https://example.com/sitemap_index.xml",
+    ]
@@ -0,0 +1,58 @@
+import json
+
+from url_rules import UrlRuleEngine, load_url_rules
+
+
+def _engine(domain_rules=None):
+    return UrlRuleEngine(
+        include_keywords=["blog", "news"],
+        exclude_keywords=["contact", "login"],
+        extensions=[".pdf", ".png"],
+        allowed_locales=["en", "ro"],
+        domain_rules=domain_rules,
+    )
+
+
+def test_classify_in_single_pass():
+    engine = _engine()
+    info = engine.classify("https://www.example.com/en/blog/")
+    assert info.netloc == "example.com"
+    assert info.locale == "en" and info.locale_allowed
+    assert info.segments == ("en", "blog")
+    assert info.include_keyword == "blog" and not info.rejected
+
+    assert engine.classify("https://example.com/de/blog").rejected
+    assert engine.classify("https://example.com/files/report.PDF").binary
+    assert engine.classify("https://example.com/contact-us").excluded_keyword == "contact"
+    # Cuvintele excluse și incluse din același URL sunt găsite amândouă
+    info = engine.classify("https://example.com/blog/login")
+    assert info.excluded_keyword == "login" and info.include_keyword == "blog"
+
+
+def test_domain_rules_apply_to_subdomains_only():
+    engine = _engine({"example.com": {"exclude_index_paths": ["/events"], "include_keywords": ["stories"]}})
+    assert engine.excluded_index_path("https://shop.example.com/events")
+    assert not engine.excluded_index_path("https://notexample.com/events")
+    assert engine.classify("https://example.com/stories").include_keyword == "stories"
+    assert engine.classify("https://other.com/stories").include_keyword is None
+    assert engine.matches_include("Our Stories", "www.example.com")
+
+
+def test_is_internal_accepts_subdomains():
+    engine = _engine()
+    assert engine.is_internal("https://www.example.com", "https://blog.example.com/post")
+    assert not engine.is_internal("https://example.com", "https://example.org/post")
+
+
+def test_load_url_rules_reads_config(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({
+        "defaults": {"exclude_keywords": ["pricing"]},
+        "domains": {"example.com": {"exclude_index_paths": ["/resources"]}},
+    }))
+    engine = load_url_rules(["blog"], ["contact"], [".pdf"], ["en"], path=str(path))
+    assert engine.classify("https://example.com/pricing").rejected
+    assert not engine.classify("https://example.com/contact").rejected
+    assert engine.excluded_index_path("https://example.com/resources/x")
+    fallback = load_url_rules(["blog"], ["contact"], [".pdf"], ["en"], path=str(tmp_path / "missing.json"))
+    assert fallback.classify("https://example.com/contact").rejected
@@ -0,0 +1,158 @@
+import os
+import re
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import urlparse, ParseResult
+
+# Reguli de filtrare a URL-urilor; valorile implicite și regulile per domeniu stau în url_rules.json
+URL_RULES_PATH = os.getenv("WEBSITE_URL_RULES_PATH", os.path.join(os.path.dirname(__file__), "url_rules.json"))
+
+LOCALE_SEGMENT_REGEX = re.compile(r"^/([a-zA-Z]{2})(/|$)")
+URL_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def parse_url(url: str) -> ParseResult:
+    """urlparse with memoization; anchors on a site repeat the same URLs many times."""
+    return urlparse(url)
+
+
+def normalize_netloc(netloc: str) -> str:
+    netloc = netloc.lower().split(":")[0]
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def _alternation(words: Iterable[str]) -> str:
+    # Cuvintele mai lungi primele, ca alternanța să nu se oprească la un prefix
+    return "|".join(re.escape(w.lower()) for w in sorted(set(words), key=len, reverse=True) if w)
+
+
+@dataclass(frozen=True)
+class UrlInfo:
+    url: str
+    path: str
+    netloc: str
+    segments: Tuple[str, ...]
+    locale: Optional[str]
+    locale_allowed: bool
+    binary: bool
+    excluded_keyword: Optional[str]
+    include_keyword: Optional[str]
+
+    @property
+    def rejected(self) -> bool:
+        return not self.locale_allowed or self.binary or self.excluded_keyword is not None
+
+
+@dataclass
+class DomainRules:
+    matcher: Optional[Pattern]
+    include_regex: Optional[Pattern]
+    exclude_index_paths: Tuple[str, ...]
+
+
+class UrlRuleEngine:
+    """Classifies a URL in one pass with a combined include/exclude regex, per-domain rules and cached parsing."""
+
+    def __init__(self, include_keywords: Iterable[str], exclude_keywords: Iterable[str], extensions: Iterable[str],
+                 allowed_locales: Iterable[str], domain_rules: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.include_keywords = list(include_keywords)
+        self.exclude_keywords = list(exclude_keywords)
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.allowed_locales = {l.lower() for l in allowed_locales}
+        self.domain_rules = domain_rules or {}
+        self._compiled: Dict[str, DomainRules] = {}
+        self.classify = lru_cache(maxsize=URL_CACHE_SIZE)(self._classify)
+
+    def _rules_key(self, netloc: str) -> str:
+        # Cea mai specifică regulă de domeniu care se potrivește (domeniu sau subdomeniu)
+        best = ""
+        for domain in self.domain_rules:
+            if (netloc == domain or netloc.endswith("." + domain)) and len(domain) > len(best):
+                best = domain
+        return best
+
+    def _rules_for(self, netloc: str) -> DomainRules:
+        key = self._rules_key(netloc)
+        rules = self._compiled.get(key)
+        if rules is None:
+            extra = self.domain_rules.get(key, {})
+            include = self.include_keywords + list(extra.get("include_keywords", []))
+            exclude = self.exclude_keywords + list(extra.get("exclude_keywords", []))
+            parts = []
+            if exclude:
+                parts.append(f"(?P<exclude>{_alternation(exclude)})")
+            if include:
+                parts.append(f"(?P<include>{_alternation(include)})")
+            # Lookahead: găsește potriviri la fiecare poziție, inclusiv suprapuse
+            matcher = re.compile(f"(?=(?:{'|'.join(parts)}))") if parts else None
+            include_regex = re.compile(_alternation(include)) if include else None
+            rules = DomainRules(matcher, include_regex, tuple(extra.get("exclude_index_paths", [])))
+            self._compiled[key] = rules
+        return rules
+
+    def _classify(self, url: str) -> UrlInfo:
+        parsed = parse_url(url)
+        netloc = normalize_netloc(parsed.netloc)
+        lower = url.lower()
+        rules = self._rules_for(netloc)
+        excluded_keyword = None
+        include_keyword = None
+        if rules.matcher is not None:
+            for m in rules.matcher.finditer(lower):
+                groups = m.groupdict()
+                if excluded_keyword is None and groups.get("exclude"):
+                    excluded_keyword = groups["exclude"]
+                elif include_keyword is None and groups.get("include"):
+                    include_keyword = groups["include"]
+                if excluded_keyword is not None and include_keyword is not None:
+                    break
+        m = LOCALE_SEGMENT_REGEX.match(parsed.path)
+        locale = m.group(1).lower() if m else None
+        return UrlInfo(
+            url=url,
+            path=parsed.path,
+            netloc=netloc,
+            segments=tuple(s for s in parsed.path.split("/") if s),
+            locale=locale,
+            locale_allowed=locale is None or locale in self.allowed_locales,
+            binary=lower.endswith(self.extensions),
+            excluded_keyword=excluded_keyword,
+            include_keyword=include_keyword,
+        )
+
+    def matches_include(self, text: str, netloc: str = "") -> bool:
+        rules = self._rules_for(normalize_netloc(netloc))
+        return bool(rules.include_regex and rules.include_regex.search(text.lower()))
+
+    def excluded_index_path(self, url: str) -> bool:
+        info = self.classify(url)
+        return any(info.path.startswith(p) for p in self._rules_for(info.netloc).exclude_index_paths)
+
+    def is_internal(self, base_url: str, candidate_url: str) -> bool:
+        base_netloc = normalize_netloc(parse_url(base_url).netloc)
+        cand_netloc = normalize_netloc(parse_url(candidate_url).netloc)
+        return cand_netloc == base_netloc or cand_netloc.endswith("." + base_netloc)
+
+
+def load_url_rules(include_keywords: Iterable[str], exclude_keywords: Iterable[str], extensions: Iterable[str],
+                   allowed_locales: Iterable[str], path: str = URL_RULES_PATH) -> UrlRuleEngine:
+    """Builds the engine from url_rules.json; the arguments are used when the file omits a default."""
+    config: Dict = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError as e:
+        print(f"[WARN] Invalid URL rules file {path}: {e}. Using built-in defaults.")
+    defaults = config.get("defaults", {})
+    return UrlRuleEngine(
+        include_keywords=defaults.get("include_keywords", include_keywords),
+        exclude_keywords=defaults.get("exclude_keywords", exclude_keywords),
+        extensions=defaults.get("extensions", extensions),
+        allowed_locales=defaults.get("allowed_locales", allowed_locales),
+        domain_rules=config.get("domains", {}),
+    )